@@ -1,9 +1,14 @@
 """Variable implementation for Home Assistant."""
 
+from collections.abc import Mapping
 import contextlib
 import copy
+from dataclasses import dataclass, field
+import hashlib
 import json
 import logging
+import time
+from typing import Any
 
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 from homeassistant.const import (
@@ -16,42 +21,69 @@ from homeassistant.const import (
     SERVICE_RELOAD,
     Platform,
 )
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 import homeassistant.helpers.entity_registry as er
 from homeassistant.helpers.reload import async_integration_yaml_config
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.typing import ConfigType
 import voluptuous as vol
 
+from .collection import VariableCollection
 from .const import (
+    ATTR_ATTRIBUTE,
     ATTR_ATTRIBUTES,
+    ATTR_END,
     ATTR_ENTITY,
+    ATTR_ITEMS,
     ATTR_REPLACE_ATTRIBUTES,
+    ATTR_START,
     ATTR_VALUE,
     ATTR_VARIABLE,
     CONF_ATTRIBUTES,
+    CONF_COLLECTION,
+    CONF_COLLECTION_PLATFORM,
     CONF_ENTITY_PLATFORM,
     CONF_EXCLUDE_FROM_RECORDER,
     CONF_FORCE_UPDATE,
+    CONF_PERFORMANCE_SENSORS,
     CONF_RESTORE,
     CONF_VALUE,
     CONF_VARIABLE_ID,
+    CONF_YAML_FINGERPRINT,
     CONF_YAML_PRESENT,
     CONF_YAML_VARIABLE,
+    DATA_PERFORMANCE,
+    DATA_YAML_RECONCILE,
     DEFAULT_REPLACE_ATTRIBUTES,
     DOMAIN,
     PLATFORMS,
-    SERVICE_UPDATE_SENSOR,
+    SERVICE_GET_BLOB,
+    SERVICE_UPDATE_MANY,
 )
-from .device import create_device, remove_device
+from .device import async_unload_device_index, create_device, remove_device
+from .entity import (
+    VariableEntity,
+    VariableEntityIndex,
+    async_get_entity_index,
+    async_log_restore_stats,
+)
+from .journal import async_get_variable_journal
+from .startup import (
+    PHASE_FORWARD,
+    PHASE_SETUP,
+    PHASE_SETUP_ENTRY,
+    async_get_startup_timer,
+    async_log_startup_stats,
+)
+from .store import async_get_variable_store
+from .websocket_api import async_setup_websocket
 
 try:
     from homeassistant.helpers.helper_integration import async_remove_helper_devices
 except ImportError:
-    from homeassistant.helpers.device import (
-        async_remove_stale_devices_links_keep_current_device,
-    )
+    from homeassistant.helpers.device import async_remove_stale_devices_links_keep_current_device
 
     def async_remove_helper_devices(
         hass: HomeAssistant,
@@ -98,6 +130,32 @@ SERVICE_SET_ENTITY_LEGACY_SCHEMA = vol.Schema(
     }
 )
 
+UPDATE_MANY_ITEM_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Exclusive(CONF_ENTITY_ID, "target"): cv.entity_id,
+            vol.Exclusive(CONF_VARIABLE_ID, "target"): cv.string,
+        },
+        extra=vol.ALLOW_EXTRA,
+    ),
+    cv.has_at_least_one_key(CONF_ENTITY_ID, CONF_VARIABLE_ID),
+)
+
+SERVICE_UPDATE_MANY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ITEMS): vol.All(cv.ensure_list, [dict]),
+    }
+)
+
+SERVICE_GET_BLOB_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_ENTITY_ID): cv.entity_id,
+        vol.Required(ATTR_ATTRIBUTE): cv.string,
+        vol.Optional(ATTR_START): vol.Coerce(int),
+        vol.Optional(ATTR_END): vol.Coerce(int),
+    }
+)
+
 CONFIG_SCHEMA = vol.Schema(
     {
         vol.Optional(DOMAIN): vol.Schema(
@@ -145,6 +203,8 @@ async def _async_exclude_entity_from_recorder(hass: HomeAssistant, entity_id: st
 async def async_setup(hass: HomeAssistant, config: ConfigType):
     """Set up the Variable services."""
 
+    start = time.perf_counter()
+
     async def async_set_variable_legacy_service(call: ServiceCall) -> None:
         """Handle calls to the set_variable legacy service."""
 
@@ -165,20 +225,52 @@ async def async_setup(hass: HomeAssistant, config: ConfigType):
         await _async_set_legacy_service(call, entity)
 
     async def _async_set_legacy_service(call: ServiceCall, var_ent: str):
-        """Shared function for both set_entity and set_variable legacy services."""
+        """Shared function for both set_entity and set_variable legacy services.
+
+        Updates the Sensor Variable directly instead of calling update_sensor,
+        which would validate the data and resolve the target a second time.
+        """
 
-        # _LOGGER.debug(f"[async_set_legacy_service] call data: {call.data}")
+        entity = async_get_entity_index(hass).async_get(var_ent)
+        if entity is None or not var_ent.startswith(f"{Platform.SENSOR}."):
+            _LOGGER.error("[async_set_legacy_service] Sensor Variable not found: %s", var_ent)
+            return
         update_sensor_data = {
-            CONF_ENTITY_ID: [var_ent],
             ATTR_REPLACE_ATTRIBUTES: call.data.get(ATTR_REPLACE_ATTRIBUTES, False),
         }
         if call.data.get(ATTR_VALUE):
             update_sensor_data.update({ATTR_VALUE: call.data.get(ATTR_VALUE)})
         if call.data.get(ATTR_ATTRIBUTES):
             update_sensor_data.update({ATTR_ATTRIBUTES: call.data.get(ATTR_ATTRIBUTES)})
-        _LOGGER.debug(f"[async_set_legacy_service] update_sensor_data: {update_sensor_data}")
-        await hass.services.async_call(
-            DOMAIN, SERVICE_UPDATE_SENSOR, service_data=update_sensor_data
+        _LOGGER.debug(
+            "[async_set_legacy_service] %s update_sensor_data: %s", var_ent, update_sensor_data
+        )
+        entity.async_set_context(call.context)
+        try:
+            await entity.async_update_variable(**update_sensor_data)
+        except (HomeAssistantError, ValueError) as err:
+            # Legacy calls never failed the caller; report the error instead.
+            _LOGGER.error("[async_set_legacy_service] Error updating %s: %s", var_ent, err)
+
+    async def async_update_many_service(call: ServiceCall) -> ServiceResponse:
+        """Handle calls to the update_many service."""
+
+        results = await _async_update_many(hass, call)
+        failed = [result for result in results if not result["success"]]
+        if failed:
+            _LOGGER.warning(
+                "[update_many] %s of %s updates failed: %s", len(failed), len(results), failed
+            )
+        return {"results": results}
+
+    async def async_get_blob_service(call: ServiceCall) -> ServiceResponse:
+        """Handle calls to the get_blob service."""
+
+        entity_id = call.data[CONF_ENTITY_ID]
+        if (entity := async_get_entity_index(hass).async_get(entity_id)) is None:
+            raise ValueError(f"Variable entity not found: {entity_id}")
+        return entity.async_get_blob(
+            call.data[ATTR_ATTRIBUTE], call.data.get(ATTR_START), call.data.get(ATTR_END)
         )
 
     async def _async_reload_service_handler(service: ServiceCall) -> None:
@@ -205,101 +297,272 @@ async def async_setup(hass: HomeAssistant, config: ConfigType):
         async_set_entity_legacy_service,
         schema=SERVICE_SET_ENTITY_LEGACY_SCHEMA,
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPDATE_MANY,
+        async_update_many_service,
+        schema=SERVICE_UPDATE_MANY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_BLOB,
+        async_get_blob_service,
+        schema=SERVICE_GET_BLOB_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
     hass.services.async_register(DOMAIN, SERVICE_RELOAD, _async_reload_service_handler)
+    async_setup_websocket(hass)
+    # Read every stored value once, before any platform restores its variables.
+    await async_get_variable_store(hass).async_load()
+    # Fold in changes journaled after the store was last saved.
+    await async_get_variable_journal(hass).async_load()
+    if not hass.is_running:
+        # Each platform setup restores its variables; report the totals once started.
+        async_at_started(hass, async_log_restore_stats)
+        async_at_started(hass, async_log_startup_stats)
+
+    result = await _async_process_yaml(hass, config)
+    async_get_startup_timer(hass).record(PHASE_SETUP, time.perf_counter() - start)
+    return result
+
+
+def _resolve_update_many_target(index: VariableEntityIndex, item: dict) -> VariableEntity:
+    """Return the loaded Variable entity an update_many item refers to."""
+    if (entity_id := item.get(CONF_ENTITY_ID)) is not None:
+        if (entity := index.async_get(entity_id)) is None:
+            raise ValueError(f"Variable entity not found: {entity_id}")
+        return entity
+    variable_id = item[CONF_VARIABLE_ID]
+    matches = index.async_get_by_variable_id(variable_id)
+    if not matches:
+        raise ValueError(f"Variable not found: {variable_id}")
+    if len(matches) > 1:
+        raise ValueError(
+            f"variable_id {variable_id} is used by several entities "
+            f"({', '.join(sorted(entity.entity_id for entity in matches))}); use entity_id"
+        )
+    return matches[0]
 
-    return await _async_process_yaml(hass, config)
 
+async def _async_update_many(hass: HomeAssistant, call: ServiceCall) -> list[dict[str, Any]]:
+    """Validate and apply the batch of variable updates of an update_many call.
 
-async def _async_process_yaml(hass: HomeAssistant, config: ConfigType) -> bool:
-    variables = json.loads(json.dumps(config.get(DOMAIN, {})))
+    Every item is validated against its entity's update service schema before
+    any update runs. Updates are then applied in order, grouped per entity, and
+    each entity writes its state once for the whole batch, under the context
+    of the service call.
 
-    for var, var_fields in variables.items():
-        if var is not None:
-            _LOGGER.debug(f"[YAML] variable_id: {var}")
-            _LOGGER.debug(f"[YAML] var_fields: {var_fields}")
-
-            for key_empty, var_empty in var_fields.copy().items():
-                if var_empty is None:
-                    var_fields.pop(key_empty)
-
-            attr = var_fields.get(CONF_ATTRIBUTES, {})
-            icon = attr.pop(CONF_ICON, None)
-            name = var_fields.get(CONF_NAME, attr.pop(CONF_FRIENDLY_NAME, None))
-            attr.pop(CONF_FRIENDLY_NAME, None)
-
-            if var not in {
-                entry.data.get(CONF_VARIABLE_ID)
-                for entry in hass.config_entries.async_entries(DOMAIN)
-            }:
-                _LOGGER.warning(f"[YAML] Creating New Sensor Variable: {var}")
-                hass.async_create_task(
-                    hass.config_entries.flow.async_init(
-                        DOMAIN,
-                        context={"source": SOURCE_IMPORT},
-                        data={
-                            CONF_ENTITY_PLATFORM: Platform.SENSOR,
-                            CONF_VARIABLE_ID: var,
-                            CONF_NAME: name,
-                            CONF_VALUE: var_fields.get(CONF_VALUE),
-                            CONF_RESTORE: var_fields.get(CONF_RESTORE),
-                            CONF_FORCE_UPDATE: var_fields.get(CONF_FORCE_UPDATE),
-                            CONF_ATTRIBUTES: attr,
-                            CONF_ICON: icon,
-                        },
-                    )
-                )
-            else:
-                _LOGGER.info(f"[YAML] Updating Existing Sensor Variable: {var}")
-
-                entry = None
-                entry_id = None
-                for ent in hass.config_entries.async_entries(DOMAIN):
-                    if var == ent.data.get(CONF_VARIABLE_ID):
-                        entry = ent
-                        entry_id = ent.entry_id
-                        break
-                # _LOGGER.debug(f"[YAML] entry_id: {entry_id}")
-                if entry_id and entry is not None:
-                    # _LOGGER.debug(f"[YAML] entry before: {entry.as_dict()}")
-
-                    for m in dict(entry.data).keys():
-                        var_fields.setdefault(m, entry.data[m])
-                    var_fields.update({CONF_YAML_PRESENT: True})
-                    # _LOGGER.debug(f"[YAML] Updated var_fields: {var_fields}")
-                    hass.config_entries.async_update_entry(entry, data=var_fields, options={})
-
-                    hass.async_create_task(hass.config_entries.async_reload(entry_id))
+    Returns:
+        One result per item, in input order, with ``success`` and, on failure,
+        ``error``.
+    """
+    index = async_get_entity_index(hass)
+    results: list[dict[str, Any]] = []
+    batches: dict[str, tuple[VariableEntity, list[tuple[dict, dict[str, Any]]]]] = {}
 
+    for item in call.data[ATTR_ITEMS]:
+        result: dict[str, Any] = {
+            key: item[key] for key in (CONF_ENTITY_ID, CONF_VARIABLE_ID) if key in item
+        }
+        results.append(result)
+        try:
+            target = UPDATE_MANY_ITEM_SCHEMA(item)
+            entity = _resolve_update_many_target(index, target)
+            result[CONF_ENTITY_ID] = entity.entity_id
+            kwargs = entity.update_variable_schema(
+                {
+                    key: value
+                    for key, value in target.items()
+                    if key not in (CONF_ENTITY_ID, CONF_VARIABLE_ID)
+                }
+            )
+        except (vol.Invalid, ValueError) as err:
+            result.update(success=False, error=str(err))
+            continue
+        batches.setdefault(entity.entity_id, (entity, []))[1].append((kwargs, result))
+
+    # Updates never await, so the whole batch is applied in one event loop turn.
+    for entity, updates in batches.values():
+        entity.async_set_context(call.context)
+        with entity.deferred_state_write():
+            for kwargs, result in updates:
+                try:
+                    await entity.async_update_variable(**kwargs)
+                except (HomeAssistantError, ValueError) as err:
+                    result.update(success=False, error=str(err))
                 else:
-                    _LOGGER.error(f"[YAML] Update Error. Could not find entry_id for: {var}")
+                    result["success"] = True
+    return results
+
+
+@dataclass(slots=True)
+class YamlReconcilePlan:
+    """Config entry changes needed to match the YAML variables."""
+
+    create: dict[str, dict[str, Any]] = field(default_factory=dict)
+    update: list[tuple[ConfigEntry, dict[str, Any]]] = field(default_factory=list)
+    skip: list[ConfigEntry] = field(default_factory=list)
+    remove: list[ConfigEntry] = field(default_factory=list)
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """Return the number of entries in each action."""
+        return {
+            "created": len(self.create),
+            "updated": len(self.update),
+            "skipped": len(self.skip),
+            "removed": len(self.remove),
+        }
 
-    # Remove any config entries that were originally created from YAML imports
-    # but are no longer present in the current YAML configuration.
-    try:
-        yaml_variable_ids = set(variables.keys())
-        for entry in hass.config_entries.async_entries(DOMAIN):
-            if entry.data.get(CONF_YAML_VARIABLE, False) is True:
-                var_id = entry.data.get(CONF_VARIABLE_ID)
-                if var_id and var_id not in yaml_variable_ids:
-                    _LOGGER.warning(
-                        f"[YAML] YAML Entry no longer exists in configuration, deleting entry: {var_id}"
-                    )
-                    hass.async_create_task(hass.config_entries.async_remove(entry.entry_id))
-    except Exception:
-        _LOGGER.exception("Error while cleaning up removed YAML variable entries")
 
+def _yaml_fingerprint(var_fields: dict[str, Any]) -> str:
+    """Return a stable hash of a YAML variable's fields, ignoring empty values."""
+    fields = {key: value for key, value in var_fields.items() if value is not None}
+    encoded = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _normalize_yaml_variable(var_fields: dict[str, Any]) -> tuple[dict[str, Any], str | None, Any]:
+    """Return a variable's YAML fields without empty values, plus its name and icon.
+
+    Only the top level and the attributes dict are copied because they are the
+    only parts modified here.
+    """
+    fields = {key: value for key, value in var_fields.items() if value is not None}
+    attr = dict(fields.get(CONF_ATTRIBUTES) or {})
+    if CONF_ATTRIBUTES in fields:
+        fields[CONF_ATTRIBUTES] = attr
+    icon = attr.pop(CONF_ICON, None)
+    name = fields.get(CONF_NAME, attr.pop(CONF_FRIENDLY_NAME, None))
+    attr.pop(CONF_FRIENDLY_NAME, None)
+    return fields, name, icon
+
+
+def _plan_yaml_reconcile(
+    variables: dict[str, Any], entries: list[ConfigEntry]
+) -> YamlReconcilePlan:
+    """Diff the YAML variables against the existing config entries.
+
+    The entries are indexed by variable_id once, so the plan is built in
+    linear time. Entries whose stored YAML fingerprint matches are skipped
+    rather than updated and reloaded.
+    """
+    entries_by_variable_id: dict[str, ConfigEntry] = {}
+    for entry in entries:
+        if (variable_id := entry.data.get(CONF_VARIABLE_ID)) is not None:
+            entries_by_variable_id.setdefault(variable_id, entry)
+
+    plan = YamlReconcilePlan()
+    for var, var_fields in variables.items():
+        if var is None:
+            continue
+        fingerprint = _yaml_fingerprint(var_fields)
+        entry = entries_by_variable_id.get(var)
+        if entry is not None and entry.data.get(CONF_YAML_FINGERPRINT) == fingerprint:
+            plan.skip.append(entry)
+            continue
+        fields, name, icon = _normalize_yaml_variable(var_fields)
+        fields[CONF_YAML_FINGERPRINT] = fingerprint
+        if entry is None:
+            plan.create[var] = {
+                CONF_ENTITY_PLATFORM: Platform.SENSOR,
+                CONF_VARIABLE_ID: var,
+                CONF_NAME: name,
+                CONF_VALUE: fields.get(CONF_VALUE),
+                CONF_RESTORE: fields.get(CONF_RESTORE),
+                CONF_FORCE_UPDATE: fields.get(CONF_FORCE_UPDATE),
+                CONF_ATTRIBUTES: fields.get(CONF_ATTRIBUTES, {}),
+                CONF_ICON: icon,
+                CONF_YAML_FINGERPRINT: fingerprint,
+            }
+            continue
+        plan.update.append((entry, {**entry.data, **fields, CONF_YAML_PRESENT: True}))
+
+    # Entries originally created from YAML imports that are no longer present
+    # in the current YAML configuration.
+    for entry in entries:
+        if entry.data.get(CONF_YAML_VARIABLE, False) is True:
+            var_id = entry.data.get(CONF_VARIABLE_ID)
+            if var_id and var_id not in variables:
+                plan.remove.append(entry)
+    return plan
+
+
+async def _async_process_yaml(hass: HomeAssistant, config: ConfigType) -> bool:
+    start = time.perf_counter()
+    variables = config.get(DOMAIN) or {}
+    plan = _plan_yaml_reconcile(variables, hass.config_entries.async_entries(DOMAIN))
+
+    for var, data in plan.create.items():
+        _LOGGER.warning("[YAML] Creating New Sensor Variable: %s", var)
+        hass.async_create_task(
+            hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": SOURCE_IMPORT}, data=data
+            )
+        )
+
+    for entry, data in plan.update:
+        _LOGGER.info("[YAML] Updating Existing Sensor Variable: %s", entry.data[CONF_VARIABLE_ID])
+        hass.config_entries.async_update_entry(entry, data=data, options={})
+        hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+
+    for entry in plan.remove:
+        _LOGGER.warning(
+            "[YAML] YAML Entry no longer exists in configuration, deleting entry: %s",
+            entry.data.get(CONF_VARIABLE_ID),
+        )
+        hass.async_create_task(hass.config_entries.async_remove(entry.entry_id))
+
+    counts = hass.data[DATA_YAML_RECONCILE] = plan.counts
+    _LOGGER.info(
+        "[YAML] Reconciled %s variables in %.3fs: %s created, %s updated, %s skipped, %s removed",
+        len(variables),
+        time.perf_counter() - start,
+        counts["created"],
+        counts["updated"],
+        counts["skipped"],
+        counts["removed"],
+    )
     return True
 
 
+def _entry_platforms(data: Mapping[str, Any]) -> list[str]:
+    """Return the platforms a variable's config entry is forwarded to."""
+    platform = data[CONF_ENTITY_PLATFORM]
+    if data.get(CONF_PERFORMANCE_SENSORS) and platform != Platform.SENSOR:
+        # Performance sensors of other variables are added by the sensor platform.
+        return [platform, Platform.SENSOR]
+    return [platform]
+
+
+def _collection_platforms(data: Mapping[str, Any]) -> list[str]:
+    """Return the platforms a collection's config entry is forwarded to."""
+    platform = data[CONF_COLLECTION_PLATFORM]
+    if platform != Platform.SENSOR:
+        # Any variable can get performance sensors later, without a reload.
+        return [platform, Platform.SENSOR]
+    return [platform]
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up from a config entry."""
 
+    with async_get_startup_timer(hass).time(PHASE_SETUP_ENTRY):
+        return await _async_setup_entry(hass, entry)
+
+
+async def _async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # _LOGGER.debug(f"[init async_setup_entry] entry: {entry.data}")
     if entry.data.get(CONF_YAML_PRESENT) is True:
         yaml_data = copy.deepcopy(dict(entry.data))
         yaml_data.pop(CONF_YAML_PRESENT, None)
         hass.config_entries.async_update_entry(entry, data=yaml_data, options={})
 
+    hass.data.setdefault(DOMAIN, {})
+    if entry.data.get(CONF_ENTITY_PLATFORM) == CONF_COLLECTION:
+        return await _async_setup_collection_entry(hass, entry)
+
     # UI-driven option changes only; YAML entries are managed via _async_process_yaml.
     if not entry.data.get(CONF_YAML_VARIABLE, False):
 
@@ -310,7 +573,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         entry.async_on_unload(entry.add_update_listener(_async_on_entry_update))
 
-    hass.data.setdefault(DOMAIN, {})
     hass_data = dict(entry.data)
     hass.data[DOMAIN][entry.entry_id] = hass_data
     platform = hass_data.get(CONF_ENTITY_PLATFORM)
@@ -321,12 +583,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             source_device_id=entry.data.get(CONF_DEVICE_ID),
             remove_all_devices=True,
         )
-        await hass.config_entries.async_forward_entry_setups(entry, [platform])
+        with async_get_startup_timer(hass).time(PHASE_FORWARD):
+            await hass.config_entries.async_forward_entry_setups(entry, _entry_platforms(hass_data))
     elif hass_data.get(CONF_ENTITY_PLATFORM) == CONF_DEVICE:
         await create_device(hass, entry)
     return True
 
 
+async def _async_setup_collection_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up a collection entry, whose variables are its config subentries."""
+
+    collection = VariableCollection(hass, entry)
+    hass.data[DOMAIN][entry.entry_id] = collection
+
+    async def _async_on_collection_update(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Apply added, changed and removed variables without a reload."""
+        await collection.async_entry_updated()
+
+    entry.async_on_unload(entry.add_update_listener(_async_on_collection_update))
+    with async_get_startup_timer(hass).time(PHASE_FORWARD):
+        await hass.config_entries.async_forward_entry_setups(
+            entry, _collection_platforms(entry.data)
+        )
+    return True
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
@@ -336,12 +617,27 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = False
     platform = hass_data.get(CONF_ENTITY_PLATFORM)
     if platform in PLATFORMS:
-        unload_ok = await hass.config_entries.async_unload_platforms(entry, [platform])
+        # Unload the platforms forwarded at setup, even if the options changed since.
+        loaded_data = hass.data[DOMAIN].get(entry.entry_id, hass_data)
+        unload_ok = await hass.config_entries.async_unload_platforms(
+            entry, _entry_platforms(loaded_data)
+        )
+    elif platform == CONF_COLLECTION:
+        unload_ok = await hass.config_entries.async_unload_platforms(
+            entry, _collection_platforms(hass_data)
+        )
     elif platform == CONF_DEVICE:
         unload_ok = await remove_device(hass, entry)
     if unload_ok:
         # Remove stored hass data
         hass.data[DOMAIN].pop(entry.entry_id)
+        performance = hass.data.get(DATA_PERFORMANCE, {})
+        performance.pop(entry.entry_id, None)
+        for subentry_id in entry.subentries:
+            performance.pop(subentry_id, None)
+        if not hass.data[DOMAIN]:
+            # The last entry is gone; a later setup builds a fresh index.
+            async_unload_device_index(hass)
 
     return unload_ok
 
@@ -354,9 +650,13 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
         entry: Config entry being permanently removed.
     """
     registry = er.async_get(hass)
+    store = async_get_variable_store(hass)
+    journal = async_get_variable_journal(hass)
     entries = er.async_entries_for_config_entry(registry, entry.entry_id)
     for entity_entry in entries:
         _LOGGER.debug(
             f"Removing entity registry entry for removed config: {entity_entry.entity_id}"
         )
+        store.async_remove(entity_entry.unique_id)
+        journal.async_remove(entity_entry.unique_id)
         registry.async_remove(entity_entry.entity_id)
@@ -1,7 +1,6 @@
-from collections.abc import MutableMapping
-import copy
+from collections.abc import Mapping, MutableMapping
 import logging
-from typing import cast
+from typing import Any
 
 from homeassistant.components.binary_sensor import PLATFORM_SCHEMA, BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
@@ -17,7 +16,7 @@ from homeassistant.const import (
     STATE_ON,
     Platform,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import (
     config_validation as cv,
     device_registry as dr,
@@ -26,17 +25,22 @@ from homeassistant.helpers import (
 )
 from homeassistant.helpers.entity import generate_entity_id
 import homeassistant.helpers.entity_registry as er
-from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.restore_state import RestoreEntity, StoredState
+from homeassistant.helpers.typing import UNDEFINED
 from homeassistant.util import slugify
 import voluptuous as vol
 import yaml
 
 from . import _async_exclude_entity_from_recorder
+from .collection import VariableCollection
 from .const import (
     ATTR_ATTRIBUTES,
+    ATTR_PATCH,
     ATTR_REPLACE_ATTRIBUTES,
     ATTR_VALUE,
     CONF_ATTRIBUTES,
+    CONF_COLLECTION,
+    CONF_ENTITY_PLATFORM,
     CONF_EXCLUDE_FROM_RECORDER,
     CONF_FORCE_UPDATE,
     CONF_RESTORE,
@@ -48,7 +52,10 @@ from .const import (
     DEFAULT_REPLACE_ATTRIBUTES,
     DOMAIN,
 )
-from .helpers import merge_attribute_dict
+from .entity import VariableEntity, async_restore_variables, track_update
+from .helpers import AttributeTree, to_attribute_tree
+from .patch import ATTRIBUTE_PATCH_SCHEMA
+from .startup import PHASE_ENTITY_INIT, async_get_startup_timer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -58,6 +65,21 @@ ENTITY_ID_FORMAT = PLATFORM + ".{}"
 SERVICE_UPDATE_VARIABLE = "update_" + PLATFORM
 SERVICE_TOGGLE_VARIABLE = "toggle_" + PLATFORM
 
+UPDATE_VARIABLE_SCHEMA = {
+    vol.Optional(CONF_VALUE): selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=["None", "true", "false"],
+            translation_key="boolean_options",
+            multiple=False,
+            custom_value=False,
+            mode=selector.SelectSelectorMode.LIST,
+        )
+    ),
+    vol.Optional(ATTR_ATTRIBUTES): dict,
+    vol.Optional(ATTR_REPLACE_ATTRIBUTES, default=DEFAULT_REPLACE_ATTRIBUTES): cv.boolean,
+    vol.Optional(ATTR_PATCH): ATTRIBUTE_PATCH_SCHEMA,
+}
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({})
 
 VARIABLE_ATTR_SETTINGS = {
@@ -78,19 +100,7 @@ async def async_setup_entry(
 
     platform.async_register_entity_service(
         SERVICE_UPDATE_VARIABLE,
-        {
-            vol.Optional(CONF_VALUE): selector.SelectSelector(
-                selector.SelectSelectorConfig(
-                    options=["None", "true", "false"],
-                    translation_key="boolean_options",
-                    multiple=False,
-                    custom_value=False,
-                    mode=selector.SelectSelectorMode.LIST,
-                )
-            ),
-            vol.Optional(ATTR_ATTRIBUTES): dict,
-            vol.Optional(ATTR_REPLACE_ATTRIBUTES, default=DEFAULT_REPLACE_ATTRIBUTES): cv.boolean,
-        },
+        UPDATE_VARIABLE_SCHEMA,
         "async_update_variable",
     )
 
@@ -103,26 +113,31 @@ async def async_setup_entry(
         "async_toggle_variable",
     )
 
+    if config_entry.data.get(CONF_ENTITY_PLATFORM) == CONF_COLLECTION:
+        collection: VariableCollection = hass.data[DOMAIN][config_entry.entry_id]
+        collection.async_setup_platform(async_add_entities, _create_variable)
+        return None
+
     config = hass.data.get(DOMAIN, {}).get(config_entry.entry_id, {})
     unique_id = config_entry.entry_id
     # _LOGGER.debug(f"[async_setup_entry] config_entry: {config_entry.as_dict()}")
     # _LOGGER.debug(f"[async_setup_entry] config: {config}")
     # _LOGGER.debug(f"[async_setup_entry] unique_id: {unique_id}")
 
-    if config.get(CONF_EXCLUDE_FROM_RECORDER, DEFAULT_EXCLUDE_FROM_RECORDER):
-        _LOGGER.debug(
-            f"({config.get(CONF_NAME, config.get(CONF_VARIABLE_ID, None))}) Excluding from Recorder"
-        )
-        async_add_entities([VariableNoRecorder(hass, config, config_entry, unique_id)])
-    else:
-        async_add_entities([Variable(hass, config, config_entry, unique_id)])
+    with async_get_startup_timer(hass).time(PHASE_ENTITY_INIT):
+        entities = [_create_variable(hass, config, config_entry, unique_id)]
+    async_restore_variables(hass, PLATFORM, entities)
+    async_add_entities(entities)
 
     return None
 
 
-class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
+class Variable(VariableEntity, BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
     """Representation of a Binary Sensor Variable."""
 
+    update_variable_schema = vol.Schema(UPDATE_VARIABLE_SCHEMA)
+    _variable_attr_settings = VARIABLE_ATTR_SETTINGS
+
     def __init__(
         self,
         hass,
@@ -132,18 +147,7 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
     ):
         """Initialize a Binary Sensor Variable."""
         # _LOGGER.debug(f"({config.get(CONF_NAME, config.get(CONF_VARIABLE_ID))}) [init] config: {config}")
-        if config.get(CONF_VALUE) is None or (
-            isinstance(config.get(CONF_VALUE), str)
-            and config.get(CONF_VALUE).lower() in ["", "none", "unknown", "unavailable"]
-        ):
-            self._attr_is_on = None
-        elif isinstance(config.get(CONF_VALUE), str):
-            if config.get(CONF_VALUE).lower() in ["true", "1", "t", "y", "yes", "on"]:
-                self._attr_is_on = True
-            else:
-                self._attr_is_on = False
-        else:
-            self._attr_is_on = config.get(CONF_VALUE)
+        self._attr_is_on = _initial_is_on(config.get(CONF_VALUE))
         self._hass = hass
         self._config = config
         self._config_entry = config_entry
@@ -167,11 +171,11 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
             _LOGGER.debug(
                 f"({config.get(CONF_NAME, config.get(CONF_VARIABLE_ID))}) [init] config attributes: {config.get(CONF_ATTRIBUTES)} (type: {type(config.get(CONF_ATTRIBUTES))})"
             )
-            self._attr_extra_state_attributes = cast(
-                dict, self._update_attr_settings(config.get(CONF_ATTRIBUTES))
+            self._attr_extra_state_attributes = to_attribute_tree(
+                self._update_attr_settings(config.get(CONF_ATTRIBUTES))
             )
         else:
-            self._attr_extra_state_attributes = {}
+            self._attr_extra_state_attributes = AttributeTree()
         registry = er.async_get(self._hass)
         current_entity_id = registry.async_get_entity_id(DOMAIN, PLATFORM, self._attr_unique_id)
         if current_entity_id is not None:
@@ -186,101 +190,89 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
         """Run when entity about to be added."""
         await super().async_added_to_hass()
         _LOGGER.debug(f"({self._attr_name}) [async_added_to_hass] config at add: {self._config}")
-        if self._restore is True:
-            _LOGGER.info(f"({self._attr_name}) Restoring after Reboot")
-            state = await self.async_get_last_state()
-            if state:
-                # _LOGGER.debug(f"({self._attr_name}) Restored last state: {state.as_dict()}")
-                if (
-                    hasattr(state, "attributes")
-                    and state.attributes
-                    and isinstance(state.attributes, MutableMapping)
-                ):
-                    # Never restore Home Assistant's computed friendly_name back into
-                    # _attr_name. When the entity is linked to a device and
-                    # _attr_has_entity_name is True, Home Assistant prefixes the
-                    # device name when generating friendly_name; restoring that value
-                    # would cause the device name to be duplicated on every reboot.
-                    restored_attributes = dict(state.attributes)
-                    restored_attributes.pop(ATTR_FRIENDLY_NAME, None)
-                    self._attr_extra_state_attributes = cast(
-                        dict,
-                        self._update_attr_settings(
-                            restored_attributes,
-                            just_pop=self._config.get(CONF_UPDATED, False),
-                        ),
-                    )
-                if hasattr(state, "state"):
-                    if state.state is None or (
-                        isinstance(state.state, str)
-                        and state.state.lower() in ["", "none", "unknown", "unavailable"]
-                    ):
-                        self._attr_is_on = None
-                    elif state.state == STATE_OFF:
-                        self._attr_is_on = False
-                    elif state.state == STATE_ON:
-                        self._attr_is_on = True
-                    elif isinstance(state.state, bool):
-                        self._attr_is_on = state.state
-                    else:
-                        self._attr_is_on = None
-                else:
-                    self._attr_is_on = None
-            _LOGGER.debug(f"({self._attr_name}) [restored] _attr_is_on: {self._attr_is_on}")
-            _LOGGER.debug(
-                f"({self._attr_name}) [restored] attributes: {getattr(self, '_attr_extra_state_attributes', {})}"
-            )
-            # If there were no attributes restored from state, apply attributes from config
-            if (
-                not getattr(self, "_attr_extra_state_attributes", None)
-                or self._attr_extra_state_attributes == {}
-            ) and self._config.get(CONF_ATTRIBUTES):
-                self._attr_extra_state_attributes = cast(
-                    dict, self._update_attr_settings(self._config.get(CONF_ATTRIBUTES))
-                )
-                _LOGGER.debug(
-                    f"({self._attr_name}) [restored] applied config attributes: {getattr(self, '_attr_extra_state_attributes', {})}"
-                )
-            try:
-                self.async_write_ha_state()
-            except Exception as err:
-                _LOGGER.debug(
-                    "(%s) async_write_ha_state failed during restore: %s",
-                    self._attr_name,
-                    err,
-                )
-        else:
+        if self._restore is not True:
             # If not restoring from state, ensure config-provided attributes are applied
             if (
                 not getattr(self, "_attr_extra_state_attributes", None)
                 or self._attr_extra_state_attributes == {}
             ) and self._config.get(CONF_ATTRIBUTES):
-                self._attr_extra_state_attributes = cast(
-                    dict, self._update_attr_settings(self._config.get(CONF_ATTRIBUTES))
+                self._attr_extra_state_attributes = to_attribute_tree(
+                    self._update_attr_settings(self._config.get(CONF_ATTRIBUTES))
                 )
                 _LOGGER.debug(
                     f"({self._attr_name}) [added] applied config attributes: {getattr(self, '_attr_extra_state_attributes', {})}"
                 )
-            try:
-                self.async_write_ha_state()
-            except Exception as err:
-                _LOGGER.debug(
-                    "(%s) async_write_ha_state failed during add: %s",
-                    self._attr_name,
-                    err,
-                )
         if self._config.get(CONF_UPDATED, True):
             self._config.update({CONF_UPDATED: False})
-            self._hass.config_entries.async_update_entry(
-                self._config_entry,
-                data=self._config,
-                options={},
-            )
+            self._async_save_config()
             _LOGGER.debug(
                 f"({self._attr_name}) Updated config_updated: "
                 + f"{self._config_entry.data.get(CONF_UPDATED)}"
             )
 
+    @property
+    def _stored_value(self) -> bool | None:
+        """Return the on/off state to save in the value store."""
+        return self._attr_is_on
+
+    @callback
+    def _async_expire(self, reset_to_initial: bool) -> None:
+        """Reset to the initial value or unknown when the variable expires."""
+        self._attr_is_on = (
+            _initial_is_on(self._config.get(CONF_VALUE)) if reset_to_initial else None
+        )
+
+    def _restored_value(self, stored: StoredState) -> str:
+        """Return the state saved in the restore cache."""
+        return stored.state.state
+
+    @callback
+    def _async_restore(self, value: Any, attributes: Mapping[str, Any] | None) -> None:
+        """Apply the restored state and attributes before the first write."""
+        _LOGGER.debug("(%s) Restoring after Reboot", self._attr_name)
+        if attributes and isinstance(attributes, Mapping):
+            # Never restore Home Assistant's computed friendly_name back into
+            # _attr_name. When the entity is linked to a device and
+            # _attr_has_entity_name is True, Home Assistant prefixes the
+            # device name when generating friendly_name; restoring that value
+            # would cause the device name to be duplicated on every reboot.
+            restored_attributes = dict(attributes)
+            restored_attributes.pop(ATTR_FRIENDLY_NAME, None)
+            self._attr_extra_state_attributes = to_attribute_tree(
+                self._update_attr_settings(
+                    restored_attributes,
+                    just_pop=self._config.get(CONF_UPDATED, False),
+                )
+            )
+        if value is not UNDEFINED:
+            if value is None or (
+                isinstance(value, str) and value.lower() in ["", "none", "unknown", "unavailable"]
+            ):
+                self._attr_is_on = None
+            elif value == STATE_OFF:
+                self._attr_is_on = False
+            elif value == STATE_ON:
+                self._attr_is_on = True
+            elif isinstance(value, bool):
+                self._attr_is_on = value
+            else:
+                self._attr_is_on = None
+        _LOGGER.debug("(%s) [restored] _attr_is_on: %s", self._attr_name, self._attr_is_on)
+        _LOGGER.debug(
+            "(%s) [restored] attributes: %s", self._attr_name, self._attr_extra_state_attributes
+        )
+        # If there were no attributes restored from state, apply attributes from config
+        if (
+            not getattr(self, "_attr_extra_state_attributes", None)
+            or self._attr_extra_state_attributes == {}
+        ) and self._config.get(CONF_ATTRIBUTES):
+            self._attr_extra_state_attributes = to_attribute_tree(
+                self._update_attr_settings(self._config.get(CONF_ATTRIBUTES))
+            )
+            _LOGGER.debug(
+                f"({self._attr_name}) [restored] applied config attributes: {getattr(self, '_attr_extra_state_attributes', {})}"
+            )
+
     @property
     def should_poll(self):  # type: ignore[override]
         """If entity should be polled."""
@@ -297,7 +289,7 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
                 f"({self._attr_name}) [update_attr_settings] Updating Special Attributes; incoming: {new_attributes} (type: {type(new_attributes)})"
             )
             if isinstance(new_attributes, MutableMapping):
-                attributes = copy.deepcopy(new_attributes)
+                attributes = dict(new_attributes)
                 _LOGGER.debug(
                     f"({self._attr_name}) [update_attr_settings] copied attributes: {attributes}"
                 )
@@ -312,7 +304,7 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
                 _LOGGER.debug(
                     f"({self._attr_name}) [update_attr_settings] result attributes: {attributes}"
                 )
-                return copy.deepcopy(attributes)
+                return attributes
             else:
                 _LOGGER.error(
                     f"({self._attr_name}) AttributeError: Attributes must be a dictionary: {new_attributes}"
@@ -321,24 +313,24 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
         else:
             return None
 
+    @track_update
     async def async_update_variable(self, **kwargs) -> None:
         """Update Binary Sensor Variable."""
 
-        _LOGGER.debug(f"({self._attr_name}) [async_update_variable] kwargs: {kwargs}")
-
-        updated_attributes = None
+        _LOGGER.debug("(%s) [async_update_variable] kwargs: %s", self._attr_name, kwargs)
 
         replace_attributes = kwargs.get(ATTR_REPLACE_ATTRIBUTES, False)
         _LOGGER.debug(
-            f"({self._attr_name}) [async_update_variable] Replace Attributes: {replace_attributes}"
+            "(%s) [async_update_variable] Replace Attributes: %s",
+            self._attr_name,
+            replace_attributes,
         )
 
-        if (
-            not replace_attributes
-            and hasattr(self, "_attr_extra_state_attributes")
-            and self._attr_extra_state_attributes is not None
-        ):
-            updated_attributes = copy.deepcopy(self._attr_extra_state_attributes)
+        updated_attributes = AttributeTree()
+        if not replace_attributes:
+            updated_attributes = to_attribute_tree(
+                getattr(self, "_attr_extra_state_attributes", None)
+            )
 
         attributes = kwargs.get(ATTR_ATTRIBUTES)
         if attributes is not None:
@@ -350,14 +342,13 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
                     attributes = None
             if isinstance(attributes, MutableMapping):
                 _LOGGER.debug(
-                    f"({self._attr_name}) [async_update_variable] New Attributes: {attributes}"
+                    "(%s) [async_update_variable] New Attributes: %s", self._attr_name, attributes
                 )
                 extra_attributes = self._update_attr_settings(attributes)
                 if extra_attributes is not None:
                     try:
-                        updated_attributes = merge_attribute_dict(
-                            updated_attributes, extra_attributes
-                        )
+                        with self._time_attribute_copy():
+                            updated_attributes = updated_attributes.merge(extra_attributes)
                     except ValueError as err:
                         _LOGGER.error(
                             "(%s) AttributeError: %s",
@@ -369,13 +360,16 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
                     f"({self._attr_name}) AttributeError: Attributes must be a dictionary: {attributes}"
                 )
 
-        if updated_attributes is not None:
-            self._attr_extra_state_attributes = cast(dict, copy.deepcopy(updated_attributes))
-            _LOGGER.debug(
-                f"({self._attr_name}) [async_update_variable] Final Attributes: {updated_attributes}"
-            )
-        else:
-            self._attr_extra_state_attributes = cast(dict, {})
+        if (patch := kwargs.get(ATTR_PATCH)) is not None:
+            with self._time_attribute_copy():
+                updated_attributes = updated_attributes.patch(patch)
+
+        self._attr_extra_state_attributes = updated_attributes
+        _LOGGER.debug(
+            "(%s) [async_update_variable] Final Attributes: %s",
+            self._attr_name,
+            updated_attributes,
+        )
 
         if ATTR_VALUE in kwargs:
             val = kwargs.get(ATTR_VALUE)
@@ -396,24 +390,24 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
 
         self.async_write_ha_state()
 
+    @track_update
     async def async_toggle_variable(self, **kwargs) -> None:
         """Toggle Binary Sensor Variable."""
 
-        _LOGGER.debug(f"({self._attr_name}) [async_toggle_variable] kwargs: {kwargs}")
-
-        updated_attributes = None
+        _LOGGER.debug("(%s) [async_toggle_variable] kwargs: %s", self._attr_name, kwargs)
 
         replace_attributes = kwargs.get(ATTR_REPLACE_ATTRIBUTES, False)
         _LOGGER.debug(
-            f"({self._attr_name}) [async_toggle_variable] Replace Attributes: {replace_attributes}"
+            "(%s) [async_toggle_variable] Replace Attributes: %s",
+            self._attr_name,
+            replace_attributes,
         )
 
-        if (
-            not replace_attributes
-            and hasattr(self, "_attr_extra_state_attributes")
-            and self._attr_extra_state_attributes is not None
-        ):
-            updated_attributes = copy.deepcopy(self._attr_extra_state_attributes)
+        updated_attributes = AttributeTree()
+        if not replace_attributes:
+            updated_attributes = to_attribute_tree(
+                getattr(self, "_attr_extra_state_attributes", None)
+            )
 
         attributes = kwargs.get(ATTR_ATTRIBUTES)
         if attributes is not None:
@@ -425,14 +419,13 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
                     attributes = None
             if isinstance(attributes, MutableMapping):
                 _LOGGER.debug(
-                    f"({self._attr_name}) [async_toggle_variable] New Attributes: {attributes}"
+                    "(%s) [async_toggle_variable] New Attributes: %s", self._attr_name, attributes
                 )
                 extra_attributes = self._update_attr_settings(attributes)
                 if extra_attributes is not None:
                     try:
-                        updated_attributes = merge_attribute_dict(
-                            updated_attributes, extra_attributes
-                        )
+                        with self._time_attribute_copy():
+                            updated_attributes = updated_attributes.merge(extra_attributes)
                     except ValueError as err:
                         _LOGGER.error(
                             "(%s) AttributeError: %s",
@@ -444,13 +437,12 @@ class Variable(BinarySensorEntity, RestoreEntity):  # type: ignore[misc]
                     f"({self._attr_name}) AttributeError: Attributes must be a dictionary: {attributes}"
                 )
 
-        if updated_attributes is not None:
-            self._attr_extra_state_attributes = cast(dict, copy.deepcopy(updated_attributes))
-            _LOGGER.debug(
-                f"({self._attr_name}) [async_toggle_variable] Final Attributes: {updated_attributes}"
-            )
-        else:
-            self._attr_extra_state_attributes = cast(dict, {})
+        self._attr_extra_state_attributes = updated_attributes
+        _LOGGER.debug(
+            "(%s) [async_toggle_variable] Final Attributes: %s",
+            self._attr_name,
+            updated_attributes,
+        )
 
         if self._attr_is_on is not None:
             self._attr_is_on = not self._attr_is_on
@@ -470,3 +462,24 @@ class VariableNoRecorder(Variable):
         await _async_exclude_entity_from_recorder(self.hass, self.entity_id)
 
         _LOGGER.debug(f"({self._attr_name}) Excluded from recorder: {self.entity_id}")
+
+
+def _initial_is_on(value) -> bool | None:
+    """Return the on/off state of a configured initial value."""
+    if value is None or (
+        isinstance(value, str) and value.lower() in ["", "none", "unknown", "unavailable"]
+    ):
+        return None
+    if isinstance(value, str):
+        return value.lower() in ["true", "1", "t", "y", "yes", "on"]
+    return value
+
+
+def _create_variable(hass, config, config_entry, unique_id) -> Variable:
+    """Create a Binary Sensor Variable, excluded from the recorder if configured."""
+    if config.get(CONF_EXCLUDE_FROM_RECORDER, DEFAULT_EXCLUDE_FROM_RECORDER):
+        _LOGGER.debug(
+            f"({config.get(CONF_NAME, config.get(CONF_VARIABLE_ID, None))}) Excluding from Recorder"
+        )
+        return VariableNoRecorder(hass, config, config_entry, unique_id)
+    return Variable(hass, config, config_entry, unique_id)
@@ -0,0 +1,82 @@
+"""Large attribute values kept out of the state machine."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+import hashlib
+from typing import Any
+
+from homeassistant.helpers.json import json_bytes
+
+from .helpers import AttributeTree
+
+BLOB_DESCRIPTOR_KEYS = frozenset({"hash", "size", "version"})
+
+
+def is_blob_descriptor(value: Any) -> bool:
+    """Return whether an attribute value is the descriptor of a blob."""
+    return isinstance(value, Mapping) and value.keys() == BLOB_DESCRIPTOR_KEYS
+
+
+class BlobAttributes:
+    """Public view of an attribute tree with its large values replaced.
+
+    Values whose JSON encoding is larger than the threshold are published as a
+    descriptor holding their content hash, size in bytes and a version that
+    counts content changes; the values themselves stay on the entity and in
+    the value store. A value is only measured again when the tree holds a
+    different object for it, so with AttributeTree versions an update only
+    measures the attributes it replaced.
+    """
+
+    __slots__ = ("_public", "_source", "_threshold", "_values")
+
+    def __init__(self, threshold: int) -> None:
+        """Initialize without attributes.
+
+        Args:
+            threshold: Largest JSON size in bytes of a value published as is.
+        """
+        self._threshold = threshold
+        # Each attribute's last value and what was published for it.
+        self._values: dict[str, tuple[Any, Any]] = {}
+        self._source: Mapping[str, Any] | None = None
+        self._public: AttributeTree = AttributeTree()
+
+    def public(self, attributes: Mapping[str, Any]) -> AttributeTree:
+        """Return ``attributes`` with every large value replaced by its descriptor."""
+        if attributes is self._source:
+            return self._public
+        values: dict[str, tuple[Any, Any]] = {}
+        for key, value in attributes.items():
+            cached = self._values.get(key)
+            if cached is None or cached[0] is not value:
+                cached = (value, self._publish(value, None if cached is None else cached[1]))
+            values[key] = cached
+        self._values = values
+        self._source = attributes
+        self._public = AttributeTree({key: public for key, (_, public) in values.items()})
+        return self._public
+
+    def descriptor(self, key: str) -> dict[str, Any] | None:
+        """Return the descriptor published for an attribute, if it is a blob."""
+        cached = self._values.get(key)
+        if cached is None or cached[1] is cached[0]:
+            return None
+        return cached[1]
+
+    def _publish(self, value: Any, previous: Any) -> Any:
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        try:
+            encoded = json_bytes(value)
+        except TypeError:
+            return value
+        if len(encoded) <= self._threshold:
+            return value
+        digest = hashlib.sha256(encoded).hexdigest()
+        if not is_blob_descriptor(previous):
+            return {"hash": digest, "size": len(encoded), "version": 1}
+        if previous["hash"] == digest:
+            return previous
+        return {"hash": digest, "size": len(encoded), "version": previous["version"] + 1}
@@ -0,0 +1,181 @@
+"""Variable collections: many variables of one platform under one config entry."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    CONF_COLLECTION_PLATFORM,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_VARIABLE_ID,
+    DATA_PERFORMANCE,
+    SUBENTRY_TYPE_VARIABLE,
+)
+from .entity import VariableEntity, async_restore_variables
+from .journal import async_get_variable_journal
+from .performance import VariablePerformanceSensor, async_create_performance_sensors
+from .startup import PHASE_ENTITY_INIT, async_get_startup_timer
+from .store import async_get_variable_store
+
+_LOGGER = logging.getLogger(__name__)
+
+type VariableFactory = Callable[[HomeAssistant, dict, ConfigEntry, str], VariableEntity]
+
+
+class VariableCollection:
+    """Runtime state of a collection config entry.
+
+    Each variable is a config subentry. Entities are added, replaced or
+    removed one at a time as subentries change, so editing a collection never
+    reloads the variables that did not change. The performance sensors of its
+    variables are added by the sensor platform, whatever the collection's
+    platform is, and follow their variable.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the collection for a config entry."""
+        self.hass = hass
+        self.entry = entry
+        self.entities: dict[str, VariableEntity] = {}
+        self._loaded_data: dict[str, dict[str, Any]] = {}
+        self._async_add_entities: AddEntitiesCallback | None = None
+        self._entity_factory: VariableFactory | None = None
+        self.performance_sensors: dict[str, list[VariablePerformanceSensor]] = {}
+        self._async_add_performance_sensors: AddEntitiesCallback | None = None
+        # Update listener runs still to come for configs saved by the variables.
+        self._pending_saves = 0
+
+    @callback
+    def async_setup_platform(
+        self, async_add_entities: AddEntitiesCallback, entity_factory: VariableFactory
+    ) -> None:
+        """Attach the platform callbacks and add an entity per subentry."""
+        self._async_add_entities = async_add_entities
+        self._entity_factory = entity_factory
+        with async_get_startup_timer(self.hass).time(PHASE_ENTITY_INIT):
+            entities = {
+                subentry_id: self._async_create_variable(subentry_id, data)
+                for subentry_id, data in self._variable_subentries().items()
+            }
+        async_restore_variables(
+            self.hass, self.entry.data[CONF_COLLECTION_PLATFORM], entities.values()
+        )
+        for subentry_id, entity in entities.items():
+            async_add_entities([entity], config_subentry_id=subentry_id)
+
+    @callback
+    def async_setup_performance_sensors(self, async_add_entities: AddEntitiesCallback) -> None:
+        """Attach the sensor platform callback and add the variables' performance sensors."""
+        self._async_add_performance_sensors = async_add_entities
+        for subentry_id, data in self._variable_subentries().items():
+            self._async_add_variable_performance_sensors(subentry_id, data)
+
+    async def async_entry_updated(self) -> None:
+        """Handle an update of the config entry or one of its subentries.
+
+        Listeners run in the order the updates were made, so a run caused by
+        a variable saving its own config is skipped without comparing every
+        subentry again.
+        """
+        if self._pending_saves:
+            self._pending_saves -= 1
+            return
+        await self.async_sync()
+
+    async def async_sync(self) -> None:
+        """Apply subentry additions, changes and removals to the loaded entities."""
+        if self._async_add_entities is None:
+            return
+        current = self._variable_subentries()
+        for subentry_id in list(self._loaded_data):
+            if subentry_id not in current:
+                _LOGGER.info(
+                    "[Collection %s] Removing variable: %s",
+                    self.entry.title,
+                    self._loaded_data[subentry_id].get(CONF_VARIABLE_ID),
+                )
+                await self._async_remove_variable(subentry_id)
+                async_get_variable_store(self.hass).async_remove(subentry_id)
+                async_get_variable_journal(self.hass).async_remove(subentry_id)
+                self.hass.data.get(DATA_PERFORMANCE, {}).pop(subentry_id, None)
+        for subentry_id, data in current.items():
+            loaded = self._loaded_data.get(subentry_id)
+            if loaded == data:
+                continue
+            if loaded is not None:
+                _LOGGER.info(
+                    "[Collection %s] Replacing changed variable: %s",
+                    self.entry.title,
+                    data.get(CONF_VARIABLE_ID),
+                )
+                await self._async_remove_variable(subentry_id)
+            else:
+                _LOGGER.info(
+                    "[Collection %s] Adding variable: %s",
+                    self.entry.title,
+                    data.get(CONF_VARIABLE_ID),
+                )
+            self._async_add_variable(subentry_id, data)
+
+    @callback
+    def async_save_variable_config(self, subentry_id: str, data: dict[str, Any]) -> None:
+        """Persist a variable's config without treating it as a subentry change."""
+        subentry = self.entry.subentries.get(subentry_id)
+        if subentry is None:
+            return
+        self._loaded_data[subentry_id] = dict(data)
+        # Update listeners can start eagerly, before the update returns.
+        self._pending_saves += 1
+        if not self.hass.config_entries.async_update_subentry(
+            self.entry, subentry, data=dict(data)
+        ):
+            self._pending_saves -= 1
+
+    def _variable_subentries(self) -> dict[str, dict[str, Any]]:
+        return {
+            subentry_id: dict(subentry.data)
+            for subentry_id, subentry in self.entry.subentries.items()
+            if subentry.subentry_type == SUBENTRY_TYPE_VARIABLE
+        }
+
+    @callback
+    def _async_create_variable(self, subentry_id: str, data: dict[str, Any]) -> VariableEntity:
+        assert self._entity_factory is not None
+        self._loaded_data[subentry_id] = data
+        # Entities keep a mutable copy; the snapshot above is what changes are
+        # detected against.
+        entity = self._entity_factory(self.hass, dict(data), self.entry, subentry_id)
+        entity._config_subentry_id = subentry_id
+        self.entities[subentry_id] = entity
+        return entity
+
+    @callback
+    def _async_add_variable(self, subentry_id: str, data: dict[str, Any]) -> None:
+        assert self._async_add_entities is not None
+        entity = self._async_create_variable(subentry_id, data)
+        self._async_add_entities([entity], config_subentry_id=subentry_id)
+        self._async_add_variable_performance_sensors(subentry_id, data)
+
+    @callback
+    def _async_add_variable_performance_sensors(
+        self, subentry_id: str, data: dict[str, Any]
+    ) -> None:
+        if self._async_add_performance_sensors is None or not data.get(CONF_PERFORMANCE_SENSORS):
+            return
+        sensors = async_create_performance_sensors(self.hass, data, subentry_id)
+        self.performance_sensors[subentry_id] = sensors
+        self._async_add_performance_sensors(sensors, config_subentry_id=subentry_id)
+
+    async def _async_remove_variable(self, subentry_id: str) -> None:
+        self._loaded_data.pop(subentry_id, None)
+        if (entity := self.entities.pop(subentry_id, None)) is not None:
+            await entity.async_remove()
+        for sensor in self.performance_sensors.pop(subentry_id, []):
+            # Removing through the platform also stops it polling once empty.
+            await sensor.platform.async_remove_entity(sensor.entity_id)
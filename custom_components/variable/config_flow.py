@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 import datetime
 from enum import Enum
 import logging
@@ -51,12 +52,29 @@ from .const import (
     ATTR_DELETE_LOCATION_NAME,
     ATTR_REPLACE_ATTRIBUTES,
     ATTR_VALUE,
+    CONF_ACCUMULATOR,
+    CONF_ACCUMULATOR_FLUSH_COUNT,
+    CONF_ACCUMULATOR_FLUSH_INTERVAL,
     CONF_ATTRIBUTES,
+    CONF_BLOB_THRESHOLD,
     CONF_CLEAR_DEVICE_ID,
+    CONF_COLLECTION,
+    CONF_COLLECTION_PLATFORM,
+    CONF_DEADBAND,
+    CONF_DEADBAND_PERCENT,
     CONF_ENTITY_PLATFORM,
     CONF_EXCLUDE_FROM_RECORDER,
     CONF_FORCE_UPDATE,
+    CONF_HISTORY_SIZE,
+    CONF_JOURNAL,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_PERFORMANCE_SENSORS,
     CONF_RESTORE,
+    CONF_STATISTICS,
+    CONF_STATISTICS_EMA_ALPHA,
+    CONF_STATISTICS_WINDOW,
+    CONF_TTL,
+    CONF_TTL_RESET_TO_INITIAL,
     CONF_TZOFFSET,
     CONF_UPDATED,
     CONF_VALUE,
@@ -64,18 +82,29 @@ from .const import (
     CONF_VARIABLE_ID,
     CONF_YAML_PRESENT,
     CONF_YAML_VARIABLE,
+    DEFAULT_ACCUMULATOR_FLUSH_INTERVAL,
+    DEFAULT_BLOB_THRESHOLD,
+    DEFAULT_DEADBAND,
     DEFAULT_EXCLUDE_FROM_RECORDER,
     DEFAULT_FORCE_UPDATE,
+    DEFAULT_HISTORY_SIZE,
     DEFAULT_ICON,
+    DEFAULT_JOURNAL,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_PERFORMANCE_SENSORS,
     DEFAULT_RESTORE,
+    DEFAULT_STATISTICS_EMA_ALPHA,
+    DEFAULT_STATISTICS_WINDOW,
+    DEFAULT_TTL,
     DOMAIN,
     PLATFORMS,
     SERVICE_UPDATE_BINARY_SENSOR,
     SERVICE_UPDATE_DEVICE_TRACKER,
     SERVICE_UPDATE_SENSOR,
+    SUBENTRY_TYPE_VARIABLE,
 )
 from .device import update_device
-from .helpers import value_to_type
+from .helpers import get_value_converter
 
 
 def _get_currency_units() -> list[str]:
@@ -262,6 +291,82 @@ ADD_DEVICE_SCHEMA = vol.Schema(
     }
 )
 
+ADD_COLLECTION_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): cv.string,
+        vol.Required(CONF_COLLECTION_PLATFORM, default=Platform.SENSOR): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=PLATFORMS,
+                translation_key="collection_platform",
+                multiple=False,
+                custom_value=False,
+                mode=selector.SelectSelectorMode.LIST,
+            )
+        ),
+    }
+)
+
+ADD_VARIABLE_SCHEMAS = {
+    Platform.SENSOR: ADD_SENSOR_SCHEMA,
+    Platform.BINARY_SENSOR: ADD_BINARY_SENSOR_SCHEMA,
+    Platform.DEVICE_TRACKER: ADD_DEVICE_TRACKER_SCHEMA,
+}
+
+
+def _variable_tuning_options(data: Mapping[str, Any]) -> dict[vol.Optional, Any]:
+    """Return the options schema fields shared by every variable platform.
+
+    Covers state write coalescing, the journal, the TTL, blob attributes and
+    performance sensors, with defaults taken from the entry data.
+    """
+    return {
+        vol.Optional(
+            CONF_MIN_WRITE_INTERVAL,
+            default=data.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                step="any",
+                unit_of_measurement="s",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        ),
+        vol.Optional(
+            CONF_JOURNAL,
+            default=data.get(CONF_JOURNAL, DEFAULT_JOURNAL),
+        ): selector.BooleanSelector(selector.BooleanSelectorConfig()),
+        vol.Optional(
+            CONF_TTL,
+            default=data.get(CONF_TTL, DEFAULT_TTL),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                step="any",
+                unit_of_measurement="s",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        ),
+        vol.Optional(
+            CONF_TTL_RESET_TO_INITIAL,
+            default=data.get(CONF_TTL_RESET_TO_INITIAL, False),
+        ): selector.BooleanSelector(selector.BooleanSelectorConfig()),
+        vol.Optional(
+            CONF_BLOB_THRESHOLD,
+            default=data.get(CONF_BLOB_THRESHOLD, DEFAULT_BLOB_THRESHOLD),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                step=1,
+                unit_of_measurement="B",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        ),
+        vol.Optional(
+            CONF_PERFORMANCE_SENSORS,
+            default=data.get(CONF_PERFORMANCE_SENSORS, DEFAULT_PERFORMANCE_SENSORS),
+        ): selector.BooleanSelector(selector.BooleanSelectorConfig()),
+    }
+
 
 async def validate_sensor_input(hass: HomeAssistant, data: dict) -> dict[str, Any]:
     """Validate the user input"""
@@ -278,7 +383,7 @@ class VariableConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ign
 
     async def async_step_user(self, user_input: dict | None = None) -> Any:
         """Handle the initial step."""
-        platforms_w_device: list = PLATFORMS + [CONF_DEVICE]
+        platforms_w_device: list = PLATFORMS + [CONF_DEVICE, CONF_COLLECTION]
         return self.async_show_menu(
             step_id="user",
             menu_options=["add_" + p for p in platforms_w_device],
@@ -342,10 +447,7 @@ class VariableConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ign
                 val = user_input.get(CONF_VALUE)
             _LOGGER.debug(f"[New Sensor Page 2] val: {val}")
             try:
-                newval = value_to_type(
-                    val,
-                    self.add_sensor_input.get(CONF_VALUE_TYPE),
-                )
+                newval = get_value_converter(self.add_sensor_input.get(CONF_VALUE_TYPE))(val)
             except ValueError:
                 errors["base"] = "invalid_value_type"
                 if self.add_sensor_input.get(CONF_YAML_VARIABLE) is True:
@@ -634,6 +736,27 @@ class VariableConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ign
             },
         )
 
+    async def async_step_add_collection(
+        self,
+        user_input: dict | None = None,
+        errors: dict | None = None,
+    ) -> Any:
+        errors = {} if errors is None else errors
+        if user_input is not None:
+            user_input.update({CONF_ENTITY_PLATFORM: CONF_COLLECTION})
+            user_input.update({CONF_YAML_VARIABLE: False})
+            _LOGGER.debug(f"[New Collection] updated user_input: {user_input}")
+            return self.async_create_entry(title=user_input[CONF_NAME], data=user_input)
+
+        return self.async_show_form(
+            step_id="add_collection",
+            data_schema=ADD_COLLECTION_SCHEMA,
+            errors=errors,
+            description_placeholders={
+                "component_config_url": COMPONENT_CONFIG_URL,
+            },
+        )
+
     # this is run to import the configuration.yaml parameters\
     async def async_step_import(self, import_config: dict | None = None) -> Any:
         """Import a config entry from configuration.yaml."""
@@ -649,6 +772,69 @@ class VariableConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ign
         """Get the options flow."""
         return VariableOptionsFlowHandler(config_entry)
 
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry: config_entries.ConfigEntry) -> bool:
+        """Collections are managed through their variable subentries instead."""
+        return config_entry.data.get(CONF_ENTITY_PLATFORM) != CONF_COLLECTION
+
+    @classmethod
+    @callback
+    def async_get_supported_subentry_types(
+        cls, config_entry: config_entries.ConfigEntry
+    ) -> dict[str, type[config_entries.ConfigSubentryFlow]]:
+        """Return the subentry types supported by a config entry."""
+        if config_entry.data.get(CONF_ENTITY_PLATFORM) == CONF_COLLECTION:
+            return {SUBENTRY_TYPE_VARIABLE: VariableSubentryFlowHandler}
+        return {}
+
+
+class VariableSubentryFlowHandler(config_entries.ConfigSubentryFlow):
+    """Add a variable to a variable collection."""
+
+    # Sensor variables use the same second page as stand-alone sensors.
+    async_step_sensor_page_2 = VariableConfigFlow.async_step_sensor_page_2
+    build_add_sensor_page_2 = VariableConfigFlow.build_add_sensor_page_2
+    yaml_import_get_value_type = VariableConfigFlow.yaml_import_get_value_type
+
+    async def async_step_user(self, user_input: dict | None = None) -> Any:
+        """Show the add form for the collection's platform."""
+        collection_entry = self._get_entry()
+        platform = collection_entry.data[CONF_COLLECTION_PLATFORM]
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            variable_id = user_input[CONF_VARIABLE_ID]
+            if any(
+                subentry.data.get(CONF_VARIABLE_ID) == variable_id
+                for subentry in collection_entry.subentries.values()
+            ):
+                errors[CONF_VARIABLE_ID] = "variable_id_exists"
+            else:
+                user_input.update({CONF_ENTITY_PLATFORM: platform})
+                user_input.update({CONF_YAML_VARIABLE: False})
+                _LOGGER.debug(f"[New Collection Variable] user_input: {user_input}")
+                if platform == Platform.SENSOR:
+                    self.add_sensor_input = user_input
+                    return await self.async_step_sensor_page_2()
+                info = await validate_sensor_input(self.hass, user_input)
+                return self.async_create_entry(title=info.get("title", ""), data=user_input)
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=ADD_VARIABLE_SCHEMAS[platform].extend(
+                {
+                    vol.Optional(
+                        CONF_PERFORMANCE_SENSORS, default=DEFAULT_PERFORMANCE_SENSORS
+                    ): selector.BooleanSelector(selector.BooleanSelectorConfig()),
+                }
+            ),
+            errors=errors,
+            description_placeholders={
+                "collection": collection_entry.title,
+                "component_config_url": COMPONENT_CONFIG_URL,
+            },
+        )
+
 
 class VariableOptionsFlowHandler(config_entries.OptionsFlow):
     """Options for the component."""
@@ -724,10 +910,7 @@ class VariableOptionsFlowHandler(config_entries.OptionsFlow):
                 val = user_input.get(CONF_VALUE)
             _LOGGER.debug(f"[Change Sensor Value] val: {val}")
             try:
-                newval = value_to_type(
-                    val,
-                    self.config_entry.data.get(CONF_VALUE_TYPE),
-                )
+                newval = get_value_converter(self.config_entry.data.get(CONF_VALUE_TYPE))(val)
             except ValueError:
                 errors["base"] = "invalid_value_type"
             else:
@@ -785,7 +968,7 @@ class VariableOptionsFlowHandler(config_entries.OptionsFlow):
 
         elif self.config_entry.data.get(CONF_DEVICE_CLASS) in [sensor.SensorDeviceClass.TIMESTAMP]:
             if state.state:
-                dt = value_to_type(state.state, self.config_entry.data.get(CONF_VALUE_TYPE))
+                dt = get_value_converter(self.config_entry.data.get(CONF_VALUE_TYPE))(state.state)
                 if dt is not None and isinstance(dt, datetime.datetime):
                     tz_offset = dt.strftime("%z")
                     if tz_offset is None:
@@ -1239,6 +1422,17 @@ class VariableOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_EXCLUDE_FROM_RECORDER, DEFAULT_EXCLUDE_FROM_RECORDER
                     ),
                 ): selector.BooleanSelector(selector.BooleanSelectorConfig()),
+                **_variable_tuning_options(self.config_entry.data),
+                vol.Optional(
+                    CONF_HISTORY_SIZE,
+                    default=self.config_entry.data.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0,
+                        step=1,
+                        mode=selector.NumberSelectorMode.BOX,
+                    )
+                ),
             }
         )
 
@@ -1265,10 +1459,7 @@ class VariableOptionsFlowHandler(config_entries.OptionsFlow):
                 val = user_input.get(CONF_VALUE)
             _LOGGER.debug(f"[New Sensor Page 2] val: {val}")
             try:
-                newval = value_to_type(
-                    val,
-                    self.sensor_options_page_1.get(CONF_VALUE_TYPE),
-                )
+                newval = get_value_converter(self.sensor_options_page_1.get(CONF_VALUE_TYPE))(val)
             except ValueError:
                 errors["base"] = "invalid_value_type"
             else:
@@ -1400,7 +1591,7 @@ class VariableOptionsFlowHandler(config_entries.OptionsFlow):
                 value_type = "datetime"
                 if val_default:
                     _LOGGER.debug(f"val_default_value: {val_default_value}")
-                    dt = value_to_type(val_default_value, value_type)
+                    dt = get_value_converter(value_type)(val_default_value)
                     if dt is not None and isinstance(dt, datetime.datetime):
                         tz_offset = dt.strftime("%z")
                         if tz_offset is None:
@@ -1543,6 +1734,91 @@ class VariableOptionsFlowHandler(config_entries.OptionsFlow):
         else:
             self.sensor_options_page_1[CONF_UNIT_OF_MEASUREMENT] = None
 
+        if value_type == "number":
+            SENSOR_OPTIONS_PAGE_2_SCHEMA = SENSOR_OPTIONS_PAGE_2_SCHEMA.extend(
+                {
+                    vol.Optional(
+                        CONF_DEADBAND,
+                        default=self.config_entry.data.get(CONF_DEADBAND, DEFAULT_DEADBAND),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            step="any",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_DEADBAND_PERCENT,
+                        default=self.config_entry.data.get(CONF_DEADBAND_PERCENT, DEFAULT_DEADBAND),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=100,
+                            step="any",
+                            unit_of_measurement="%",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_ACCUMULATOR,
+                        default=self.config_entry.data.get(CONF_ACCUMULATOR, False),
+                    ): selector.BooleanSelector(selector.BooleanSelectorConfig()),
+                    vol.Optional(
+                        CONF_ACCUMULATOR_FLUSH_INTERVAL,
+                        default=self.config_entry.data.get(
+                            CONF_ACCUMULATOR_FLUSH_INTERVAL, DEFAULT_ACCUMULATOR_FLUSH_INTERVAL
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            step="any",
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_ACCUMULATOR_FLUSH_COUNT,
+                        default=self.config_entry.data.get(CONF_ACCUMULATOR_FLUSH_COUNT, 0),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_STATISTICS,
+                        default=self.config_entry.data.get(CONF_STATISTICS, False),
+                    ): selector.BooleanSelector(selector.BooleanSelectorConfig()),
+                    vol.Optional(
+                        CONF_STATISTICS_WINDOW,
+                        default=self.config_entry.data.get(
+                            CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            step="any",
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_STATISTICS_EMA_ALPHA,
+                        default=self.config_entry.data.get(
+                            CONF_STATISTICS_EMA_ALPHA, DEFAULT_STATISTICS_EMA_ALPHA
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0.001,
+                            max=1,
+                            step="any",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                }
+            )
+
         self.sensor_options_page_1.update({CONF_VALUE_TYPE: value_type})
         return SENSOR_OPTIONS_PAGE_2_SCHEMA
 
@@ -1638,6 +1914,7 @@ class VariableOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_EXCLUDE_FROM_RECORDER, DEFAULT_EXCLUDE_FROM_RECORDER
                     ),
                 ): selector.BooleanSelector(selector.BooleanSelectorConfig()),
+                **_variable_tuning_options(self.config_entry.data),
             }
         )
 
@@ -1829,6 +2106,7 @@ class VariableOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_EXCLUDE_FROM_RECORDER, DEFAULT_EXCLUDE_FROM_RECORDER
                     ),
                 ): selector.BooleanSelector(selector.BooleanSelectorConfig()),
+                **_variable_tuning_options(self.config_entry.data),
             }
         )
 
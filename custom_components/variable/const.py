@@ -5,6 +5,17 @@ VERSION = "3.5.10"
 PLATFORM_NAME = "Variables+History"
 DOMAIN = "variable"
 
+DATA_DEVICE_INDEX = f"{DOMAIN}_device_index"
+DATA_ENTITY_INDEX = f"{DOMAIN}_entity_index"
+DATA_JOURNAL = f"{DOMAIN}_journal"
+DATA_PERFORMANCE = f"{DOMAIN}_performance"
+DATA_RESTORE_STATS = f"{DOMAIN}_restore_stats"
+DATA_STARTUP_TIMER = f"{DOMAIN}_startup_timer"
+DATA_STORE = f"{DOMAIN}_store"
+DATA_SUBSCRIPTIONS = f"{DOMAIN}_subscriptions"
+DATA_TIMER_WHEEL = f"{DOMAIN}_timer_wheel"
+DATA_YAML_RECONCILE = f"{DOMAIN}_yaml_reconcile"
+
 PLATFORMS: list[str] = [
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
@@ -16,7 +27,26 @@ DEFAULT_FORCE_UPDATE = False
 DEFAULT_ICON = "mdi:variable"
 DEFAULT_REPLACE_ATTRIBUTES = False
 DEFAULT_RESTORE = True
+DEFAULT_ACCUMULATOR_FLUSH_INTERVAL = 1.0
+DEFAULT_DEADBAND = 0.0
 DEFAULT_EXCLUDE_FROM_RECORDER = False
+DEFAULT_MIN_WRITE_INTERVAL = 0.0
+DEFAULT_JOURNAL = False
+DEFAULT_PERFORMANCE_SENSORS = False
+DEFAULT_HISTORY_SIZE = 0
+DEFAULT_TTL = 0.0
+DEFAULT_BLOB_THRESHOLD = 0
+DEFAULT_STATISTICS_WINDOW = 0.0
+DEFAULT_STATISTICS_EMA_ALPHA = 0.1
+
+# Seconds between the first unsaved change and writing the value store.
+STORE_SAVE_DELAY = 5
+
+# Journal records written since the last compaction before it is compacted again.
+JOURNAL_COMPACT_RECORDS = 10000
+
+RESTORE_SOURCE_STATE = "state"
+RESTORE_SOURCE_STORE = "store"
 
 CONF_ATTRIBUTES = "attributes"
 CONF_ENTITY_PLATFORM = "entity_platform"
@@ -28,24 +58,60 @@ CONF_VALUE_TYPE = "value_type"
 CONF_VARIABLE_ID = "variable_id"
 CONF_YAML_PRESENT = "yaml_present"
 CONF_YAML_VARIABLE = "yaml_variable"
+CONF_YAML_FINGERPRINT = "yaml_fingerprint"
 CONF_EXCLUDE_FROM_RECORDER = "exclude_from_recorder"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_JOURNAL = "journal"
+CONF_HISTORY_SIZE = "history_size"
+CONF_TTL = "ttl"
+CONF_TTL_RESET_TO_INITIAL = "ttl_reset_to_initial"
+CONF_BLOB_THRESHOLD = "blob_threshold"
+CONF_PERFORMANCE_SENSORS = "performance_sensors"
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_PERCENT = "deadband_percent"
+CONF_ACCUMULATOR = "accumulator"
+CONF_ACCUMULATOR_FLUSH_INTERVAL = "accumulator_flush_interval"
+CONF_ACCUMULATOR_FLUSH_COUNT = "accumulator_flush_count"
+CONF_STATISTICS = "statistics"
+CONF_STATISTICS_WINDOW = "statistics_window"
+CONF_STATISTICS_EMA_ALPHA = "statistics_ema_alpha"
 CONF_UPDATED = "config_updated"
 CONF_CLEAR_DEVICE_ID = "clear_device_id"
+CONF_COLLECTION = "collection"
+CONF_COLLECTION_PLATFORM = "collection_platform"
+
+SUBENTRY_TYPE_VARIABLE = "variable"
 
+ATTR_ATTRIBUTE = "attribute"
 ATTR_ATTRIBUTES = "attributes"
 ATTR_DELETE_IN_ZONES = "delete_in_zones"
 ATTR_DELETE_LOCATION_NAME = "delete_location_name"
+ATTR_END = "end"
 ATTR_ENTITY = "entity"
+ATTR_FROM = "from"
+ATTR_ITEMS = "items"
+ATTR_MAX_POINTS = "max_points"
 ATTR_NATIVE_UNIT_OF_MEASUREMENT = "native_unit_of_measurement"
+ATTR_OP = "op"
+ATTR_PATCH = "patch"
+ATTR_PATH = "path"
+ATTR_PLATFORM = "platform"
 ATTR_SUGGESTED_UNIT_OF_MEASUREMENT = "suggested_unit_of_measurement"
 ATTR_REPLACE_ATTRIBUTES = "replace_attributes"
+ATTR_START = "start"
 ATTR_VALUE = "value"
 ATTR_VARIABLE = "variable"
+ATTR_VARIABLE_ID_PREFIX = "variable_id_prefix"
 
 SERVICE_UPDATE_SENSOR = "update_sensor"
 SERVICE_UPDATE_BINARY_SENSOR = "update_binary_sensor"
 SERVICE_UPDATE_DEVICE_TRACKER = "update_device_tracker"
 SERVICE_INCREMENT_SENSOR = "increment_sensor"
 SERVICE_DECREMENT_SENSOR = "decrement_sensor"
+SERVICE_UPDATE_MANY = "update_many"
+SERVICE_GET_BLOB = "get_blob"
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_GET_STATISTICS = "get_statistics"
+SERVICE_RESET_STATISTICS = "reset_statistics"
 
 ATTR_VALUE_DELTA = "value_delta"
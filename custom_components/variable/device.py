@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import logging
 
 from homeassistant.config_entries import ConfigEntry
@@ -11,19 +13,95 @@ from homeassistant.const import (
     ATTR_SW_VERSION,
     CONF_NAME,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 
-from .const import CONF_YAML_VARIABLE, DOMAIN
+from .const import DATA_DEVICE_INDEX, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class VariableDeviceIndex:
+    """Config entries of the Variable entities attached to each device.
+
+    Built once from the entity registry and kept current from entity registry
+    update events, so device changes only look at the entries linked to them.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Build the index from the entity registry and start tracking changes."""
+        self._entity_registry = er.async_get(hass)
+        # entity_id -> (device_id, config_entry_id)
+        self._entities: dict[str, tuple[str, str]] = {}
+        # device_id -> {entity_id: config_entry_id}
+        self._devices: dict[str, dict[str, str]] = {}
+        for entity in self._entity_registry.entities.values():
+            self._async_track(entity)
+        self._unsub_registry_updated = hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking entity registry changes."""
+        self._unsub_registry_updated()
+
+    @callback
+    def async_get_config_entry_ids(self, device_id: str) -> set[str]:
+        """Return the config entry IDs of Variable entities attached to a device."""
+        return set(self._devices.get(device_id, {}).values())
+
+    @callback
+    def _async_registry_updated(self, event: Event[er.EventEntityRegistryUpdatedData]) -> None:
+        if event.data["action"] == "remove":
+            self._async_untrack(event.data["entity_id"])
+            return
+        if old_entity_id := event.data.get("old_entity_id"):
+            self._async_untrack(old_entity_id)
+        entity_id = event.data["entity_id"]
+        if (entity := self._entity_registry.async_get(entity_id)) is None:
+            self._async_untrack(entity_id)
+            return
+        self._async_track(entity)
+
+    @callback
+    def _async_track(self, entity: er.RegistryEntry) -> None:
+        self._async_untrack(entity.entity_id)
+        if entity.platform != DOMAIN or not entity.device_id or not entity.config_entry_id:
+            return
+        self._entities[entity.entity_id] = (entity.device_id, entity.config_entry_id)
+        self._devices.setdefault(entity.device_id, {})[entity.entity_id] = entity.config_entry_id
+
+    @callback
+    def _async_untrack(self, entity_id: str) -> None:
+        if (link := self._entities.pop(entity_id, None)) is None:
+            return
+        device_entities = self._devices[link[0]]
+        del device_entities[entity_id]
+        if not device_entities:
+            del self._devices[link[0]]
+
+
+@callback
+def async_get_device_index(hass: HomeAssistant) -> VariableDeviceIndex:
+    """Return the integration-wide device index, creating it on first use."""
+    index: VariableDeviceIndex | None = hass.data.get(DATA_DEVICE_INDEX)
+    if index is None:
+        index = hass.data[DATA_DEVICE_INDEX] = VariableDeviceIndex(hass)
+    return index
+
+
+@callback
+def async_unload_device_index(hass: HomeAssistant) -> None:
+    """Drop the device index and stop its registry listener, if it was created."""
+    if (index := hass.data.pop(DATA_DEVICE_INDEX, None)) is not None:
+        index.async_stop()
+
+
 async def create_device(hass: HomeAssistant, entry: ConfigEntry) -> None:
     # _LOGGER.debug(f"({entry.title}) [create_device] entry: {entry}")
 
     device_registry = dr.async_get(hass)
-    entity_registry = er.async_get(hass)
 
     device = device_registry.async_get_or_create(
         config_entry_id=entry.entry_id,
@@ -38,42 +116,8 @@ async def create_device(hass: HomeAssistant, entry: ConfigEntry) -> None:
         configuration_url=entry.data.get(ATTR_CONFIGURATION_URL),
     )
     _LOGGER.debug(f"({device.name}) [create_device] device: {device}")
-    device_entities = er.async_entries_for_device(
-        registry=entity_registry, device_id=device.id, include_disabled_entities=True
-    )
-    # _LOGGER.debug(f"({device.name}) [create_device] device entities: {device_entities}")
-
-    domain_entries = hass.config_entries.async_loaded_entries(DOMAIN)
-    # _LOGGER.debug(f"({device.name}) [create_device] domain_entries: {domain_entries}")
-    domain_entities: list = []
-    for entry in domain_entries:
-        # _LOGGER.debug(f"({device.name}) [create_device] domain_entry: {entry}")
-        # _LOGGER.debug(f"({device.name}) [create_device] domain_entry data: {entry.data}")
-        if not entry.data.get(CONF_YAML_VARIABLE, False):
-            domain_entities = domain_entities + er.async_entries_for_config_entry(
-                registry=entity_registry, config_entry_id=entry.entry_id
-            )
-    # _LOGGER.debug(f"({device.name}) [create_device] domain entities: {domain_entities}")
-    domain_reload_entities = []
-    for entity in domain_entities:
-        if entity.device_id == device.id:
-            domain_reload_entities.append(entity)
-    reload_entities = device_entities + domain_reload_entities
-    if len(reload_entities) > 0:
-        _LOGGER.debug(f"({device.name}) [create_device] Reloading {len(reload_entities)} entities")
-    else:
-        _LOGGER.debug(f"({device.name}) [create_device] Reloading all Variable entities")
-        reload_entities = domain_entities
-
-    scheduled_entry_ids: set[str] = set()
-    for entity in reload_entities:
-        # May actually want to do this for all entities, will see
-        if entity.platform != DOMAIN:
-            continue
-        _LOGGER.debug(f"({device.name}) [create_device] Reloading entity_id: {entity.entity_id}")
-        if entity.config_entry_id and entity.config_entry_id not in scheduled_entry_ids:
-            scheduled_entry_ids.add(entity.config_entry_id)
-            hass.config_entries.async_schedule_reload(entity.config_entry_id)
+    linked_entry_ids = async_get_device_index(hass).async_get_config_entry_ids(device.id)
+    _async_schedule_reloads(hass, device, linked_entry_ids, "create_device")
 
 
 async def update_device(hass: HomeAssistant, entry: ConfigEntry, user_input) -> bool:
@@ -104,24 +148,26 @@ async def remove_device(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # _LOGGER.debug(f"({entry.title}) [remove_device] entry: {entry}")
 
     device_registry = dr.async_get(hass)
-    entity_registry = er.async_get(hass)
 
     device = device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)})
     _LOGGER.debug(f"({getattr(device, 'name', '')}) [remove_device] device: {device}")
     if device is None:
         return True
-    entities = er.async_entries_for_device(
-        registry=entity_registry, device_id=device.id, include_disabled_entities=True
-    )
-    _LOGGER.debug(f"({device.name}) [remove_device] Reloading {len(entities)} entities")
+    # Collect the links first; removing the device clears them from the registry.
+    linked_entry_ids = async_get_device_index(hass).async_get_config_entry_ids(device.id)
     device_registry.async_remove_device(device.id)
-
-    for entity in entities:
-        # May actually want to do this for all entities, will see
-        if entity.platform != DOMAIN:
-            continue
-        _LOGGER.debug(f"({device.name}) [remove_device] Reloading entity_id: {entity.entity_id}")
-        if entity.config_entry_id:
-            hass.config_entries.async_schedule_reload(entity.config_entry_id)
+    _async_schedule_reloads(hass, device, linked_entry_ids, "remove_device")
 
     return True
+
+
+@callback
+def _async_schedule_reloads(
+    hass: HomeAssistant, device: dr.DeviceEntry, entry_ids: set[str], caller: str
+) -> None:
+    """Reload the Variable config entries linked to a device."""
+    _LOGGER.debug(
+        "(%s) [%s] Reloading %s linked Variable entries", device.name, caller, len(entry_ids)
+    )
+    for entry_id in entry_ids:
+        hass.config_entries.async_schedule_reload(entry_id)
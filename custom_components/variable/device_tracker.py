@@ -1,7 +1,6 @@
-from collections.abc import MutableMapping
-import copy
+from collections.abc import Mapping, MutableMapping
 import logging
-from typing import cast, final
+from typing import Any, final
 
 from homeassistant.components.device_tracker import TrackerEntity
 from homeassistant.components.device_tracker.const import (
@@ -24,7 +23,7 @@ from homeassistant.const import (
     MATCH_ALL,
     Platform,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv, device_registry as dr, entity_platform
 from homeassistant.helpers.entity import generate_entity_id
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -36,12 +35,16 @@ import voluptuous as vol
 import yaml
 
 from . import _async_exclude_entity_from_recorder
+from .collection import VariableCollection
 from .const import (
     ATTR_ATTRIBUTES,
     ATTR_DELETE_IN_ZONES,
     ATTR_DELETE_LOCATION_NAME,
+    ATTR_PATCH,
     ATTR_REPLACE_ATTRIBUTES,
     CONF_ATTRIBUTES,
+    CONF_COLLECTION,
+    CONF_ENTITY_PLATFORM,
     CONF_EXCLUDE_FROM_RECORDER,
     CONF_FORCE_UPDATE,
     CONF_RESTORE,
@@ -52,7 +55,10 @@ from .const import (
     DEFAULT_REPLACE_ATTRIBUTES,
     DOMAIN,
 )
-from .helpers import merge_attribute_dict
+from .entity import VariableEntity, async_restore_variables, track_update
+from .helpers import AttributeTree, to_attribute_tree
+from .patch import ATTRIBUTE_PATCH_SCHEMA
+from .startup import PHASE_ENTITY_INIT, async_get_startup_timer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -68,6 +74,20 @@ PLATFORM = Platform.DEVICE_TRACKER
 ENTITY_ID_FORMAT = PLATFORM + ".{}"
 SERVICE_UPDATE_VARIABLE = "update_" + PLATFORM
 
+UPDATE_VARIABLE_SCHEMA = {
+    vol.Optional(ATTR_LATITUDE): cv.latitude,
+    vol.Optional(ATTR_LONGITUDE): cv.longitude,
+    vol.Optional(ATTR_IN_ZONES): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_DELETE_IN_ZONES): cv.boolean,
+    vol.Optional(ATTR_LOCATION_NAME): cv.string,
+    vol.Optional(ATTR_DELETE_LOCATION_NAME): cv.boolean,
+    vol.Optional(ATTR_GPS_ACCURACY): cv.positive_int,
+    vol.Optional(ATTR_BATTERY_LEVEL): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+    vol.Optional(ATTR_ATTRIBUTES): dict,
+    vol.Optional(ATTR_REPLACE_ATTRIBUTES, default=DEFAULT_REPLACE_ATTRIBUTES): cv.boolean,
+    vol.Optional(ATTR_PATCH): ATTRIBUTE_PATCH_SCHEMA,
+}
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({})  # type: ignore[assignment]
 
 VARIABLE_ATTR_SETTINGS = {
@@ -94,42 +114,35 @@ async def async_setup_entry(
 
     platform.async_register_entity_service(
         SERVICE_UPDATE_VARIABLE,
-        {
-            vol.Optional(ATTR_LATITUDE): cv.latitude,
-            vol.Optional(ATTR_LONGITUDE): cv.longitude,
-            vol.Optional(ATTR_IN_ZONES): vol.All(cv.ensure_list, [cv.string]),
-            vol.Optional(ATTR_DELETE_IN_ZONES): cv.boolean,
-            vol.Optional(ATTR_LOCATION_NAME): cv.string,
-            vol.Optional(ATTR_DELETE_LOCATION_NAME): cv.boolean,
-            vol.Optional(ATTR_GPS_ACCURACY): cv.positive_int,
-            vol.Optional(ATTR_BATTERY_LEVEL): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
-            vol.Optional(ATTR_ATTRIBUTES): dict,
-            vol.Optional(ATTR_REPLACE_ATTRIBUTES, default=DEFAULT_REPLACE_ATTRIBUTES): cv.boolean,
-        },
+        UPDATE_VARIABLE_SCHEMA,
         "async_update_variable",
     )
 
+    if config_entry.data.get(CONF_ENTITY_PLATFORM) == CONF_COLLECTION:
+        collection: VariableCollection = hass.data[DOMAIN][config_entry.entry_id]
+        collection.async_setup_platform(async_add_entities, _create_variable)
+        return None
+
     config = hass.data.get(DOMAIN, {}).get(config_entry.entry_id, {})
     unique_id = config_entry.entry_id
     # _LOGGER.debug(f"[async_setup_entry] config_entry: {config_entry.as_dict()}")
     # _LOGGER.debug(f"[async_setup_entry] config: {config}")
     # _LOGGER.debug(f"[async_setup_entry] unique_id: {unique_id}")
 
-    if config.get(CONF_EXCLUDE_FROM_RECORDER, DEFAULT_EXCLUDE_FROM_RECORDER):
-        _LOGGER.debug(
-            f"({config.get(CONF_NAME, config.get(CONF_VARIABLE_ID, None))}) "
-            "Excluding from Recorder."
-        )
-        async_add_entities([VariableNoRecorder(hass, config, config_entry, unique_id)])
-    else:
-        async_add_entities([Variable(hass, config, config_entry, unique_id)])
+    with async_get_startup_timer(hass).time(PHASE_ENTITY_INIT):
+        entities = [_create_variable(hass, config, config_entry, unique_id)]
+    async_restore_variables(hass, PLATFORM, entities)
+    async_add_entities(entities)
 
     return None
 
 
-class Variable(RestoreEntity, TrackerEntity):
+class Variable(VariableEntity, RestoreEntity, TrackerEntity):
     """Class for the device tracker."""
 
+    update_variable_schema = vol.Schema(UPDATE_VARIABLE_SCHEMA)
+    _variable_attr_settings = VARIABLE_ATTR_SETTINGS
+
     def __init__(
         self,
         hass,
@@ -159,11 +172,11 @@ class Variable(RestoreEntity, TrackerEntity):
             and config.get(CONF_ATTRIBUTES)
             and isinstance(config.get(CONF_ATTRIBUTES), MutableMapping)
         ):
-            self._attr_extra_state_attributes = cast(
-                dict, self._update_attr_settings(config.get(CONF_ATTRIBUTES))
+            self._attr_extra_state_attributes = to_attribute_tree(
+                self._update_attr_settings(config.get(CONF_ATTRIBUTES))
             )
         else:
-            self._attr_extra_state_attributes = cast(dict, {})
+            self._attr_extra_state_attributes = AttributeTree()
         registry = er.async_get(self._hass)
         current_entity_id = registry.async_get_entity_id(DOMAIN, PLATFORM, self._attr_unique_id)
         if current_entity_id is not None:
@@ -184,66 +197,62 @@ class Variable(RestoreEntity, TrackerEntity):
     async def async_added_to_hass(self):
         """Run when entity about to be added."""
         await super().async_added_to_hass()
-        if self._restore is True:
-            _LOGGER.info(f"({self._attr_name}) Restoring after Reboot")
-            state = await self.async_get_last_state()
-            if state:
-                _LOGGER.debug(f"({self._attr_name}) Restored last state: {state.as_dict()}")
-                if (
-                    hasattr(state, "attributes")
-                    and state.attributes
-                    and isinstance(state.attributes, MutableMapping)
-                ):
-                    # Avoid restoring Home Assistant's computed friendly_name back into
-                    # _attr_name (it may already include the device name prefix).
-                    restored_attributes = dict(state.attributes)
-                    restored_attributes.pop(ATTR_FRIENDLY_NAME, None)
-                    self._attr_extra_state_attributes = cast(
-                        dict,
-                        self._update_attr_settings(
-                            restored_attributes,
-                            just_pop=self._config.get(CONF_UPDATED, False),
-                        ),
-                    )
-                    _LOGGER.debug(
-                        f"({self._attr_name}) [restored] attributes: {getattr(self, '_attr_extra_state_attributes', {})}"
-                    )
-                    # If there were no attributes restored from state, apply attributes from config
-                    if (
-                        not getattr(self, "_attr_extra_state_attributes", None)
-                        or self._attr_extra_state_attributes == {}
-                    ) and self._config.get(CONF_ATTRIBUTES):
-                        self._attr_extra_state_attributes = cast(
-                            dict, self._update_attr_settings(self._config.get(CONF_ATTRIBUTES))
-                        )
-                        _LOGGER.debug(
-                            f"({self._attr_name}) [restored] applied config attributes: {getattr(self, '_attr_extra_state_attributes', {})}"
-                        )
-                        try:
-                            self.async_write_ha_state()
-                        except Exception as err:
-                            _LOGGER.debug(
-                                "(%s) async_write_ha_state failed during restore: %s",
-                                self._attr_name,
-                                err,
-                            )
         if self._config.get(CONF_UPDATED, True):
             self._config.update({CONF_UPDATED: False})
-            self._hass.config_entries.async_update_entry(
-                self._config_entry,
-                data=self._config,
-                options={},
-            )
+            self._async_save_config()
             _LOGGER.debug(
                 f"({self._attr_name}) Updated config_updated: "
                 + f"{self._config_entry.data.get(CONF_UPDATED)}"
             )
 
+    @callback
+    def _async_expire(self, reset_to_initial: bool) -> None:
+        """Reset the location to the initial one or unknown when the variable expires."""
+        config = self._config if reset_to_initial else {}
+        self._attr_latitude = config.get(ATTR_LATITUDE)
+        self._attr_longitude = config.get(ATTR_LONGITUDE)
+        self._attr_in_zones = config.get(ATTR_IN_ZONES)
+        self._set_location_name(config.get(ATTR_LOCATION_NAME))
+        self._attr_gps_accuracy = config.get(ATTR_GPS_ACCURACY)
+
+    @callback
+    def _async_restore(self, value: Any, attributes: Mapping[str, Any] | None) -> None:
+        """Apply the restored attributes before the first write."""
+        _LOGGER.debug("(%s) Restoring after Reboot", self._attr_name)
+        if attributes and isinstance(attributes, Mapping):
+            _LOGGER.debug("(%s) Restored last attributes: %s", self._attr_name, attributes)
+            # Avoid restoring Home Assistant's computed friendly_name back into
+            # _attr_name (it may already include the device name prefix).
+            restored_attributes = dict(attributes)
+            restored_attributes.pop(ATTR_FRIENDLY_NAME, None)
+            self._attr_extra_state_attributes = to_attribute_tree(
+                self._update_attr_settings(
+                    restored_attributes,
+                    just_pop=self._config.get(CONF_UPDATED, False),
+                )
+            )
+            _LOGGER.debug(
+                "(%s) [restored] attributes: %s",
+                self._attr_name,
+                self._attr_extra_state_attributes,
+            )
+            # If there were no attributes restored from state, apply attributes from config
+            if (
+                not getattr(self, "_attr_extra_state_attributes", None)
+                or self._attr_extra_state_attributes == {}
+            ) and self._config.get(CONF_ATTRIBUTES):
+                self._attr_extra_state_attributes = to_attribute_tree(
+                    self._update_attr_settings(self._config.get(CONF_ATTRIBUTES))
+                )
+                _LOGGER.debug(
+                    f"({self._attr_name}) [restored] applied config attributes: {getattr(self, '_attr_extra_state_attributes', {})}"
+                )
+
     def _update_attr_settings(self, new_attributes=None, just_pop=False):
         if new_attributes is not None:
             _LOGGER.debug(f"({self._attr_name}) [update_attr_settings] Updating Special Attributes")
             if isinstance(new_attributes, MutableMapping):
-                attributes = copy.deepcopy(new_attributes)
+                attributes = dict(new_attributes)
                 for attrib, setting in VARIABLE_ATTR_SETTINGS.items():
                     if attrib in attributes.keys():
                         if just_pop:
@@ -256,7 +265,7 @@ class Variable(RestoreEntity, TrackerEntity):
                                 self._set_location_name(value)
                             else:
                                 setattr(self, setting, value)
-                return copy.deepcopy(attributes)
+                return attributes
             else:
                 _LOGGER.error(
                     f"({self._attr_name}) AttributeError: Attributes must be a dictionary: {new_attributes}"
@@ -277,24 +286,24 @@ class Variable(RestoreEntity, TrackerEntity):
         if not SUPPORTS_TRACKER_IN_ZONES:
             self._attr_location_name = location_name
 
+    @track_update
     async def async_update_variable(self, **kwargs) -> None:
         """Update Device Tracker Variable."""
 
-        _LOGGER.debug(f"({self._attr_name}) [async_update_variable] kwargs: {kwargs}")
-
-        updated_attributes = None
+        _LOGGER.debug("(%s) [async_update_variable] kwargs: %s", self._attr_name, kwargs)
 
         replace_attributes = kwargs.get(ATTR_REPLACE_ATTRIBUTES, False)
         _LOGGER.debug(
-            f"({self._attr_name}) [async_update_variable] Replace Attributes: {replace_attributes}"
+            "(%s) [async_update_variable] Replace Attributes: %s",
+            self._attr_name,
+            replace_attributes,
         )
 
-        if (
-            not replace_attributes
-            and hasattr(self, "_attr_extra_state_attributes")
-            and self._attr_extra_state_attributes is not None
-        ):
-            updated_attributes = copy.deepcopy(self._attr_extra_state_attributes)
+        updated_attributes = AttributeTree()
+        if not replace_attributes:
+            updated_attributes = to_attribute_tree(
+                getattr(self, "_attr_extra_state_attributes", None)
+            )
 
         attributes = kwargs.get(ATTR_ATTRIBUTES)
         if attributes is not None:
@@ -306,14 +315,13 @@ class Variable(RestoreEntity, TrackerEntity):
                     attributes = None
             if isinstance(attributes, MutableMapping):
                 _LOGGER.debug(
-                    f"({self._attr_name}) [async_update_variable] New Attributes: {attributes}"
+                    "(%s) [async_update_variable] New Attributes: %s", self._attr_name, attributes
                 )
                 extra_attributes = self._update_attr_settings(attributes)
                 if extra_attributes is not None:
                     try:
-                        updated_attributes = merge_attribute_dict(
-                            updated_attributes, extra_attributes
-                        )
+                        with self._time_attribute_copy():
+                            updated_attributes = updated_attributes.merge(extra_attributes)
                     except ValueError as err:
                         _LOGGER.error(
                             "(%s) AttributeError: %s",
@@ -325,13 +333,16 @@ class Variable(RestoreEntity, TrackerEntity):
                     f"({self._attr_name}) AttributeError: Attributes must be a dictionary: {attributes}"
                 )
 
-        if updated_attributes is not None:
-            self._attr_extra_state_attributes = cast(dict, copy.deepcopy(updated_attributes))
-            _LOGGER.debug(
-                f"({self._attr_name}) [async_update_variable] Final Attributes: {updated_attributes}"
-            )
-        else:
-            self._attr_extra_state_attributes = cast(dict, {})
+        if (patch := kwargs.get(ATTR_PATCH)) is not None:
+            with self._time_attribute_copy():
+                updated_attributes = updated_attributes.patch(patch)
+
+        self._attr_extra_state_attributes = updated_attributes
+        _LOGGER.debug(
+            "(%s) [async_update_variable] Final Attributes: %s",
+            self._attr_name,
+            updated_attributes,
+        )
 
         if ATTR_LATITUDE in kwargs:
             self._attr_latitude = kwargs.get(ATTR_LATITUDE)
@@ -409,3 +420,14 @@ class VariableNoRecorder(Variable):
         await _async_exclude_entity_from_recorder(self.hass, self.entity_id)
 
         _LOGGER.debug(f"({self._attr_name}) Excluded from recorder: {self.entity_id}")
+
+
+def _create_variable(hass, config, config_entry, unique_id) -> Variable:
+    """Create a Device Tracker Variable, excluded from the recorder if configured."""
+    if config.get(CONF_EXCLUDE_FROM_RECORDER, DEFAULT_EXCLUDE_FROM_RECORDER):
+        _LOGGER.debug(
+            f"({config.get(CONF_NAME, config.get(CONF_VARIABLE_ID, None))}) "
+            "Excluding from Recorder."
+        )
+        return VariableNoRecorder(hass, config, config_entry, unique_id)
+    return Variable(hass, config, config_entry, unique_id)
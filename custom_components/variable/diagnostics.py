@@ -0,0 +1,37 @@
+"""Diagnostics support for Variable."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_RESTORE_STATS, DATA_YAML_RECONCILE
+from .entity import async_get_entity_index
+from .journal import async_get_variable_journal
+from .startup import async_get_startup_timer
+from .store import async_get_variable_store
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry and its loaded variables."""
+    return {
+        "data": dict(entry.data),
+        "subentries": {
+            subentry_id: dict(subentry.data) for subentry_id, subentry in entry.subentries.items()
+        },
+        "entities": {
+            entity.entity_id: entity.async_get_diagnostics()
+            for entity in async_get_entity_index(hass)
+            if entity.platform.config_entry is not None
+            and entity.platform.config_entry.entry_id == entry.entry_id
+        },
+        "yaml_reconcile": hass.data.get(DATA_YAML_RECONCILE),
+        "restore": hass.data.get(DATA_RESTORE_STATS),
+        "startup": async_get_startup_timer(hass).stats,
+        "stored_variables": len(async_get_variable_store(hass)),
+        "journal": async_get_variable_journal(hass).stats,
+    }
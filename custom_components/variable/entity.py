@@ -0,0 +1,549 @@
+"""Shared entity behavior for Variable platforms."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Mapping
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import datetime
+import functools
+import logging
+import time
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_FRIENDLY_NAME
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er, restore_state
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.typing import UNDEFINED
+from homeassistant.util import dt as dt_util
+import voluptuous as vol
+
+from .blobs import BlobAttributes, is_blob_descriptor
+from .const import (
+    CONF_BLOB_THRESHOLD,
+    CONF_JOURNAL,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_TTL,
+    CONF_TTL_RESET_TO_INITIAL,
+    DATA_ENTITY_INDEX,
+    DATA_RESTORE_STATS,
+    DATA_SUBSCRIPTIONS,
+    DEFAULT_BLOB_THRESHOLD,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_TTL,
+    DOMAIN,
+    RESTORE_SOURCE_STATE,
+    RESTORE_SOURCE_STORE,
+)
+from .helpers import get_nested_attribute, looks_like_attribute_path, validate_attribute_path
+from .journal import VariableJournal, async_get_variable_journal
+from .performance import VariablePerformance, async_get_variable_performance
+from .startup import PHASE_FIRST_WRITE, PHASE_RESTORE, async_get_startup_timer
+from .store import VariableStore, async_get_variable_store
+from .timer_wheel import async_get_timer_wheel
+
+if TYPE_CHECKING:
+    from .collection import VariableCollection
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VariableEntityIndex:
+    """Lookup of loaded Variable entities by entity_id and variable_id."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._by_entity_id: dict[str, VariableEntity] = {}
+        self._by_variable_id: dict[str, dict[str, VariableEntity]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed entities."""
+        return len(self._by_entity_id)
+
+    def __iter__(self) -> Iterator[VariableEntity]:
+        """Iterate over indexed entities."""
+        return iter(list(self._by_entity_id.values()))
+
+    @callback
+    def async_add(self, entity: VariableEntity) -> None:
+        """Index a loaded entity."""
+        self._by_entity_id[entity.entity_id] = entity
+        self._by_variable_id.setdefault(entity.variable_id, {})[entity.entity_id] = entity
+
+    @callback
+    def async_remove(self, entity: VariableEntity) -> None:
+        """Drop an entity from the index if it is still the indexed instance."""
+        if self._by_entity_id.get(entity.entity_id) is entity:
+            del self._by_entity_id[entity.entity_id]
+        by_entity = self._by_variable_id.get(entity.variable_id)
+        if by_entity is not None and by_entity.get(entity.entity_id) is entity:
+            del by_entity[entity.entity_id]
+            if not by_entity:
+                del self._by_variable_id[entity.variable_id]
+
+    @callback
+    def async_get(self, entity_id: str) -> VariableEntity | None:
+        """Return the loaded entity for an entity_id."""
+        return self._by_entity_id.get(entity_id)
+
+    @callback
+    def async_get_by_variable_id(self, variable_id: str) -> list[VariableEntity]:
+        """Return every loaded entity using a variable_id, across platforms."""
+        return list(self._by_variable_id.get(variable_id, {}).values())
+
+
+@callback
+def async_get_entity_index(hass: HomeAssistant) -> VariableEntityIndex:
+    """Return the integration-wide entity index, creating it on first use."""
+    index: VariableEntityIndex | None = hass.data.get(DATA_ENTITY_INDEX)
+    if index is None:
+        index = hass.data[DATA_ENTITY_INDEX] = VariableEntityIndex()
+    return index
+
+
+@callback
+def async_restore_variables(
+    hass: HomeAssistant, platform: str, entities: Iterable[VariableEntity]
+) -> None:
+    """Apply the last value saved before the restart to entities about to be added.
+
+    Runs once per platform setup, before the entities are added, so every
+    restored value is in place for the entity's first state write and no
+    entity has to look its last state up while it is being added. Records in
+    the integration's value store are used first. Variables without one fall
+    back to Home Assistant's restore cache.
+    """
+    start = time.perf_counter()
+    store = async_get_variable_store(hass)
+    last_states = restore_state.async_get(hass).last_states
+    registry = er.async_get(hass)
+    variables = restored = from_store = 0
+    for entity in entities:
+        if entity._restore is not True:
+            continue
+        variables += 1
+        entity_id = entity.entity_id
+        if entity.unique_id is not None:
+            # Registered entities are added under their registry entity_id.
+            entity_id = (
+                registry.async_get_entity_id(platform, DOMAIN, entity.unique_id) or entity_id
+            )
+        source = entity.async_restore(store, last_states, entity_id)
+        if source is not None:
+            restored += 1
+        if source == RESTORE_SOURCE_STORE:
+            from_store += 1
+    if not variables:
+        return
+    elapsed = time.perf_counter() - start
+    stats = hass.data.setdefault(DATA_RESTORE_STATS, {}).setdefault(
+        platform, {"variables": 0, "restored": 0, "from_store": 0, "seconds": 0.0}
+    )
+    stats["variables"] += variables
+    stats["restored"] += restored
+    stats["from_store"] += from_store
+    stats["seconds"] += elapsed
+    async_get_startup_timer(hass).record(PHASE_RESTORE, elapsed)
+    _LOGGER.debug(
+        "[%s] Restored %s of %s variables (%s from the value store) in %.4fs",
+        platform,
+        restored,
+        variables,
+        from_store,
+        elapsed,
+    )
+
+
+@callback
+def async_log_restore_stats(hass: HomeAssistant) -> None:
+    """Log the restore time of each platform at INFO."""
+    for platform, stats in hass.data.get(DATA_RESTORE_STATS, {}).items():
+        _LOGGER.info(
+            "[%s] Restored %s of %s variables (%s from the value store) in %.3fs",
+            platform,
+            stats["restored"],
+            stats["variables"],
+            stats["from_store"],
+            stats["seconds"],
+        )
+
+
+class VariableEntity(Entity):
+    """Behavior shared by Sensor, Binary Sensor and Device Tracker Variables.
+
+    Must be listed before the Home Assistant entity base class so its
+    overrides take precedence.
+    """
+
+    # Schema used by the platform's update_* entity service. Bulk updates
+    # validate each item against it before applying anything.
+    update_variable_schema: ClassVar[vol.Schema]
+
+    _config: dict[str, Any]
+    _config_entry: ConfigEntry
+    _variable_id: str
+    # Set when the variable is a subentry of a collection config entry.
+    _config_subentry_id: str | None = None
+    _restore: bool | None = None
+    # Set once the last state has been applied, normally by async_restore_variables.
+    _restored: bool = False
+    # Special attributes kept as entity attributes instead of extra state
+    # attributes, mapped to the entity attribute that holds each one.
+    _variable_attr_settings: ClassVar[dict[str, str]] = {}
+    _store: VariableStore | None = None
+    # Set when every requested state write is also appended to the journal.
+    _journal: VariableJournal | None = None
+    _state_write_deferred: bool = False
+    _state_write_pending: bool = False
+    # Writes within min_write_interval of the last published write are
+    # coalesced into one trailing write at the end of the window.
+    _min_write_interval: float = DEFAULT_MIN_WRITE_INTERVAL
+    _last_state_write: float = float("-inf")
+    _cancel_trailing_write: CALLBACK_TYPE | None = None
+    _state_writes_requested: int = 0
+    _state_writes_published: int = 0
+    # Seconds without an update before the variable expires, or 0 for never.
+    _ttl: float = DEFAULT_TTL
+    # Timestamp the variable expires at, or None when it is not counting down.
+    _ttl_expires: float | None = None
+    # Set when the expiry was restored, to keep counting down from the last
+    # update before the restart.
+    _ttl_restored: bool = False
+    # Set when attribute values above the blob threshold are kept out of the state.
+    _blobs: BlobAttributes | None = None
+    # Set when the variable has performance sensors.
+    _performance: VariablePerformance | None = None
+
+    @property
+    def variable_id(self) -> str:
+        """Return the slugified variable_id of this variable."""
+        return self._variable_id
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the state attributes, with blob attributes replaced by descriptors."""
+        attributes: Mapping[str, Any] | None = getattr(self, "_attr_extra_state_attributes", None)
+        if self._blobs is None or not attributes:
+            return attributes
+        return self._blobs.public(attributes)
+
+    @property
+    def write_stats(self) -> dict[str, int]:
+        """Return how many state writes were requested, published and saved."""
+        return {
+            "requested": self._state_writes_requested,
+            "published": self._state_writes_published,
+            "saved": self._state_writes_requested - self._state_writes_published,
+        }
+
+    @callback
+    def async_get_diagnostics(self) -> dict[str, Any]:
+        """Return runtime details of this variable for config entry diagnostics."""
+        return {
+            "variable_id": self.variable_id,
+            "min_write_interval": self._min_write_interval,
+            "state_writes": self.write_stats,
+            "journal": self._journal is not None,
+            "ttl": self._ttl,
+            "expires": self._ttl_expires,
+        }
+
+    @callback
+    def async_restore(
+        self,
+        store: VariableStore,
+        last_states: Mapping[str, restore_state.StoredState],
+        entity_id: str,
+    ) -> str | None:
+        """Apply the last value of the variable, if it was not applied yet.
+
+        Returns:
+            Where the value was restored from, or None if nothing was stored.
+        """
+        if self._restored:
+            return None
+        self._restored = True
+        self._ttl = float(self._config.get(CONF_TTL) or DEFAULT_TTL)
+        if self.unique_id is not None and (record := store.async_get(self.unique_id)) is not None:
+            self._async_restore(record.get("value", UNDEFINED), record.get("attributes"))
+            if self._ttl and "expires" in record:
+                self._ttl_restored = True
+                self._ttl_expires = record["expires"]
+            return RESTORE_SOURCE_STORE
+        if (stored := last_states.get(entity_id)) is not None:
+            attributes = stored.state.attributes
+            if self._config.get(CONF_BLOB_THRESHOLD):
+                # The restore cache only holds the descriptors of blob attributes.
+                if dropped := [
+                    key for key, value in attributes.items() if is_blob_descriptor(value)
+                ]:
+                    _LOGGER.warning(
+                        "[%s] Blob attributes are not in the value store and cannot be restored: %s",
+                        entity_id,
+                        ", ".join(dropped),
+                    )
+                    attributes = {
+                        key: value for key, value in attributes.items() if key not in dropped
+                    }
+            self._async_restore(self._restored_value(stored), attributes)
+            if self._ttl:
+                # Unlike last_updated, last_reported also moves on writes of an unchanged value.
+                self._ttl_restored = True
+                self._ttl_expires = stored.state.last_reported.timestamp() + self._ttl
+            return RESTORE_SOURCE_STATE
+        self._async_restore(UNDEFINED, None)
+        return None
+
+    def _restored_value(self, stored: restore_state.StoredState) -> Any:
+        """Return the value to restore from Home Assistant's restore cache."""
+        return UNDEFINED
+
+    @callback
+    def _async_restore(self, value: Any, attributes: Mapping[str, Any] | None) -> None:
+        """Apply a restored value and attributes. Implemented by each platform.
+
+        ``value`` is UNDEFINED when nothing was stored for it.
+        """
+
+    @callback
+    def _async_expire(self, reset_to_initial: bool) -> None:
+        """Reset the value when the variable expires. Implemented by each platform.
+
+        Args:
+            reset_to_initial: Reset to the configured initial value instead of unknown.
+        """
+
+    @property
+    def _stored_value(self) -> Any:
+        """Return the value to save in the value store, or UNDEFINED for none."""
+        return UNDEFINED
+
+    @callback
+    def async_get_stored_record(self, attributes: bool = True) -> dict[str, Any]:
+        """Return the value and attributes to save in the value store.
+
+        Args:
+            attributes: Whether to include the attributes.
+        """
+        record: dict[str, Any] = {}
+        if attributes:
+            record["attributes"] = {
+                attrib: value
+                for attrib, setting in self._variable_attr_settings.items()
+                if attrib != ATTR_FRIENDLY_NAME
+                and (value := getattr(self, setting, None)) is not None
+            }
+            record["attributes"].update(self._attr_extra_state_attributes)
+        if (value := self._stored_value) is not UNDEFINED:
+            record["value"] = value
+        if self._ttl:
+            record["expires"] = self._ttl_expires
+        return record
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last state if needed and register the entity in the index."""
+        await super().async_added_to_hass()
+        if self._restore is True:
+            self._store = async_get_variable_store(self.hass)
+            # Entities added without a restore pass, e.g. to a loaded collection.
+            self.async_restore(
+                self._store, restore_state.async_get(self.hass).last_states, self.entity_id
+            )
+            if self._config.get(CONF_JOURNAL):
+                self._journal = async_get_variable_journal(self.hass)
+        self._min_write_interval = float(
+            self._config.get(CONF_MIN_WRITE_INTERVAL) or DEFAULT_MIN_WRITE_INTERVAL
+        )
+        self._ttl = float(self._config.get(CONF_TTL) or DEFAULT_TTL)
+        if blob_threshold := int(self._config.get(CONF_BLOB_THRESHOLD) or DEFAULT_BLOB_THRESHOLD):
+            self._blobs = BlobAttributes(blob_threshold)
+        if self._config.get(CONF_PERFORMANCE_SENSORS) and self.unique_id is not None:
+            self._performance = async_get_variable_performance(self.hass, self.unique_id)
+        if self._ttl:
+            wheel = async_get_timer_wheel(self.hass)
+            self.async_on_remove(lambda: wheel.async_cancel(self))
+            if not self._ttl_restored:
+                self._async_restart_ttl()
+            elif self._ttl_expires is not None:
+                wheel.async_schedule(self, self._ttl_expires, self._async_ttl_expired)
+        index = async_get_entity_index(self.hass)
+        index.async_add(self)
+        self.async_on_remove(lambda: index.async_remove(self))
+        self.async_on_remove(self._async_cancel_trailing_write)
+        self.async_on_remove(self._async_notify_removed)
+
+    @callback
+    def async_get_blob(
+        self, path: str, start: int | None = None, end: int | None = None
+    ) -> dict[str, Any]:
+        """Return an attribute value, or a slice of it, with its blob descriptor.
+
+        Args:
+            path: Attribute key or bracket path of the value.
+            start: First list item or character of the slice to return.
+            end: End of the slice to return, exclusive.
+
+        Raises:
+            ValueError: If the attribute does not exist or cannot be sliced.
+        """
+        validate_attribute_path(path)
+        attributes = getattr(self, "_attr_extra_state_attributes", None) or {}
+        try:
+            value = get_nested_attribute(attributes, path)
+        except KeyError:
+            raise ValueError(f"Attribute not found on {self.entity_id}: {path}") from None
+        if start is not None or end is not None:
+            if not isinstance(value, (list, str)):
+                raise ValueError(f"Only list and string attributes can be sliced: {path}")
+            value = value[start:end]
+        response: dict[str, Any] = {"value": value}
+        # Bracket paths split on dots as well; other paths are a top-level key.
+        key = path.split("[", 1)[0].split(".", 1)[0] if looks_like_attribute_path(path) else path
+        if self._blobs is not None:
+            self._blobs.public(attributes)
+            if (descriptor := self._blobs.descriptor(key)) is not None:
+                response.update(descriptor)
+        return response
+
+    @callback
+    def _async_save_config(self) -> None:
+        """Persist the variable's config to its config entry or collection subentry."""
+        if self._config_subentry_id is None:
+            self.hass.config_entries.async_update_entry(
+                self._config_entry, data=self._config, options={}
+            )
+            return
+        collection: VariableCollection = self.hass.data[DOMAIN][self._config_entry.entry_id]
+        collection.async_save_variable_config(self._config_subentry_id, self._config)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write state now, or mark it pending while writes are deferred or coalesced."""
+        self._state_writes_requested += 1
+        # Coalesced and deferred values are saved too, so compacting the
+        # journal never drops the only record of the latest value.
+        self._async_save_value()
+        if self._state_write_deferred:
+            self._state_write_pending = True
+            return
+        self._async_publish_state()
+
+    @callback
+    def _async_save_value(self) -> None:
+        """Save the current value to the store and journal, whether or not it is published."""
+        if self._store is not None:
+            self._store.async_mark_dirty(self)
+        if self._journal is not None:
+            self._journal.async_append(self)
+
+    @callback
+    def _async_publish_state(self) -> None:
+        if self._min_write_interval > 0:
+            delay = self._last_state_write + self._min_write_interval - self.hass.loop.time()
+            if delay > 0:
+                if self._cancel_trailing_write is None:
+                    self._cancel_trailing_write = async_call_later(
+                        self.hass, delay, self._async_trailing_write
+                    )
+                return
+        self._async_write_state_now()
+
+    @callback
+    def _async_trailing_write(self, _now: datetime) -> None:
+        self._cancel_trailing_write = None
+        self._async_write_state_now()
+
+    @callback
+    def _async_write_state_now(self) -> None:
+        if self._state_writes_published:
+            self._async_write_state()
+            return
+        with async_get_startup_timer(self.hass).time(PHASE_FIRST_WRITE):
+            self._async_write_state()
+
+    @callback
+    def _async_write_state(self) -> None:
+        self._last_state_write = self.hass.loop.time()
+        self._state_writes_published += 1
+        super().async_write_ha_state()
+        if self._performance is not None:
+            self._performance.async_state_written(self.extra_state_attributes)
+        if (subscriptions := self.hass.data.get(DATA_SUBSCRIPTIONS)) is not None:
+            subscriptions.async_publish(self)
+
+    def _time_attribute_copy(self) -> AbstractContextManager[None]:
+        """Return a context timing how long an update spends building its attributes."""
+        if self._performance is None:
+            return nullcontext()
+        return self._performance.time_attribute_copy()
+
+    @callback
+    def _async_cancel_trailing_write(self) -> None:
+        if self._cancel_trailing_write is not None:
+            self._cancel_trailing_write()
+            self._cancel_trailing_write = None
+
+    @callback
+    def _async_notify_removed(self) -> None:
+        if (subscriptions := self.hass.data.get(DATA_SUBSCRIPTIONS)) is not None:
+            subscriptions.async_remove(self)
+
+    @callback
+    def _async_restart_ttl(self) -> None:
+        """Count the TTL down again from now."""
+        self._ttl_expires = dt_util.utcnow().timestamp() + self._ttl
+        async_get_timer_wheel(self.hass).async_schedule(
+            self, self._ttl_expires, self._async_ttl_expired
+        )
+
+    @callback
+    def _async_ttl_expired(self) -> None:
+        _LOGGER.debug("[%s] Expired after %ss without an update", self.entity_id, self._ttl)
+        self._ttl_expires = None
+        self._async_expire(bool(self._config.get(CONF_TTL_RESET_TO_INITIAL)))
+        self.async_write_ha_state()
+
+    @contextmanager
+    def deferred_state_write(self) -> Iterator[None]:
+        """Collapse every state write inside the block into one write at exit."""
+        if self._state_write_deferred:
+            yield
+            return
+        self._state_write_deferred = True
+        try:
+            yield
+        finally:
+            self._state_write_deferred = False
+            if self._state_write_pending:
+                self._state_write_pending = False
+                self._async_publish_state()
+
+
+def track_update(
+    method: Callable[..., Awaitable[None]],
+) -> Callable[..., Awaitable[None]]:
+    """Mark a method as an update of the variable.
+
+    Each update restarts the variable's TTL, whether or not it writes a new
+    state, and is counted and timed for its performance sensors.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: VariableEntity, **kwargs: Any) -> None:
+        if self._ttl:
+            # Restarted first, so the records of this update carry the new expiry.
+            self._async_restart_ttl()
+        performance = self._performance
+        if performance is None or performance.updating:
+            await method(self, **kwargs)
+            return
+        performance.async_update_started()
+        try:
+            await method(self, **kwargs)
+        finally:
+            performance.async_update_finished()
+
+    return wrapper
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
-from collections.abc import MutableMapping
+from collections.abc import Callable, Iterable, Mapping, MutableMapping
 import copy
 import datetime
+import functools
 import logging
 from typing import Any
 
 import homeassistant.util.dt as dt_util
+from homeassistant.util.read_only_dict import ReadOnlyDict
 
 _LOGGER = logging.getLogger(__name__)
 
+# Parsed attribute paths kept for reuse. Automations use a bounded set of
+# paths, so nearly every lookup after startup is a cache hit.
+ATTRIBUTE_PATH_CACHE_SIZE = 1024
 
-def _parse_attribute_path(path: str) -> list:
-    tokens: list = []
+
+@functools.lru_cache(maxsize=ATTRIBUTE_PATH_CACHE_SIZE)
+def _parse_attribute_path(path: str) -> tuple[str | int, ...]:
+    tokens: list[str | int] = []
     buffer = ""
     index = 0
     while index < len(path):
@@ -40,7 +47,7 @@ def _parse_attribute_path(path: str) -> list:
         index += 1
     if buffer:
         tokens.append(buffer)
-    return tokens
+    return tuple(tokens)
 
 
 def looks_like_attribute_path(path: str) -> bool:
@@ -98,6 +105,427 @@ def set_nested_attribute(target: MutableMapping, path: str, value) -> None:
                 current = current[token]
 
 
+class AttributePath:
+    """An attribute key or bracket path compiled once and shared by every variable.
+
+    Holds the parsed tokens together with a getter and a copy-on-write setter
+    built for them, so an update only pays for parsing the first time a path
+    is seen.
+    """
+
+    __slots__ = ("cow_set", "get", "path", "tokens")
+
+    def __init__(self, path: str) -> None:
+        """Parse ``path`` and build its getter and setter.
+
+        Raises:
+            ValueError: If ``path`` is a bracket path that cannot be parsed.
+        """
+        self.path = path
+        self.tokens: tuple[str | int, ...] = (
+            _parse_attribute_path(path) if looks_like_attribute_path(path) else (path,)
+        )
+        if not self.tokens:
+            raise ValueError("Attribute path cannot be empty")
+        self.get: Callable[[Mapping], Any] = _compile_getter(path, self.tokens)
+        self.cow_set: Callable[[dict, Any, set[int]], None] = _compile_cow_setter(path, self.tokens)
+
+
+@functools.lru_cache(maxsize=ATTRIBUTE_PATH_CACHE_SIZE)
+def compile_attribute_path(path: str) -> AttributePath:
+    """Return the compiled form of an attribute key or bracket path.
+
+    Raises:
+        ValueError: If ``path`` is a bracket path that cannot be parsed.
+    """
+    return AttributePath(path)
+
+
+def _compile_getter(path: str, tokens: tuple[str | int, ...]) -> Callable[[Mapping], Any]:
+    steps = tuple((token, list if isinstance(token, int) else Mapping) for token in tokens)
+
+    def get(source: Mapping) -> Any:
+        current: Any = source
+        for token, container in steps:
+            if not isinstance(current, container) or (
+                token >= len(current) if container is list else token not in current
+            ):
+                raise KeyError(path)
+            current = current[token]
+        return current
+
+    return get
+
+
+def _compile_cow_setter(
+    path: str, tokens: tuple[str | int, ...]
+) -> Callable[[dict, Any, set[int]], None]:
+    # Each container step with the token that follows it, which decides
+    # the type of container the step needs.
+    steps = tuple(zip(tokens[:-1], tokens[1:], strict=True))
+    final = tokens[-1]
+
+    def cow_set(root: dict, value: Any, owned: set[int]) -> None:
+        current: Any = root
+        for token, next_token in steps:
+            if isinstance(token, str):
+                if not isinstance(current, MutableMapping):
+                    raise ValueError(f"Expected mapping while navigating attribute path: {path}")
+                child = _owned_child(current.get(token), next_token, owned)
+            else:
+                if not isinstance(current, list):
+                    raise ValueError(f"Expected list while navigating attribute path: {path}")
+                while len(current) <= token:
+                    padding: list[Any] | dict[str, Any] = [] if isinstance(next_token, int) else {}
+                    owned.add(id(padding))
+                    current.append(padding)
+                child = _owned_child(current[token], next_token, owned)
+            current[token] = child
+            current = child
+        if isinstance(final, str):
+            if not isinstance(current, MutableMapping):
+                raise ValueError(f"Expected mapping while navigating attribute path: {path}")
+        else:
+            if not isinstance(current, list):
+                raise ValueError(f"Expected list while navigating attribute path: {path}")
+            while len(current) <= final:
+                current.append(None)
+        current[final] = copy.deepcopy(value)
+
+    return cow_set
+
+
+def validate_attribute_path(path: str) -> str:
+    """Return ``path`` if it is a valid attribute key or bracket path.
+
+    Raises:
+        ValueError: If ``path`` is a bracket path that cannot be parsed.
+    """
+    compile_attribute_path(path)
+    return path
+
+
+def get_nested_attribute(source: Mapping, path: str) -> Any:
+    """Return the value at ``path`` of an attribute mapping.
+
+    Bracket paths (``items[0].name``) are followed into nested values; any
+    other path is a top-level key, like in ``merge_attribute_dict``.
+
+    Raises:
+        KeyError: If nothing is stored at ``path``.
+        ValueError: If ``path`` is not a valid attribute path.
+    """
+    return compile_attribute_path(path).get(source)
+
+
+def _json_pointer_token(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def diff_attributes(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """Return JSON patch operations that turn ``old`` into ``new``.
+
+    Subtrees that are the same object in both versions are skipped without
+    being compared, so diffing two AttributeTree versions costs time
+    proportional to the containers an update copied, not to the whole tree.
+
+    Args:
+        old: Previous value.
+        new: Current value.
+        path: JSON pointer of both values, prefixed to every operation path.
+    """
+    ops: list[dict[str, Any]] = []
+    _diff_into(old, new, path, ops)
+    return ops
+
+
+def _diff_into(old: Any, new: Any, path: str, ops: list[dict[str, Any]]) -> None:
+    if old is new:
+        return
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        for key, value in new.items():
+            child = f"{path}/{_json_pointer_token(key)}"
+            if key in old:
+                _diff_into(old[key], value, child, ops)
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        ops.extend(
+            {"op": "remove", "path": f"{path}/{_json_pointer_token(key)}"}
+            for key in old
+            if key not in new
+        )
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for index in range(common):
+            _diff_into(old[index], new[index], f"{path}/{index}", ops)
+        ops.extend(
+            {"op": "add", "path": f"{path}/{index}", "value": new[index]}
+            for index in range(common, len(new))
+        )
+        # Remove from the end so each index is still valid when applied.
+        ops.extend(
+            {"op": "remove", "path": f"{path}/{index}"}
+            for index in reversed(range(common, len(old)))
+        )
+        return
+    if type(old) is not type(new) or old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def _owned_child(existing: Any, next_token: str | int, owned: set[int]) -> Any:
+    """Return a container for the next path token that is safe to mutate.
+
+    Containers already copied during the current update are reused as-is.
+    Shared containers are shallow copied, and incompatible values are replaced
+    with a new empty container of the type the next token needs.
+    """
+    if id(existing) in owned:
+        return existing
+    child: list[Any] | dict[str, Any]
+    if isinstance(next_token, int):
+        child = list(existing) if isinstance(existing, list) else []
+    else:
+        child = dict(existing) if isinstance(existing, Mapping) else {}
+    owned.add(id(child))
+    return child
+
+
+class AttributeTree(ReadOnlyDict[str, Any]):
+    """Read-only attribute mapping whose versions share untouched subtrees.
+
+    A tree is never mutated once built. ``merge`` copies the root and only the
+    containers along each updated bracket path; every other nested value is
+    shared with the previous version, so an update costs time proportional to
+    the size of the change instead of the size of the whole attribute tree.
+    """
+
+    def __copy__(self) -> AttributeTree:
+        """Return the tree itself; it is never mutated."""
+        return self
+
+    def __deepcopy__(self, memo: Any) -> AttributeTree:
+        """Create an independent deep copy that is still an AttributeTree."""
+        return AttributeTree(
+            {copy.deepcopy(key, memo): copy.deepcopy(value, memo) for key, value in self.items()}
+        )
+
+    def merge(self, updates: Mapping) -> AttributeTree:
+        """Return a new tree with ``updates`` applied.
+
+        Plain keys replace top-level values and bracket keys (``items[0].name``)
+        update nested values, exactly like ``merge_attribute_dict``. Values
+        taken from ``updates`` are deep copied, so a shallow copy of a mapping
+        the caller does not own is enough before passing it in. When every
+        update already holds, the tree itself is returned, so callers can
+        tell an unchanged tree with ``is``.
+
+        Raises:
+            ValueError: If a bracket key is not a valid attribute path. The
+                current tree is left unchanged.
+        """
+        root = dict(self)
+        owned: set[int] = set()
+        changed = False
+        for attr, value in updates.items():
+            if _holds(root, attr, value):
+                continue
+            changed = True
+            if isinstance(attr, str) and looks_like_attribute_path(attr):
+                compile_attribute_path(attr).cow_set(root, value, owned)
+            else:
+                root[attr] = copy.deepcopy(value)
+        return AttributeTree(root) if changed else self
+
+    def patch(self, operations: Iterable[Mapping[str, Any]]) -> AttributeTree:
+        """Return a new tree with patch operations applied in order.
+
+        Each operation has an ``op``, a ``path`` and, depending on the op, a
+        ``value`` or a ``from`` path. Like ``merge``, only the containers along
+        each patched path are copied, and a container is copied once no
+        matter how many operations touch it. Like ``merge``, the tree itself
+        is returned when every operation sets a value that is already there.
+
+        Raises:
+            ValueError: If an operation cannot be applied, naming the
+                operation. The current tree is left unchanged.
+        """
+        root = dict(self)
+        owned: set[int] = set()
+        changed = False
+        for index, operation in enumerate(operations):
+            op = operation["op"]
+            try:
+                if op == "set" and _holds(root, operation["path"], operation["value"]):
+                    continue
+                _PATCH_OPERATIONS[op](root, operation, owned)
+                changed = True
+            except (KeyError, ValueError) as err:
+                reason = f"{err.args[0]!r} not found" if isinstance(err, KeyError) else err
+                raise ValueError(
+                    f"Patch operation {index} ({op} {operation['path']}) failed: {reason}"
+                ) from None
+        return AttributeTree(root) if changed else self
+
+
+def _holds(root: Mapping, attr: Any, value: Any) -> bool:
+    """Return True if ``attr`` of ``root`` already holds ``value``.
+
+    Only the value at ``attr`` is compared, never the rest of the tree. Values
+    of different types, like ``1`` and ``True``, do not count as equal.
+    """
+    try:
+        if isinstance(attr, str) and looks_like_attribute_path(attr):
+            current = compile_attribute_path(attr).get(root)
+        else:
+            current = root[attr]
+    except KeyError:
+        return False
+    return type(current) is type(value) and current == value
+
+
+def _patch_tokens(path: str) -> tuple[str | int, ...]:
+    return compile_attribute_path(path).tokens
+
+
+def _cow_parent(root: dict, tokens: tuple[str | int, ...], owned: set[int], create: bool) -> Any:
+    """Return an owned copy of the container holding the last path token.
+
+    With ``create``, missing or incompatible containers along the path are
+    replaced like ``merge`` does. Otherwise the path must already exist.
+    """
+    current: Any = root
+    for idx, token in enumerate(tokens[:-1]):
+        next_token = tokens[idx + 1]
+        if isinstance(token, int):
+            if not isinstance(current, list):
+                raise ValueError("expected a list")
+            if token >= len(current):
+                if not create:
+                    raise KeyError(token)
+                current.extend([None] * (token + 1 - len(current)))
+            existing = current[token]
+        else:
+            if not isinstance(current, Mapping):
+                raise ValueError("expected a mapping")
+            if token not in current and not create:
+                raise KeyError(token)
+            existing = current.get(token)
+        expected = list if isinstance(next_token, int) else Mapping
+        if not create and not isinstance(existing, expected):
+            raise ValueError(f"expected a {'list' if expected is list else 'mapping'} at {token}")
+        child = _owned_child(existing, next_token, owned)
+        current[token] = child
+        current = child
+    return current
+
+
+def _patch_get(parent: Any, token: str | int) -> Any:
+    if isinstance(token, int):
+        if not isinstance(parent, list):
+            raise ValueError("expected a list")
+        if token >= len(parent):
+            raise KeyError(token)
+    elif not isinstance(parent, Mapping):
+        raise ValueError("expected a mapping")
+    elif token not in parent:
+        raise KeyError(token)
+    return parent[token]
+
+
+def _patch_put(parent: Any, token: str | int, value: Any) -> None:
+    if isinstance(token, int):
+        if not isinstance(parent, list):
+            raise ValueError("expected a list")
+        if token >= len(parent):
+            parent.extend([None] * (token + 1 - len(parent)))
+    elif not isinstance(parent, MutableMapping):
+        raise ValueError("expected a mapping")
+    parent[token] = value
+
+
+def _patch_list(root: dict, path: str, owned: set[int]) -> list:
+    """Return an owned copy of the list at ``path``, creating an empty one if missing."""
+    tokens = _patch_tokens(path)
+    parent = _cow_parent(root, tokens, owned, create=True)
+    try:
+        existing = _patch_get(parent, tokens[-1])
+    except KeyError:
+        existing = []
+    if not isinstance(existing, list):
+        raise ValueError("expected a list")
+    target = _owned_child(existing, 0, owned)
+    _patch_put(parent, tokens[-1], target)
+    return target
+
+
+def _patch_set(root: dict, operation: Mapping[str, Any], owned: set[int]) -> None:
+    tokens = _patch_tokens(operation["path"])
+    parent = _cow_parent(root, tokens, owned, create=True)
+    _patch_put(parent, tokens[-1], copy.deepcopy(operation["value"]))
+
+
+def _patch_delete(root: dict, operation: Mapping[str, Any], owned: set[int]) -> Any:
+    tokens = _patch_tokens(operation["path"])
+    parent = _cow_parent(root, tokens, owned, create=False)
+    value = _patch_get(parent, tokens[-1])
+    del parent[tokens[-1]]
+    return value
+
+
+def _patch_append(root: dict, operation: Mapping[str, Any], owned: set[int]) -> None:
+    _patch_list(root, operation["path"], owned).append(copy.deepcopy(operation["value"]))
+
+
+def _patch_extend(root: dict, operation: Mapping[str, Any], owned: set[int]) -> None:
+    _patch_list(root, operation["path"], owned).extend(copy.deepcopy(operation["value"]))
+
+
+def _patch_increment(root: dict, operation: Mapping[str, Any], owned: set[int]) -> None:
+    tokens = _patch_tokens(operation["path"])
+    parent = _cow_parent(root, tokens, owned, create=True)
+    try:
+        current = _patch_get(parent, tokens[-1])
+    except KeyError:
+        current = 0
+    if current is None:
+        current = 0
+    if isinstance(current, bool) or not isinstance(current, (int, float)):
+        raise ValueError(f"expected a number, got {current!r}")
+    _patch_put(parent, tokens[-1], current + operation.get("value", 1))
+
+
+def _patch_remove_value(root: dict, operation: Mapping[str, Any], owned: set[int]) -> None:
+    target = _patch_list(root, operation["path"], owned)
+    target[:] = [item for item in target if item != operation["value"]]
+
+
+def _patch_move(root: dict, operation: Mapping[str, Any], owned: set[int]) -> None:
+    value = _patch_delete(root, {"path": operation["from"]}, owned)
+    tokens = _patch_tokens(operation["path"])
+    _patch_put(_cow_parent(root, tokens, owned, create=True), tokens[-1], value)
+
+
+_PATCH_OPERATIONS: dict[str, Callable[[dict, Mapping[str, Any], set[int]], Any]] = {
+    "set": _patch_set,
+    "delete": _patch_delete,
+    "append": _patch_append,
+    "extend": _patch_extend,
+    "increment": _patch_increment,
+    "remove_value": _patch_remove_value,
+    "move": _patch_move,
+}
+
+
+def to_attribute_tree(attributes: Mapping | None) -> AttributeTree:
+    """Return ``attributes`` as an AttributeTree, deep copying foreign mappings."""
+    if isinstance(attributes, AttributeTree):
+        return attributes
+    if not attributes:
+        return AttributeTree()
+    return AttributeTree(copy.deepcopy(dict(attributes)))
+
+
 def merge_attribute_dict(
     existing: MutableMapping | None, updates: MutableMapping
 ) -> MutableMapping:
@@ -120,162 +548,121 @@ def to_num(s):
             return None
 
 
-def value_to_type(init_val, dest_type):  # noqa: C901
-    if init_val is None or (
-        isinstance(init_val, str) and init_val.lower() in ["", "none", "unknown", "unavailable"]
-    ):
-        _LOGGER.debug(f"[value_to_type] return value: {init_val}, returning None")
-        return None
+_NULL_STRINGS = frozenset({"", "none", "unknown", "unavailable"})
+
+type ValueConverter = Callable[[Any], Any]
+
+
+def _aware(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None or value.tzinfo.utcoffset(value) is None:
+        return value.replace(tzinfo=dt_util.UTC)
+    return value
+
+
+def _from_isoformat(parse: Callable[[str], Any], dest_type: str, source: str) -> Callable:
+    def convert(value):
+        try:
+            return parse(str(value))
+        except ValueError:
+            raise ValueError(f"Cannot convert {source} to {dest_type}: {value}") from None
+
+    return convert
+
+
+def _string_to_number(value: str):
+    if (value_num := to_num(value)) is not None:
+        return value_num
+    raise ValueError(f"Cannot convert string to number: {value}")
+
 
+def _date_to_datetime(value: datetime.date) -> datetime.datetime:
+    return datetime.datetime.combine(value, datetime.time.min)
+
+
+def _identity(value):
+    return value
+
+
+def _parse_datetime(value: str) -> datetime.datetime:
+    return _aware(datetime.datetime.fromisoformat(value))
+
+
+# Conversion for each destination type, keyed by the kind of the initial value.
+_CONVERSIONS: dict[str, dict[str, Callable]] = {
+    "string": {
+        "string": _identity,
+        "number": str,
+        "date": datetime.date.isoformat,
+        "datetime": datetime.datetime.isoformat,
+    },
+    "date": {
+        "string": _from_isoformat(datetime.date.fromisoformat, "date", "string"),
+        "number": _from_isoformat(datetime.date.fromisoformat, "date", "number"),
+        "date": _identity,
+        "datetime": datetime.datetime.date,
+    },
+    "datetime": {
+        "string": _from_isoformat(_parse_datetime, "datetime", "string"),
+        "number": _from_isoformat(_parse_datetime, "datetime", "number"),
+        "date": _date_to_datetime,
+        "datetime": _identity,
+    },
+    "number": {
+        "string": _string_to_number,
+        "number": _identity,
+        "date": lambda value: _date_to_datetime(value).timestamp(),
+        "datetime": datetime.datetime.timestamp,
+    },
+}
+
+_EXACT_KINDS: dict[type, str] = {
+    str: "string",
+    int: "number",
+    float: "number",
+    datetime.date: "date",
+    datetime.datetime: "datetime",
+}
+
+
+def _value_kind(value) -> tuple[str, Any]:
+    """Classify a value that is not exactly one of the native value types."""
+    if isinstance(value, str):
+        return "string", value
+    if isinstance(value, (int, float)):
+        return "number", value
+    if isinstance(value, datetime.date):
+        # Subclasses of date and datetime are not converted.
+        raise ValueError(f"Invalid initial type: {type(value)}")
     # Convert Wrapper types and other non-native types to strings
     # This handles HA 2026.3.4+ template engine's Wrapper type from | tojson
-    if not isinstance(init_val, (str, int, float, datetime.date, datetime.datetime)):
-        init_val = str(init_val)
+    return "string", str(value)
 
-    # _LOGGER.debug(f"[value_to_type] initial value: {init_val}, initial type: {type(init_val)}, dest type: {dest_type}")
-    if isinstance(init_val, str):
-        # _LOGGER.debug("[value_to_type] Processing as string")
-        if dest_type is None or dest_type == "string":
-            _LOGGER.debug(f"[value_to_type] return value: {init_val}, type: {type(init_val)}")
-            return init_val
 
-        elif dest_type == "date":
-            try:
-                value_date = datetime.date.fromisoformat(init_val)
-            except ValueError:
-                _LOGGER.debug(f"Cannot convert string to {dest_type}: {init_val}, returning None")
-                raise ValueError(f"Cannot convert string to {dest_type}: {init_val}")
-                return None
-            else:
-                _LOGGER.debug(
-                    f"[value_to_type] return value: {value_date}, type: {type(value_date)}"
-                )
-                return value_date
+@functools.cache
+def get_value_converter(dest_type: str | None) -> ValueConverter:
+    """Return a converter from any supported value to ``dest_type``.
 
-        elif dest_type == "datetime":
-            try:
-                value_datetime = datetime.datetime.fromisoformat(init_val)
-            except ValueError:
-                _LOGGER.debug(f"Cannot convert string to {dest_type}: {init_val}, returning None")
-                raise ValueError(f"Cannot convert string to {dest_type}: {init_val}")
-                return None
-            else:
-                _LOGGER.debug(
-                    f"[value_to_type] return value: {value_datetime}, type: {type(value_datetime)}"
-                )
-                if (
-                    value_datetime.tzinfo is None
-                    or value_datetime.tzinfo.utcoffset(value_datetime) is None
-                ):
-                    return value_datetime.replace(tzinfo=dt_util.UTC)
-                return value_datetime
-
-        elif dest_type == "number":
-            if (value_num := to_num(init_val)) is not None:
-                _LOGGER.debug(f"[value_to_type] return value: {value_num}, type: {type(value_num)}")
-                return value_num
-            else:
-                _LOGGER.debug(f"Cannot convert string to {dest_type}: {init_val}, returning None")
-                raise ValueError(f"Cannot convert string to {dest_type}: {init_val}")
-        else:
-            _LOGGER.debug(f"Invalid dest_type: {dest_type}, returning None")
-            raise ValueError(f"Invalid dest_type: {dest_type}")
-            return None
-    elif isinstance(init_val, int) or isinstance(init_val, float):
-        # _LOGGER.debug("[value_to_type] Processing as number")
-        if dest_type is None or dest_type == "string":
-            _LOGGER.debug(
-                f"[value_to_type] return value: {str(init_val)}, type: {type(str(init_val))}"
-            )
-            return str(init_val)
-        elif dest_type == "date":
-            try:
-                value_date = datetime.date.fromisoformat(str(init_val))
-            except ValueError:
-                _LOGGER.debug(f"Cannot convert number to {dest_type}: {init_val}, returning None")
-                raise ValueError(f"Cannot convert number to {dest_type}: {init_val}")
-                return None
-            else:
-                _LOGGER.debug(
-                    f"[value_to_type] return value: {value_date}, type: {type(value_date)}"
-                )
-                return value_date
+    The branching on the destination type happens once here, so callers that
+    convert repeatedly (each Sensor Variable keeps the converter for its
+    value_type) only pay for a dict lookup on the value's own type. The
+    converter behaves exactly like ``value_to_type``.
+    """
+    conversions = _CONVERSIONS.get("string" if dest_type is None else dest_type)
 
-        elif dest_type == "datetime":
-            try:
-                value_datetime = datetime.datetime.fromisoformat(str(init_val))
-            except ValueError:
-                _LOGGER.debug(f"Cannot convert number to {dest_type}: {init_val}, returning None")
-                raise ValueError(f"Cannot convert number to {dest_type}: {init_val}")
-                return None
-            else:
-                _LOGGER.debug(
-                    f"[value_to_type] return value: {value_datetime}, type: {type(value_datetime)}"
-                )
-                if (
-                    value_datetime.tzinfo is None
-                    or value_datetime.tzinfo.utcoffset(value_datetime) is None
-                ):
-                    return value_datetime.replace(tzinfo=dt_util.UTC)
-                return value_datetime
-        elif dest_type == "number":
-            _LOGGER.debug(f"[value_to_type] return value: {init_val}, type: {type(init_val)}")
-            return init_val
-        else:
-            _LOGGER.debug(f"Invalid dest_type: {dest_type}, returning None")
-            raise ValueError(f"Invalid dest_type: {dest_type}")
+    def convert(value):
+        if value is None:
             return None
-    elif isinstance(init_val, datetime.date) and type(init_val) is datetime.date:
-        # _LOGGER.debug("[value_to_type] Processing as date")
-        if dest_type is None or dest_type == "string":
-            _LOGGER.debug(
-                f"[value_to_type] return value: {init_val.isoformat()}, type: {type(init_val.isoformat())}"
-            )
-            return init_val.isoformat()
-        elif dest_type == "date":
-            _LOGGER.debug(f"[value_to_type] return value: {init_val}, type: {type(init_val)}")
-            return init_val
-        elif dest_type == "datetime":
-            _LOGGER.debug(
-                f"[value_to_type] return value: {datetime.datetime.combine(init_val, datetime.time.min)}, "
-                + f"type: {type(datetime.datetime.combine(init_val, datetime.time.min))}"
-            )
-            return datetime.datetime.combine(init_val, datetime.time.min)
-        elif dest_type == "number":
-            _LOGGER.debug(
-                f"[value_to_type] return value: {datetime.datetime.combine(init_val, datetime.time.min).timestamp()}, "
-                + f"type: {type(datetime.datetime.combine(init_val, datetime.time.min).timestamp())}"
-            )
-            return datetime.datetime.combine(init_val, datetime.time.min).timestamp()
-        else:
-            _LOGGER.debug(f"Invalid dest_type: {dest_type}, returning None")
-            raise ValueError(f"Invalid dest_type: {dest_type}")
+        kind = _EXACT_KINDS.get(type(value))
+        if kind is None:
+            kind, value = _value_kind(value)
+        if kind == "string" and value.lower() in _NULL_STRINGS:
             return None
-    elif isinstance(init_val, datetime.datetime) and type(init_val) is datetime.datetime:
-        # _LOGGER.debug("[value_to_type] Processing as datetime")
-        if dest_type is None or dest_type == "string":
-            _LOGGER.debug(
-                f"[value_to_type] return value: {init_val.isoformat()}, type: {type(init_val.isoformat())}"
-            )
-            return init_val.isoformat()
-        elif dest_type == "date":
-            _LOGGER.debug(
-                f"[value_to_type] return value: {init_val.date()}, type: {type(init_val.date())}"
-            )
-            return init_val.date()
-        elif dest_type == "datetime":
-            _LOGGER.debug(f"[value_to_type] return value: {init_val}, type: {type(init_val)}")
-            return init_val
-        elif dest_type == "number":
-            _LOGGER.debug(
-                f"[value_to_type] return value: {init_val.timestamp()}, type: {type(init_val.timestamp())}"
-            )
-            return init_val.timestamp()
-        else:
-            _LOGGER.debug(f"Invalid dest_type: {dest_type}, returning None")
+        if conversions is None:
             raise ValueError(f"Invalid dest_type: {dest_type}")
-            return None
-    else:
-        _LOGGER.debug(f"Invalid initial type: {type(init_val)}, returning None")
-        raise ValueError(f"Invalid initial type: {type(init_val)}")
-        return None
+        return conversions[kind](value)
+
+    return convert
+
+
+def value_to_type(init_val, dest_type):
+    return get_value_converter(dest_type)(init_val)
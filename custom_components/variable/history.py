@@ -0,0 +1,94 @@
+"""Bounded in-memory history of Sensor Variable values."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+import math
+from typing import Any
+
+
+class ValueHistory:
+    """The last ``size`` values of a variable and when each was set, oldest first.
+
+    Numeric histories keep their values and timestamps in two preallocated
+    ``array('d')`` ring buffers, a fixed 16 bytes per slot. Other value types
+    keep their values in a list of the same length instead.
+    """
+
+    __slots__ = ("_count", "_next", "_numeric", "_size", "_times", "_values")
+
+    def __init__(self, size: int, numeric: bool) -> None:
+        """Initialize an empty history of ``size`` slots."""
+        self._size = size
+        self._numeric = numeric
+        self._times = array("d", bytes(8 * size))
+        self._values: array[float] | list[Any] = (
+            array("d", bytes(8 * size)) if numeric else [None] * size
+        )
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of values kept."""
+        return self._count
+
+    def __iter__(self) -> Iterator[tuple[float, Any]]:
+        """Iterate over (timestamp, value) pairs, oldest first."""
+        start = (self._next - self._count) % self._size
+        for offset in range(self._count):
+            yield self._item((start + offset) % self._size)
+
+    @property
+    def size(self) -> int:
+        """Return the number of values the history can keep."""
+        return self._size
+
+    @property
+    def last_value(self) -> Any:
+        """Return the newest value, or None if the history is empty."""
+        if not self._count:
+            return None
+        return self._item((self._next - 1) % self._size)[1]
+
+    def append(self, timestamp: float, value: Any) -> None:
+        """Add a value, overwriting the oldest one once the history is full."""
+        if self._numeric:
+            value = float(value) if _is_number(value) else math.nan
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self._size
+        if self._count < self._size:
+            self._count += 1
+
+    def downsample(self, max_points: int) -> list[tuple[float, Any]]:
+        """Return at most ``max_points`` (timestamp, value) pairs, oldest first.
+
+        Consecutive values are grouped into ``max_points`` equal buckets. Each
+        bucket is reported at its newest timestamp with the mean of its numeric
+        values, or with its newest value if the history is not numeric.
+        """
+        points = list(self)
+        if len(points) <= max_points:
+            return points
+        downsampled: list[tuple[float, Any]] = []
+        for bucket in range(max_points):
+            chunk = points[
+                bucket * len(points) // max_points : (bucket + 1) * len(points) // max_points
+            ]
+            value = chunk[-1][1]
+            if self._numeric:
+                values = [value for _, value in chunk if value is not None]
+                value = math.fsum(values) / len(values) if values else None
+            downsampled.append((chunk[-1][0], value))
+        return downsampled
+
+    def _item(self, index: int) -> tuple[float, Any]:
+        value = self._values[index]
+        if self._numeric and math.isnan(value):
+            value = None
+        return self._times[index], value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
@@ -0,0 +1,175 @@
+"""Append-only journal of changes to frequently updated Variables."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util.json import json_loads
+
+from .const import DATA_JOURNAL, DOMAIN, JOURNAL_COMPACT_RECORDS
+from .store import VariableStore, async_get_variable_store
+
+if TYPE_CHECKING:
+    from .entity import VariableEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+JOURNAL_FILE = f"{DOMAIN}.journal"
+
+
+class VariableJournal:
+    """Newline-delimited JSON journal of journaled variables, folded into the value store.
+
+    Only variables restored on restart can be journaled. Every state write
+    requested by a journaled variable, and every value change it does not
+    write, appends one record holding its
+    unique_id and value, plus its attributes when they changed since its
+    previous record. Records are appended to the file in batches, each batch
+    with a single fsync, so a burst of updates costs one write.
+
+    Once ``JOURNAL_COMPACT_RECORDS`` records were written, the value store is
+    saved and the journal truncated. Each requested write also marks the
+    variable dirty in the store, so the saved value is never older than the
+    variable's last record and replaying a journal that was not truncated
+    before a crash is harmless.
+    """
+
+    def __init__(self, hass: HomeAssistant, store: VariableStore) -> None:
+        """Initialize an empty journal."""
+        self.hass = hass
+        self._store = store
+        self._path = hass.config.path(STORAGE_DIR, JOURNAL_FILE)
+        self._pending: list[bytes] = []
+        self._flushing = False
+        # Last attributes journaled for each variable. Attribute updates replace
+        # the whole attribute tree, so an unchanged object means unchanged values.
+        self._attributes: dict[str, Any] = {}
+        self._records_in_file = 0
+        self._started = time.monotonic()
+        self._records_appended = 0
+        self._records_written = 0
+        self._bytes_written = 0
+        self._batches = 0
+        self._compactions = 0
+        self._records_replayed = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the journal's write throughput counters."""
+        uptime = time.monotonic() - self._started
+        return {
+            "records_appended": self._records_appended,
+            "records_written": self._records_written,
+            "bytes_written": self._bytes_written,
+            "batches": self._batches,
+            "compactions": self._compactions,
+            "records_replayed": self._records_replayed,
+            "records_per_second": round(self._records_written / uptime, 3) if uptime else 0.0,
+        }
+
+    async def async_load(self) -> None:
+        """Replay a journal left from the previous run into the store, then compact it."""
+        lines = await self.hass.async_add_executor_job(self._read)
+        for line in lines:
+            try:
+                record = json_loads(line)
+                unique_id = record.pop("id")
+            except ValueError, KeyError, AttributeError:
+                # A crash can leave the last record half written.
+                _LOGGER.debug("Skipping unreadable journal record: %r", line)
+                continue
+            if record.pop("removed", False):
+                self._store.async_remove(unique_id)
+            else:
+                self._store.async_update_record(unique_id, record)
+            self._records_replayed += 1
+        if lines:
+            _LOGGER.debug("Replayed %s journal records", self._records_replayed)
+            await self._async_compact()
+
+    @callback
+    def async_append(self, entity: VariableEntity) -> None:
+        """Journal the entity's current value, and its attributes if they changed."""
+        if (unique_id := entity.unique_id) is None:
+            return
+        attributes = entity.extra_state_attributes
+        changed = self._attributes.get(unique_id) is not attributes
+        if changed:
+            self._attributes[unique_id] = attributes
+        record = entity.async_get_stored_record(attributes=changed)
+        record["id"] = unique_id
+        self._async_add(record)
+
+    @callback
+    def async_remove(self, unique_id: str) -> None:
+        """Journal that a variable was removed, if it was journaled."""
+        if self._attributes.pop(unique_id, None) is not None:
+            self._async_add({"id": unique_id, "removed": True})
+
+    @callback
+    def _async_add(self, record: dict[str, Any]) -> None:
+        self._pending.append(json_bytes(record) + b"\n")
+        self._records_appended += 1
+        if not self._flushing:
+            self._flushing = True
+            self.hass.async_create_task(self._async_flush(), "variable journal flush")
+
+    async def _async_flush(self) -> None:
+        """Write pending records until none are left, compacting when the file is long."""
+        try:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                self._bytes_written += await self.hass.async_add_executor_job(self._append, batch)
+                self._records_written += len(batch)
+                self._records_in_file += len(batch)
+                self._batches += 1
+                # Nothing may be awaited between an empty queue and the store
+                # snapshot taken by the compaction.
+                if not self._pending and self._records_in_file >= JOURNAL_COMPACT_RECORDS:
+                    await self._async_compact()
+        finally:
+            self._flushing = False
+
+    async def _async_compact(self) -> None:
+        await self._store.async_save_now()
+        await self.hass.async_add_executor_job(self._truncate)
+        self._records_in_file = 0
+        self._compactions += 1
+        _LOGGER.debug("Compacted the journal into the value store")
+
+    def _read(self) -> list[str]:
+        try:
+            with open(self._path, encoding="utf-8") as journal:
+                return [line for line in journal.read().splitlines() if line]
+        except FileNotFoundError:
+            return []
+
+    def _append(self, batch: Iterable[bytes]) -> int:
+        data = b"".join(batch)
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        with open(self._path, "ab") as journal:
+            journal.write(data)
+            journal.flush()
+            os.fsync(journal.fileno())
+        return len(data)
+
+    def _truncate(self) -> None:
+        if os.path.exists(self._path):
+            with open(self._path, "wb") as journal:
+                os.fsync(journal.fileno())
+
+
+@callback
+def async_get_variable_journal(hass: HomeAssistant) -> VariableJournal:
+    """Return the integration's journal, creating it on first use."""
+    journal: VariableJournal | None = hass.data.get(DATA_JOURNAL)
+    if journal is None:
+        journal = hass.data[DATA_JOURNAL] = VariableJournal(hass, async_get_variable_store(hass))
+    return journal
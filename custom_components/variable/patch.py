@@ -0,0 +1,60 @@
+"""Validation of attribute patch operations."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers import config_validation as cv
+import voluptuous as vol
+
+from .const import ATTR_FROM, ATTR_OP, ATTR_PATH, ATTR_VALUE
+from .helpers import validate_attribute_path
+
+
+def attribute_path(value: Any) -> str:
+    """Validate an attribute key or bracket path."""
+    try:
+        return validate_attribute_path(cv.string(value))
+    except ValueError as err:
+        raise vol.Invalid(str(err)) from err
+
+
+def _number(value: Any) -> int | float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise vol.Invalid(f"expected a number, got {value!r}")
+    return value
+
+
+def _operation(extra: dict) -> vol.Schema:
+    return vol.Schema(
+        {vol.Required(ATTR_OP): str, vol.Required(ATTR_PATH): attribute_path, **extra}
+    )
+
+
+_OPERATION_SCHEMAS: dict[str, vol.Schema] = {
+    "set": _operation({vol.Required(ATTR_VALUE): cv.match_all}),
+    "delete": _operation({}),
+    "append": _operation({vol.Required(ATTR_VALUE): cv.match_all}),
+    "extend": _operation({vol.Required(ATTR_VALUE): list}),
+    "increment": _operation({vol.Optional(ATTR_VALUE, default=1): _number}),
+    "remove_value": _operation({vol.Required(ATTR_VALUE): cv.match_all}),
+    "move": _operation({vol.Required(ATTR_FROM): attribute_path}),
+}
+
+
+def _patch_operation(value: Any) -> dict[str, Any]:
+    if not isinstance(value, dict):
+        raise vol.Invalid("expected a patch operation mapping")
+    op = value.get(ATTR_OP)
+    # A list or mapping from YAML cannot be looked up.
+    schema = _OPERATION_SCHEMAS.get(op) if isinstance(op, str) else None
+    if schema is None:
+        raise vol.Invalid(
+            f"unknown patch operation {op!r}, expected one of: {', '.join(_OPERATION_SCHEMAS)}"
+        )
+    return schema(value)
+
+
+# Ordered operations of the patch parameter of the update_* services. Every
+# operation is validated before any of them is applied.
+ATTRIBUTE_PATCH_SCHEMA = vol.All(cv.ensure_list, [_patch_operation])
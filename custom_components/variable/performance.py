@@ -0,0 +1,254 @@
+"""Opt-in performance counters of a variable and the sensors reporting them."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    CONF_DEVICE_ID,
+    CONF_NAME,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.typing import StateType
+
+from .const import CONF_VARIABLE_ID, DATA_PERFORMANCE
+
+# Seconds covered by the update and state write rates.
+RATE_WINDOW = 60
+
+
+class _RateWindow:
+    """Events counted in one-second buckets over the last ``RATE_WINDOW`` seconds."""
+
+    __slots__ = ("_buckets", "_second")
+
+    def __init__(self) -> None:
+        self._buckets = [0] * RATE_WINDOW
+        self._second = 0
+
+    def add(self, now: float) -> None:
+        self._advance(int(now))
+        self._buckets[self._second % RATE_WINDOW] += 1
+
+    def count(self, now: float) -> int:
+        self._advance(int(now))
+        return sum(self._buckets)
+
+    def _advance(self, second: int) -> None:
+        if second <= self._second:
+            return
+        for passed in range(self._second + 1, min(second, self._second + RATE_WINDOW) + 1):
+            self._buckets[passed % RATE_WINDOW] = 0
+        self._second = second
+
+
+class VariablePerformance:
+    """Update and state write counters of one variable.
+
+    An update is a call of one of the variable's update services. Updates
+    that end without publishing a state write of their own, because the
+    value was within the deadband or the write was coalesced or batched,
+    count as suppressed writes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without updates."""
+        self._updates = _RateWindow()
+        self._writes = _RateWindow()
+        self.suppressed_writes = 0
+        # Seconds from the start of the last update that published a write to that write.
+        self.last_update_latency: float | None = None
+        # Bytes of the JSON encoded attributes of the last published write.
+        self.attribute_payload_size: int | None = None
+        # Seconds the last update spent building its attributes.
+        self.attribute_copy_time: float | None = None
+        self._update_started: float | None = None
+        self._update_wrote = False
+        self._copy_time = 0.0
+        self._payload_source: Mapping[str, Any] | None = None
+
+    @property
+    def updating(self) -> bool:
+        """Return whether an update is running."""
+        return self._update_started is not None
+
+    @property
+    def updates_per_minute(self) -> int:
+        """Return the number of updates in the last minute."""
+        return self._updates.count(time.monotonic())
+
+    @property
+    def writes_per_minute(self) -> int:
+        """Return the number of published state writes in the last minute."""
+        return self._writes.count(time.monotonic())
+
+    @callback
+    def async_update_started(self) -> None:
+        """Count an update and start timing it."""
+        self._updates.add(time.monotonic())
+        self._update_started = time.perf_counter()
+        self._update_wrote = False
+        self._copy_time = 0.0
+
+    @callback
+    def async_update_finished(self) -> None:
+        """Finish timing the running update."""
+        if not self._update_wrote:
+            self.suppressed_writes += 1
+        self.attribute_copy_time = self._copy_time
+        self._update_started = None
+
+    @contextmanager
+    def time_attribute_copy(self) -> Iterator[None]:
+        """Add the time spent in the block to the attribute copy time of the update."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._copy_time += time.perf_counter() - start
+
+    @callback
+    def async_state_written(self, attributes: Mapping[str, Any] | None) -> None:
+        """Count a published state write and measure its attributes."""
+        self._writes.add(time.monotonic())
+        if self._update_started is not None:
+            self._update_wrote = True
+            self.last_update_latency = time.perf_counter() - self._update_started
+        # Attribute trees are replaced on change, so unchanged ones are not encoded again.
+        if attributes is not self._payload_source or self.attribute_payload_size is None:
+            self._payload_source = attributes
+            try:
+                self.attribute_payload_size = len(json_bytes(attributes or {}))
+            except TypeError:
+                self.attribute_payload_size = None
+
+
+@callback
+def async_get_variable_performance(hass: HomeAssistant, unique_id: str) -> VariablePerformance:
+    """Return the performance counters of a variable, creating them on first use."""
+    counters: dict[str, VariablePerformance] = hass.data.setdefault(DATA_PERFORMANCE, {})
+    performance = counters.get(unique_id)
+    if performance is None:
+        performance = counters[unique_id] = VariablePerformance()
+    return performance
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    return None if seconds is None else seconds * 1000
+
+
+@dataclass(frozen=True, kw_only=True)
+class VariablePerformanceSensorDescription(SensorEntityDescription):
+    """Description of a performance sensor of a variable."""
+
+    value_fn: Callable[[VariablePerformance], StateType]
+
+
+PERFORMANCE_SENSORS: tuple[VariablePerformanceSensorDescription, ...] = (
+    VariablePerformanceSensorDescription(
+        key="updates_per_minute",
+        name="Updates per Minute",
+        native_unit_of_measurement="updates/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda performance: performance.updates_per_minute,
+    ),
+    VariablePerformanceSensorDescription(
+        key="writes_per_minute",
+        name="State Writes per Minute",
+        native_unit_of_measurement="writes/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda performance: performance.writes_per_minute,
+    ),
+    VariablePerformanceSensorDescription(
+        key="suppressed_writes",
+        name="Suppressed Writes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda performance: performance.suppressed_writes,
+    ),
+    VariablePerformanceSensorDescription(
+        key="last_update_latency",
+        name="Last Update Latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda performance: _milliseconds(performance.last_update_latency),
+    ),
+    VariablePerformanceSensorDescription(
+        key="attribute_payload_size",
+        name="Attribute Payload Size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda performance: performance.attribute_payload_size,
+    ),
+    VariablePerformanceSensorDescription(
+        key="attribute_copy_time",
+        name="Attribute Copy Time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda performance: _milliseconds(performance.attribute_copy_time),
+    ),
+)
+
+
+class VariablePerformanceSensor(SensorEntity):
+    """Diagnostic sensor reporting one performance counter of a variable.
+
+    The counters change on every update, so the sensor is polled instead of
+    writing its state from the update path.
+    """
+
+    entity_description: VariablePerformanceSensorDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: Mapping[str, Any],
+        unique_id: str,
+        description: VariablePerformanceSensorDescription,
+    ) -> None:
+        """Initialize the sensor of one counter of the variable with ``unique_id``."""
+        self.entity_description = description
+        self._performance = async_get_variable_performance(hass, unique_id)
+        self._attr_unique_id = f"{unique_id}_{description.key}"
+        self._attr_name = (
+            f"{config.get(CONF_NAME, config.get(CONF_VARIABLE_ID, ''))} {description.name}"
+        )
+        if (device_id := config.get(CONF_DEVICE_ID)) is not None:
+            self.device_entry = dr.async_get(hass).async_get(device_id)
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the current value of the counter."""
+        return self.entity_description.value_fn(self._performance)
+
+
+@callback
+def async_create_performance_sensors(
+    hass: HomeAssistant, config: Mapping[str, Any], unique_id: str
+) -> list[VariablePerformanceSensor]:
+    """Return the performance sensors of the variable with ``unique_id``."""
+    return [
+        VariablePerformanceSensor(hass, config, unique_id, description)
+        for description in PERFORMANCE_SENSORS
+    ]
@@ -1,9 +1,16 @@
-from collections.abc import MutableMapping
-import copy
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime
+from decimal import Decimal
 import logging
-from typing import cast
-
-from homeassistant.components.sensor import CONF_STATE_CLASS, PLATFORM_SCHEMA, RestoreSensor
+from typing import Any
+
+from homeassistant.components.sensor import (
+    CONF_STATE_CLASS,
+    PLATFORM_SCHEMA,
+    RestoreSensor,
+    SensorEntity,
+    SensorExtraStoredData,
+)
 from homeassistant.components.sensor.const import UNIT_CONVERTERS
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -17,41 +24,79 @@ from homeassistant.const import (
     MATCH_ALL,
     Platform,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HomeAssistant,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.helpers import config_validation as cv, device_registry as dr, entity_platform
 from homeassistant.helpers.entity import generate_entity_id
 import homeassistant.helpers.entity_registry as er
-from homeassistant.util import slugify
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.restore_state import StoredState
+from homeassistant.helpers.typing import UNDEFINED
+from homeassistant.util import dt as dt_util, slugify
 import voluptuous as vol
 import yaml
 
 from . import _async_exclude_entity_from_recorder
+from .collection import VariableCollection
 from .const import (
     ATTR_ATTRIBUTES,
+    ATTR_MAX_POINTS,
     ATTR_NATIVE_UNIT_OF_MEASUREMENT,
+    ATTR_PATCH,
     ATTR_REPLACE_ATTRIBUTES,
     ATTR_SUGGESTED_UNIT_OF_MEASUREMENT,
     ATTR_VALUE,
     ATTR_VALUE_DELTA,
+    CONF_ACCUMULATOR,
+    CONF_ACCUMULATOR_FLUSH_COUNT,
+    CONF_ACCUMULATOR_FLUSH_INTERVAL,
     CONF_ATTRIBUTES,
+    CONF_COLLECTION,
+    CONF_COLLECTION_PLATFORM,
+    CONF_DEADBAND,
+    CONF_DEADBAND_PERCENT,
+    CONF_ENTITY_PLATFORM,
     CONF_EXCLUDE_FROM_RECORDER,
     CONF_FORCE_UPDATE,
+    CONF_HISTORY_SIZE,
+    CONF_PERFORMANCE_SENSORS,
     CONF_RESTORE,
+    CONF_STATISTICS,
+    CONF_STATISTICS_EMA_ALPHA,
+    CONF_STATISTICS_WINDOW,
     CONF_UPDATED,
     CONF_VALUE,
     CONF_VALUE_TYPE,
     CONF_VARIABLE_ID,
     CONF_YAML_VARIABLE,
+    DEFAULT_ACCUMULATOR_FLUSH_INTERVAL,
     DEFAULT_EXCLUDE_FROM_RECORDER,
     DEFAULT_FORCE_UPDATE,
     DEFAULT_ICON,
+    DEFAULT_PERFORMANCE_SENSORS,
     DEFAULT_REPLACE_ATTRIBUTES,
     DEFAULT_RESTORE,
+    DEFAULT_STATISTICS_EMA_ALPHA,
+    DEFAULT_STATISTICS_WINDOW,
     DOMAIN,
     SERVICE_DECREMENT_SENSOR,
+    SERVICE_GET_HISTORY,
+    SERVICE_GET_STATISTICS,
     SERVICE_INCREMENT_SENSOR,
+    SERVICE_RESET_STATISTICS,
 )
-from .helpers import merge_attribute_dict, value_to_type
+from .entity import VariableEntity, async_restore_variables, track_update
+from .helpers import AttributeTree, get_value_converter, to_attribute_tree
+from .history import ValueHistory
+from .patch import ATTRIBUTE_PATCH_SCHEMA
+from .performance import async_create_performance_sensors
+from .startup import PHASE_ENTITY_INIT, async_get_startup_timer
+from .statistics import RollingStatistics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -73,6 +118,13 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 
 SERVICE_UPDATE_VARIABLE = "update_" + PLATFORM
 
+UPDATE_VARIABLE_SCHEMA = {
+    vol.Optional(ATTR_VALUE): cv.match_all,
+    vol.Optional(ATTR_ATTRIBUTES): dict,
+    vol.Optional(ATTR_REPLACE_ATTRIBUTES, default=DEFAULT_REPLACE_ATTRIBUTES): cv.boolean,
+    vol.Optional(ATTR_PATCH): ATTRIBUTE_PATCH_SCHEMA,
+}
+
 VARIABLE_ATTR_SETTINGS = {
     ATTR_FRIENDLY_NAME: "_attr_name",
     ATTR_ICON: "_attr_icon",
@@ -94,11 +146,7 @@ async def async_setup_entry(
 
     platform.async_register_entity_service(
         SERVICE_UPDATE_VARIABLE,
-        {
-            vol.Optional(ATTR_VALUE): cv.match_all,
-            vol.Optional(ATTR_ATTRIBUTES): dict,
-            vol.Optional(ATTR_REPLACE_ATTRIBUTES, default=DEFAULT_REPLACE_ATTRIBUTES): cv.boolean,
-        },
+        UPDATE_VARIABLE_SCHEMA,
         "async_update_variable",
     )
 
@@ -118,23 +166,58 @@ async def async_setup_entry(
         "async_decrement_variable",
     )
 
+    platform.async_register_entity_service(
+        SERVICE_GET_HISTORY,
+        {
+            vol.Optional(ATTR_MAX_POINTS): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        },
+        "async_get_history",
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    platform.async_register_entity_service(
+        SERVICE_GET_STATISTICS,
+        {},
+        "async_get_statistics",
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    platform.async_register_entity_service(
+        SERVICE_RESET_STATISTICS,
+        {},
+        "async_reset_statistics",
+    )
+
+    if config_entry.data.get(CONF_ENTITY_PLATFORM) == CONF_COLLECTION:
+        collection: VariableCollection = hass.data[DOMAIN][config_entry.entry_id]
+        if config_entry.data[CONF_COLLECTION_PLATFORM] == PLATFORM:
+            collection.async_setup_platform(async_add_entities, _create_variable)
+        collection.async_setup_performance_sensors(async_add_entities)
+        return None
+
     config = hass.data.get(DOMAIN, {}).get(config_entry.entry_id, {})
     unique_id = config_entry.entry_id
 
-    if config.get(CONF_EXCLUDE_FROM_RECORDER, DEFAULT_EXCLUDE_FROM_RECORDER):
-        _LOGGER.debug(
-            f"({config.get(CONF_NAME, config.get(CONF_VARIABLE_ID, None))}) Excluding from Recorder"
-        )
-        async_add_entities([VariableNoRecorder(hass, config, config_entry, unique_id)])
-    else:
-        async_add_entities([Variable(hass, config, config_entry, unique_id)])
+    entities: list[SensorEntity] = []
+    # Variables of the other platforms forward here only for their performance sensors.
+    if config.get(CONF_ENTITY_PLATFORM) == PLATFORM:
+        with async_get_startup_timer(hass).time(PHASE_ENTITY_INIT):
+            variables = [_create_variable(hass, config, config_entry, unique_id)]
+        async_restore_variables(hass, PLATFORM, variables)
+        entities.extend(variables)
+    if config.get(CONF_PERFORMANCE_SENSORS, DEFAULT_PERFORMANCE_SENSORS):
+        entities.extend(async_create_performance_sensors(hass, config, unique_id))
+    async_add_entities(entities)
 
     return None
 
 
-class Variable(RestoreSensor):
+class Variable(VariableEntity, RestoreSensor):
     """Representation of a Sensor Variable."""
 
+    update_variable_schema = vol.Schema(UPDATE_VARIABLE_SCHEMA)
+    _variable_attr_settings = VARIABLE_ATTR_SETTINGS
+
     def __init__(
         self,
         hass,
@@ -167,6 +250,29 @@ class Variable(RestoreSensor):
         self._yaml_variable = config.get(CONF_YAML_VARIABLE)
         self._exclude_from_recorder = config.get(CONF_EXCLUDE_FROM_RECORDER)
         self._value_type = config.get(CONF_VALUE_TYPE)
+        self._convert_value = get_value_converter(self._value_type)
+        self._deadband = float(config.get(CONF_DEADBAND) or 0)
+        self._deadband_percent = float(config.get(CONF_DEADBAND_PERCENT) or 0)
+        self._deadband_reference = None
+        self._deadband_suppressed = 0
+        self._accumulator = config.get(CONF_ACCUMULATOR, False)
+        self._accumulator_flush_interval = float(
+            config.get(CONF_ACCUMULATOR_FLUSH_INTERVAL, DEFAULT_ACCUMULATOR_FLUSH_INTERVAL) or 0
+        )
+        self._accumulator_flush_count = int(config.get(CONF_ACCUMULATOR_FLUSH_COUNT) or 0)
+        self._accumulated: Decimal | None = None
+        self._accumulated_native = None
+        self._accumulated_pending = 0
+        self._cancel_accumulator_flush: CALLBACK_TYPE | None = None
+        self._history: ValueHistory | None = None
+        if (history_size := int(config.get(CONF_HISTORY_SIZE) or 0)) > 0:
+            self._history = ValueHistory(history_size, numeric=self._value_type == "number")
+        self._statistics: RollingStatistics | None = None
+        if config.get(CONF_STATISTICS) and self._value_type == "number":
+            self._statistics = RollingStatistics(
+                float(config.get(CONF_STATISTICS_WINDOW) or DEFAULT_STATISTICS_WINDOW),
+                float(config.get(CONF_STATISTICS_EMA_ALPHA) or DEFAULT_STATISTICS_EMA_ALPHA),
+            )
         self._attr_device_class = config.get(CONF_DEVICE_CLASS)
         self._attr_native_unit_of_measurement = config.get(CONF_UNIT_OF_MEASUREMENT)
         self._attr_suggested_unit_of_measurement = None
@@ -179,21 +285,15 @@ class Variable(RestoreSensor):
             and config.get(CONF_ATTRIBUTES)
             and isinstance(config.get(CONF_ATTRIBUTES), MutableMapping)
         ):
-            self._attr_extra_state_attributes = cast(
-                dict, self._update_attr_settings(config.get(CONF_ATTRIBUTES))
+            self._attr_extra_state_attributes = to_attribute_tree(
+                self._update_attr_settings(config.get(CONF_ATTRIBUTES))
             )
         else:
-            self._attr_extra_state_attributes = cast(dict, {})
-        if config.get(CONF_VALUE) is None or (
-            isinstance(config.get(CONF_VALUE), str)
-            and config.get(CONF_VALUE).lower() in ["", "none", "unknown", "unavailable"]
-        ):
+            self._attr_extra_state_attributes = AttributeTree()
+        try:
+            self._attr_native_value = self._convert_value(config.get(CONF_VALUE))
+        except ValueError:
             self._attr_native_value = None
-        else:
-            try:
-                self._attr_native_value = value_to_type(config.get(CONF_VALUE), self._value_type)
-            except ValueError:
-                self._attr_native_value = None
         if config.get(CONF_DEVICE_CLASS) in UNIT_CONVERTERS:
             self._attr_suggested_unit_of_measurement = config.get(CONF_UNIT_OF_MEASUREMENT)
 
@@ -202,125 +302,113 @@ class Variable(RestoreSensor):
     async def async_added_to_hass(self):
         """Run when entity about to be added."""
         await super().async_added_to_hass()
-        if self._restore is True:
-            _LOGGER.info(f"({self._attr_name}) Restoring after Reboot")
-            sensor = await self.async_get_last_sensor_data()
-            if sensor and hasattr(sensor, "native_value"):
-                # _LOGGER.debug(f"({self._attr_name}) Restored last sensor data: {sensor.as_dict()}")
-                if sensor.native_value is None or (
-                    isinstance(sensor.native_value, str)
-                    and sensor.native_value.lower()
-                    in [
-                        "",
-                        "none",
-                        "unknown",
-                        "unavailable",
-                    ]
-                ):
-                    self._attr_native_value = None
-                else:
-                    try:
-                        self._attr_native_value = value_to_type(
-                            sensor.native_value, self._value_type
-                        )
-                    except ValueError:
-                        self._attr_native_value = None
-
-            state = await self.async_get_last_state()
-            if state:
-                # _LOGGER.debug(f"({self._attr_name}) Restored last state: {state.as_dict()}")
-                if (
-                    hasattr(state, CONF_ATTRIBUTES)
-                    and state.attributes
-                    and isinstance(state.attributes, MutableMapping)
-                ):
-                    # Don't restore Home Assistant's computed friendly_name into
-                    # _attr_name. When linked to a device, friendly_name may already
-                    # be prefixed with the device name, which would otherwise lead to
-                    # name duplication across reboots.
-                    restored_attributes = dict(state.attributes)
-                    restored_attributes.pop(ATTR_FRIENDLY_NAME, None)
-                    self._attr_extra_state_attributes = cast(
-                        dict,
-                        self._update_attr_settings(
-                            restored_attributes,
-                            just_pop=self._config.get(CONF_UPDATED, False),
-                        ),
-                    )
-                    if self._config.get(CONF_UPDATED, True):
-                        self._attr_extra_state_attributes.pop(CONF_UNIT_OF_MEASUREMENT, None)
-                    if self._attr_device_info:
-                        device_registry = dr.async_get(self._hass)
-                        device = device_registry.async_get_device(
-                            identifiers=self._attr_device_info.get(
-                                "identifiers",
-                            )
-                        )
-                        # _LOGGER.debug(f"({self._attr_name}) [restored] device: {device}")
-                        # Ensure static checker and runtime know _attr_name is a string.
-                        # Avoid `assert` (flagged by bandit) and coerce to empty
-                        # string if it's unexpectedly None or not a str.
-                        if not isinstance(self._attr_name, str):
-                            self._attr_name = ""
-                        # Safely access device name(s) to satisfy type checks
-                        device_name = getattr(device, "name", None)
-                        device_name_by_user = getattr(device, "name_by_user", None)
-                        if (
-                            isinstance(device_name, str)
-                            and isinstance(self._attr_name, str)
-                            and self._attr_name.lower().strip() != device_name.lower().strip()
-                            and self._attr_name.lower().startswith(device_name.lower())
-                        ):
-                            old_name = self._attr_name
-                            self._attr_name = self._attr_name.replace(device_name, "", 1).strip()
-                            _LOGGER.debug(f"({self._attr_name}) [restored] Truncated: {old_name}")
-                        elif (
-                            isinstance(device_name_by_user, str)
-                            and isinstance(self._attr_name, str)
-                            and self._attr_name.lower().strip()
-                            != device_name_by_user.lower().strip()
-                            and self._attr_name.lower().startswith(device_name_by_user.lower())
-                        ):
-                            old_name = self._attr_name
-                            self._attr_name = self._attr_name.replace(
-                                device_name_by_user, "", 1
-                            ).strip()
-                            _LOGGER.debug(f"({self._attr_name}) [restored] Truncated: {old_name}")
+        self.async_on_remove(self._async_stop_accumulator)
+        if self._config.get(CONF_UPDATED, True):
+            self._config.update({CONF_UPDATED: False})
+            self._async_save_config()
             _LOGGER.debug(
-                f"({self._attr_name}) [restored] _attr_native_value: {self._attr_native_value}"
+                f"({self._attr_name}) Updated config_updated: "
+                + f"{self._config_entry.data.get(CONF_UPDATED)}"
             )
-            _LOGGER.debug(
-                f"({self._attr_name}) [restored] attributes: {getattr(self, '_attr_extra_state_attributes', {})}"
+
+    @callback
+    def _async_expire(self, reset_to_initial: bool) -> None:
+        """Reset to the initial value or unknown when the variable expires."""
+        self._attr_native_value = None
+        if reset_to_initial:
+            try:
+                self._attr_native_value = self._convert_value(self._config.get(CONF_VALUE))
+            except ValueError:
+                pass
+
+    @property
+    def _stored_value(self) -> Any:
+        """Return the native value to save in the value store."""
+        return self._attr_native_value
+
+    def _restored_value(self, stored: StoredState) -> Any:
+        """Return the native value saved in the restore cache."""
+        if (
+            stored.extra_data is None
+            or (sensor := SensorExtraStoredData.from_dict(stored.extra_data.as_dict())) is None
+        ):
+            return UNDEFINED
+        return sensor.native_value
+
+    @callback
+    def _async_restore(self, value: Any, attributes: Mapping[str, Any] | None) -> None:
+        """Apply the restored native value and attributes before the first write."""
+        _LOGGER.debug("(%s) Restoring after Reboot", self._attr_name)
+        if value is not UNDEFINED:
+            try:
+                self._attr_native_value = self._convert_value(value)
+            except ValueError:
+                self._attr_native_value = None
+
+        if attributes and isinstance(attributes, Mapping):
+            # Don't restore Home Assistant's computed friendly_name into
+            # _attr_name. When linked to a device, friendly_name may already
+            # be prefixed with the device name, which would otherwise lead to
+            # name duplication across reboots.
+            restored_attributes = dict(attributes)
+            restored_attributes.pop(ATTR_FRIENDLY_NAME, None)
+            restored_attributes = self._update_attr_settings(
+                restored_attributes,
+                just_pop=self._config.get(CONF_UPDATED, False),
             )
-            # If there were no attributes restored from state, apply attributes from config
-            if (
-                not getattr(self, "_attr_extra_state_attributes", None)
-                or self._attr_extra_state_attributes == {}
-            ) and self._config.get(CONF_ATTRIBUTES):
-                self._attr_extra_state_attributes = cast(
-                    dict, self._update_attr_settings(self._config.get(CONF_ATTRIBUTES))
-                )
-                _LOGGER.debug(
-                    f"({self._attr_name}) [restored] applied config attributes: {getattr(self, '_attr_extra_state_attributes', {})}"
-                )
-                try:
-                    self.async_write_ha_state()
-                except Exception as err:
-                    _LOGGER.debug(
-                        "(%s) async_write_ha_state failed during restore: %s",
-                        self._attr_name,
-                        err,
+            if self._config.get(CONF_UPDATED, True):
+                restored_attributes.pop(CONF_UNIT_OF_MEASUREMENT, None)
+            self._attr_extra_state_attributes = to_attribute_tree(restored_attributes)
+            if self._attr_device_info:
+                device_registry = dr.async_get(self._hass)
+                device = device_registry.async_get_device(
+                    identifiers=self._attr_device_info.get(
+                        "identifiers",
                     )
-        if self._config.get(CONF_UPDATED, True):
-            self._config.update({CONF_UPDATED: False})
-            self._hass.config_entries.async_update_entry(
-                self._config_entry,
-                data=self._config,
-                options={},
+                )
+                # _LOGGER.debug(f"({self._attr_name}) [restored] device: {device}")
+                # Ensure static checker and runtime know _attr_name is a string.
+                # Avoid `assert` (flagged by bandit) and coerce to empty
+                # string if it's unexpectedly None or not a str.
+                if not isinstance(self._attr_name, str):
+                    self._attr_name = ""
+                # Safely access device name(s) to satisfy type checks
+                device_name = getattr(device, "name", None)
+                device_name_by_user = getattr(device, "name_by_user", None)
+                if (
+                    isinstance(device_name, str)
+                    and isinstance(self._attr_name, str)
+                    and self._attr_name.lower().strip() != device_name.lower().strip()
+                    and self._attr_name.lower().startswith(device_name.lower())
+                ):
+                    old_name = self._attr_name
+                    self._attr_name = self._attr_name.replace(device_name, "", 1).strip()
+                    _LOGGER.debug(f"({self._attr_name}) [restored] Truncated: {old_name}")
+                elif (
+                    isinstance(device_name_by_user, str)
+                    and isinstance(self._attr_name, str)
+                    and self._attr_name.lower().strip() != device_name_by_user.lower().strip()
+                    and self._attr_name.lower().startswith(device_name_by_user.lower())
+                ):
+                    old_name = self._attr_name
+                    self._attr_name = self._attr_name.replace(device_name_by_user, "", 1).strip()
+                    _LOGGER.debug(f"({self._attr_name}) [restored] Truncated: {old_name}")
+        _LOGGER.debug(
+            "(%s) [restored] _attr_native_value: %s", self._attr_name, self._attr_native_value
+        )
+        _LOGGER.debug(
+            "(%s) [restored] attributes: %s", self._attr_name, self._attr_extra_state_attributes
+        )
+        # If there were no attributes restored from state, apply attributes from config
+        if (
+            not getattr(self, "_attr_extra_state_attributes", None)
+            or self._attr_extra_state_attributes == {}
+        ) and self._config.get(CONF_ATTRIBUTES):
+            self._attr_extra_state_attributes = to_attribute_tree(
+                self._update_attr_settings(self._config.get(CONF_ATTRIBUTES))
             )
             _LOGGER.debug(
-                f"({self._attr_name}) Updated config_updated: "
-                + f"{self._config_entry.data.get(CONF_UPDATED)}"
+                f"({self._attr_name}) [restored] applied config attributes: {getattr(self, '_attr_extra_state_attributes', {})}"
             )
 
     @property
@@ -333,11 +421,55 @@ class Variable(RestoreSensor):
         """Force update status of the entity."""
         return self._force_update
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write state, remember the value as the deadband reference and record it."""
+        self._deadband_reference = self._attr_native_value
+        if self._history is not None and (
+            not self._history
+            or self._force_update
+            or self._attr_native_value != self._history.last_value
+        ):
+            self._history.append(dt_util.utcnow().timestamp(), self._attr_native_value)
+        # Any write publishes the accumulated value, so nothing is left to flush.
+        self._accumulated_pending = 0
+        self._async_cancel_accumulator_flush()
+        super().async_write_ha_state()
+
+    @callback
+    def async_get_diagnostics(self) -> dict[str, Any]:
+        """Return runtime details, including deadband-suppressed updates."""
+        return {
+            **super().async_get_diagnostics(),
+            "deadband_suppressed": self._deadband_suppressed,
+            "accumulator_pending": self._accumulated_pending,
+            "history": len(self._history) if self._history is not None else None,
+        }
+
+    def _is_within_deadband(self, value) -> bool:
+        """Return True if a numeric value is too close to the last written value to publish.
+
+        A value is within the deadband when its change is smaller than the
+        absolute deadband or smaller than the percentage deadband of the last
+        written value.
+        """
+        if self._force_update or self._value_type != "number":
+            return False
+        if not (self._deadband or self._deadband_percent):
+            return False
+        reference = self._deadband_reference
+        if not _is_number(value) or not _is_number(reference):
+            return False
+        change = abs(value - reference)
+        if change < self._deadband:
+            return True
+        return change < abs(reference) * self._deadband_percent / 100
+
     def _update_attr_settings(self, new_attributes=None, just_pop=False):
         if new_attributes is not None:
             _LOGGER.debug(f"({self._attr_name}) [update_attr_settings] Updating Special Attributes")
             if isinstance(new_attributes, MutableMapping):
-                attributes = copy.deepcopy(new_attributes)
+                attributes = dict(new_attributes)
                 for attrib, setting in VARIABLE_ATTR_SETTINGS.items():
                     if attrib in attributes.keys():
                         if just_pop:
@@ -346,7 +478,7 @@ class Variable(RestoreSensor):
                         else:
                             # _LOGGER.debug(f"({self._attr_name}) [update_attr_settings] attrib: {attrib} / setting: {setting} / value: {attributes.get(attrib)}")
                             setattr(self, setting, attributes.pop(attrib, None))
-                return copy.deepcopy(attributes)
+                return attributes
             else:
                 _LOGGER.error(
                     f"({self._attr_name}) AttributeError: Attributes must be a dictionary: {new_attributes}"
@@ -355,24 +487,23 @@ class Variable(RestoreSensor):
         else:
             return None
 
+    @track_update
     async def async_update_variable(self, **kwargs) -> None:
         """Update Sensor Variable."""
 
-        _LOGGER.debug(f"({self._attr_name}) [async_update_variable] kwargs: {kwargs}")
-
-        updated_attributes = None
+        _LOGGER.debug("(%s) [async_update_variable] kwargs: %s", self._attr_name, kwargs)
 
         replace_attributes = kwargs.get(ATTR_REPLACE_ATTRIBUTES, False)
         _LOGGER.debug(
-            f"({self._attr_name}) [async_update_variable] Replace Attributes: {replace_attributes}"
+            "(%s) [async_update_variable] Replace Attributes: %s",
+            self._attr_name,
+            replace_attributes,
         )
 
-        if (
-            not replace_attributes
-            and hasattr(self, "_attr_extra_state_attributes")
-            and self._attr_extra_state_attributes is not None
-        ):
-            updated_attributes = copy.deepcopy(self._attr_extra_state_attributes)
+        current_attributes = getattr(self, "_attr_extra_state_attributes", None)
+        updated_attributes = AttributeTree()
+        if not replace_attributes:
+            updated_attributes = to_attribute_tree(current_attributes)
 
         attributes = kwargs.get(ATTR_ATTRIBUTES)
         if attributes is not None:
@@ -384,14 +515,13 @@ class Variable(RestoreSensor):
                     attributes = None
             if isinstance(attributes, MutableMapping):
                 _LOGGER.debug(
-                    f"({self._attr_name}) [async_update_variable] New Attributes: {attributes}"
+                    "(%s) [async_update_variable] New Attributes: %s", self._attr_name, attributes
                 )
                 extra_attributes = self._update_attr_settings(attributes)
                 if extra_attributes is not None:
                     try:
-                        updated_attributes = merge_attribute_dict(
-                            updated_attributes, extra_attributes
-                        )
+                        with self._time_attribute_copy():
+                            updated_attributes = updated_attributes.merge(extra_attributes)
                     except ValueError as err:
                         _LOGGER.error(
                             "(%s) AttributeError: %s",
@@ -403,9 +533,13 @@ class Variable(RestoreSensor):
                     f"({self._attr_name}) AttributeError: Attributes must be a dictionary: {attributes}"
                 )
 
+        if (patch := kwargs.get(ATTR_PATCH)) is not None:
+            with self._time_attribute_copy():
+                updated_attributes = updated_attributes.patch(patch)
+
         if ATTR_VALUE in kwargs:
             try:
-                newval = value_to_type(kwargs.get(ATTR_VALUE), self._value_type)
+                newval = self._convert_value(kwargs.get(ATTR_VALUE))
             except ValueError:
                 ERROR = f"The value entered is not compatible with the selected device_class: {self._attr_device_class}. Expected: {self._value_type}. Value: {kwargs.get(ATTR_VALUE)}"
                 raise ValueError(ERROR)
@@ -413,14 +547,24 @@ class Variable(RestoreSensor):
             else:
                 _LOGGER.debug(f"({self._attr_name}) [async_update_variable] New Value: {newval}")
                 self._attr_native_value = newval
+                self._async_record_statistics(newval)
+                if updated_attributes is current_attributes and self._is_within_deadband(newval):
+                    # Keep the value but skip the state write.
+                    self._deadband_suppressed += 1
+                    self._async_save_value()
+                    _LOGGER.debug(
+                        "(%s) [async_update_variable] Within deadband, not writing: %s",
+                        self._attr_name,
+                        newval,
+                    )
+                    return
 
-        if updated_attributes is not None:
-            self._attr_extra_state_attributes = cast(dict, copy.deepcopy(updated_attributes))
-            _LOGGER.debug(
-                f"({self._attr_name}) [async_update_variable] Final Attributes: {updated_attributes}"
-            )
-        else:
-            self._attr_extra_state_attributes = cast(dict, {})
+        self._attr_extra_state_attributes = updated_attributes
+        _LOGGER.debug(
+            "(%s) [async_update_variable] Final Attributes: %s",
+            self._attr_name,
+            updated_attributes,
+        )
 
         _LOGGER.debug(
             f"({self._attr_name}) [updated] _attr_native_value: {self._attr_native_value}"
@@ -430,23 +574,67 @@ class Variable(RestoreSensor):
         )
         self.async_write_ha_state()
 
+    async def async_get_history(self, **kwargs) -> ServiceResponse:
+        """Return the recent values of the Sensor Variable, optionally downsampled."""
+        if self._history is None:
+            raise ValueError(f"History is not enabled for {self.entity_id}")
+        max_points = kwargs.get(ATTR_MAX_POINTS)
+        points = (
+            self._history.downsample(max_points) if max_points is not None else list(self._history)
+        )
+        return {
+            "size": self._history.size,
+            "history": [
+                {"timestamp": dt_util.utc_from_timestamp(timestamp).isoformat(), "value": value}
+                for timestamp, value in points
+            ],
+        }
+
+    async def async_get_statistics(self, **kwargs) -> ServiceResponse:
+        """Return the rolling statistics of the Sensor Variable."""
+        if self._statistics is None:
+            raise ValueError(f"Statistics are not enabled for {self.entity_id}")
+        return self._statistics.as_dict(dt_util.utcnow().timestamp())
+
+    async def async_reset_statistics(self, **kwargs) -> None:
+        """Reset the rolling statistics of the Sensor Variable."""
+        if self._statistics is None:
+            raise ValueError(f"Statistics are not enabled for {self.entity_id}")
+        self._statistics.reset()
+
+    @callback
+    def _async_record_statistics(self, value) -> None:
+        if self._statistics is not None and _is_number(value):
+            self._statistics.add(dt_util.utcnow().timestamp(), value)
+
+    @track_update
     async def async_increment_variable(self, **kwargs) -> None:
         """Increment Sensor Variable value."""
+        self._async_change_value_by(kwargs.get(ATTR_VALUE_DELTA, 1), "increment")
 
-        value_delta = kwargs.get(ATTR_VALUE_DELTA, 1)
-        _LOGGER.debug(
-            f"({self._attr_name}) [async_increment_variable] Incrementing by: {value_delta}"
-        )
+    @track_update
+    async def async_decrement_variable(self, **kwargs) -> None:
+        """Decrement Sensor Variable value."""
+        self._async_change_value_by(-kwargs.get(ATTR_VALUE_DELTA, 1), "decrement")
+
+    @callback
+    def _async_change_value_by(self, value_delta, action: str) -> None:
+        """Add a delta to the value for the increment and decrement services."""
+        _LOGGER.debug("(%s) [async_%s_variable] Delta: %s", self._attr_name, action, value_delta)
 
-        # Only allow increment for numeric types
+        # Only allow increment/decrement for numeric types
         if self._value_type not in ["number", None]:
             _LOGGER.error(
-                f"({self._attr_name}) Cannot increment non-numeric variable. Current type: {self._value_type}"
+                f"({self._attr_name}) Cannot {action} non-numeric variable. Current type: {self._value_type}"
             )
             raise ValueError(
-                f"Cannot increment non-numeric variable. Current type: {self._value_type}"
+                f"Cannot {action} non-numeric variable. Current type: {self._value_type}"
             )
 
+        if self._accumulator:
+            self._async_accumulate(value_delta, action)
+            return
+
         current_value = self._attr_native_value
         if current_value is None:
             current_value = 0
@@ -464,67 +652,76 @@ class Variable(RestoreSensor):
 
             new_value = current_value + value_delta
 
-            # Convert back to the appropriate type
-            if self._value_type == "number" or self._value_type is None:
-                # Keep as is if it's int or float
-                if isinstance(new_value, float) and new_value.is_integer():
-                    new_value = int(new_value)
+            # Keep as is if it's int or float
+            if isinstance(new_value, float) and new_value.is_integer():
+                new_value = int(new_value)
 
-            _LOGGER.debug(f"({self._attr_name}) [async_increment_variable] New Value: {new_value}")
+            _LOGGER.debug(
+                "(%s) [async_%s_variable] New Value: %s", self._attr_name, action, new_value
+            )
             self._attr_native_value = new_value
+            self._async_record_statistics(new_value)
             self.async_write_ha_state()
 
         except ValueError as err:
-            _LOGGER.error(f"({self._attr_name}) Increment error: {err}")
+            _LOGGER.error(f"({self._attr_name}) {action.capitalize()} error: {err}")
             raise
 
-    async def async_decrement_variable(self, **kwargs) -> None:
-        """Decrement Sensor Variable value."""
-
-        value_delta = kwargs.get(ATTR_VALUE_DELTA, 1)
+    @callback
+    def _async_accumulate(self, value_delta, action: str) -> None:
+        """Sum a delta exactly and publish it on the configured flush cadence."""
+        if self._accumulated is None or self._attr_native_value is not self._accumulated_native:
+            # Start from the current value, which may have been set by an update.
+            try:
+                self._accumulated = _to_decimal(self._attr_native_value)
+            except (ArithmeticError, ValueError) as err:
+                _LOGGER.error(f"({self._attr_name}) {action.capitalize()} error: {err}")
+                raise ValueError(
+                    f"Cannot convert current value to number: {self._attr_native_value}"
+                ) from err
+        self._accumulated += _to_decimal(value_delta)
+        self._accumulated_native = self._attr_native_value = _from_decimal(self._accumulated)
+        self._async_record_statistics(self._attr_native_value)
+        self._accumulated_pending += 1
+
+        if self._accumulator_flush_count and (
+            self._accumulated_pending >= self._accumulator_flush_count
+        ):
+            self._async_flush_accumulator()
+        elif self._cancel_accumulator_flush is None:
+            if self._accumulator_flush_interval > 0:
+                self._cancel_accumulator_flush = async_call_later(
+                    self.hass, self._accumulator_flush_interval, self._async_flush_accumulator
+                )
+            elif not self._accumulator_flush_count:
+                self._async_flush_accumulator()
+        if self._accumulated_pending:
+            # Not published yet, but a restart must not lose it.
+            self._async_save_value()
+
+    @callback
+    def _async_flush_accumulator(self, _now: datetime | None = None) -> None:
+        """Publish the accumulated value."""
         _LOGGER.debug(
-            f"({self._attr_name}) [async_decrement_variable] Decrementing by: {value_delta}"
+            "(%s) [accumulator] Publishing %s after %s changes",
+            self._attr_name,
+            self._attr_native_value,
+            self._accumulated_pending,
         )
+        self.async_write_ha_state()
 
-        # Only allow decrement for numeric types
-        if self._value_type not in ["number", None]:
-            _LOGGER.error(
-                f"({self._attr_name}) Cannot decrement non-numeric variable. Current type: {self._value_type}"
-            )
-            raise ValueError(
-                f"Cannot decrement non-numeric variable. Current type: {self._value_type}"
-            )
-
-        current_value = self._attr_native_value
-        if current_value is None:
-            current_value = 0
-
-        try:
-            # Convert current value to numeric if it's a string
-            if isinstance(current_value, str):
-                try:
-                    current_value = float(current_value)
-                except ValueError, TypeError:
-                    _LOGGER.error(
-                        f"({self._attr_name}) Cannot convert current value to number: {current_value}"
-                    )
-                    raise ValueError(f"Cannot convert current value to number: {current_value}")
-
-            new_value = current_value - value_delta
-
-            # Convert back to the appropriate type
-            if self._value_type == "number" or self._value_type is None:
-                # Keep as is if it's int or float
-                if isinstance(new_value, float) and new_value.is_integer():
-                    new_value = int(new_value)
+    @callback
+    def _async_stop_accumulator(self) -> None:
+        """Flush increments still waiting for the flush timer, then stop it."""
+        if self._accumulated_pending:
+            self._async_flush_accumulator()
+        self._async_cancel_accumulator_flush()
 
-            _LOGGER.debug(f"({self._attr_name}) [async_decrement_variable] New Value: {new_value}")
-            self._attr_native_value = new_value
-            self.async_write_ha_state()
-
-        except ValueError as err:
-            _LOGGER.error(f"({self._attr_name}) Decrement error: {err}")
-            raise
+    @callback
+    def _async_cancel_accumulator_flush(self) -> None:
+        if self._cancel_accumulator_flush is not None:
+            self._cancel_accumulator_flush()
+            self._cancel_accumulator_flush = None
 
 
 class VariableNoRecorder(Variable):
@@ -538,3 +735,32 @@ class VariableNoRecorder(Variable):
         await _async_exclude_entity_from_recorder(self.hass, self.entity_id)
 
         _LOGGER.debug(f"({self._attr_name}) Excluded from recorder: {self.entity_id}")
+
+
+def _to_decimal(value) -> Decimal:
+    if value is None:
+        return Decimal(0)
+    if isinstance(value, float):
+        # Use the shortest repr so 0.1 is 0.1 and not its binary expansion.
+        return Decimal(repr(value))
+    return Decimal(value if isinstance(value, (int, Decimal)) else str(value).strip())
+
+
+def _from_decimal(value: Decimal) -> int | float:
+    if value == value.to_integral_value():
+        return int(value)
+    return float(value)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _create_variable(hass, config, config_entry, unique_id) -> Variable:
+    """Create a Sensor Variable, excluded from the recorder if configured."""
+    if config.get(CONF_EXCLUDE_FROM_RECORDER, DEFAULT_EXCLUDE_FROM_RECORDER):
+        _LOGGER.debug(
+            f"({config.get(CONF_NAME, config.get(CONF_VARIABLE_ID, None))}) Excluding from Recorder"
+        )
+        return VariableNoRecorder(hass, config, config_entry, unique_id)
+    return Variable(hass, config, config_entry, unique_id)
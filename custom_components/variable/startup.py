@@ -0,0 +1,103 @@
+"""Wall time spent in each phase of the Variable integration's startup."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_STARTUP_TIMER
+
+_LOGGER = logging.getLogger(__name__)
+
+PHASE_SETUP = "setup"
+PHASE_SETUP_ENTRY = "setup_entry"
+PHASE_FORWARD = "forward"
+PHASE_ENTITY_INIT = "entity_init"
+PHASE_RESTORE = "restore"
+PHASE_FIRST_WRITE = "first_write"
+STARTUP_PHASES = (
+    PHASE_SETUP,
+    PHASE_SETUP_ENTRY,
+    PHASE_FORWARD,
+    PHASE_ENTITY_INIT,
+    PHASE_RESTORE,
+    PHASE_FIRST_WRITE,
+)
+
+
+class StartupTimer:
+    """Number of runs and total wall time of each startup phase.
+
+    The phases nest: setup_entry includes forwarding the entry to its
+    platform, which includes creating and restoring its entities. Config
+    entries are set up concurrently, so the totals of the awaiting phases
+    overlap and can add up to more than the time startup took. Timing stops
+    once the totals are logged after Home Assistant has started.
+    """
+
+    __slots__ = ("_phases", "finished")
+
+    def __init__(self) -> None:
+        """Initialize with no time spent in any phase."""
+        self._phases: dict[str, list[Any]] = {phase: [0, 0.0] for phase in STARTUP_PHASES}
+        self.finished = False
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Add the wall time spent in the block to a phase."""
+        if self.finished:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    @callback
+    def record(self, phase: str, seconds: float) -> None:
+        """Add one run of a phase that took ``seconds``."""
+        if self.finished:
+            return
+        totals = self._phases[phase]
+        totals[0] += 1
+        totals[1] += seconds
+
+    @property
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return the runs and total seconds of each phase."""
+        return {
+            phase: {"count": count, "seconds": seconds}
+            for phase, (count, seconds) in self._phases.items()
+        }
+
+
+@callback
+def async_get_startup_timer(hass: HomeAssistant) -> StartupTimer:
+    """Return the integration's startup timer, creating it on first use."""
+    timer: StartupTimer | None = hass.data.get(DATA_STARTUP_TIMER)
+    if timer is None:
+        timer = hass.data[DATA_STARTUP_TIMER] = StartupTimer()
+    return timer
+
+
+@callback
+def async_log_startup_stats(hass: HomeAssistant) -> None:
+    """Log the time spent in each startup phase at INFO and stop timing."""
+    timer = async_get_startup_timer(hass)
+    timer.finished = True
+    for phase, stats in timer.stats.items():
+        if not stats["count"]:
+            continue
+        _LOGGER.info(
+            "[Startup] %s: %s runs in %.3fs (%.2fms each)",
+            phase,
+            stats["count"],
+            stats["seconds"],
+            stats["seconds"] * 1000 / stats["count"],
+        )
@@ -0,0 +1,113 @@
+"""Incremental statistics of numeric Sensor Variable values."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+
+class RollingStatistics:
+    """Count, min, max, mean, variance and EMA of a variable's values.
+
+    Every value is folded in with Welford's algorithm in O(1). Without a
+    window the statistics cover every value since the last reset. With one,
+    values older than ``window`` seconds are folded back out by the reverse
+    Welford step, and min and max come from monotonic queues, so each value
+    is added and expired once. The exponential moving average is not limited
+    to the window; older values only fade from it.
+    """
+
+    __slots__ = (
+        "_count",
+        "_ema",
+        "_ema_alpha",
+        "_m2",
+        "_max",
+        "_mean",
+        "_min",
+        "_samples",
+        "_window",
+    )
+
+    def __init__(self, window: float, ema_alpha: float) -> None:
+        """Initialize empty statistics.
+
+        Args:
+            window: Seconds of values to cover, or 0 for every value since reset.
+            ema_alpha: Weight of each new value in the exponential moving average.
+        """
+        self._window = window
+        self._ema_alpha = ema_alpha
+        self._samples: deque[tuple[float, float]] = deque()
+        # Candidates for the window's min and max, oldest first.
+        self._min: deque[tuple[float, float]] = deque()
+        self._max: deque[tuple[float, float]] = deque()
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._ema: float | None = None
+
+    def reset(self) -> None:
+        """Forget every value."""
+        self._samples.clear()
+        self._min.clear()
+        self._max.clear()
+        self._count = 0
+        self._mean = self._m2 = 0.0
+        self._ema = None
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Fold a value set at ``timestamp`` into the statistics."""
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+        self._ema = (
+            value if self._ema is None else self._ema + self._ema_alpha * (value - self._ema)
+        )
+        sample = (timestamp, value)
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append(sample)
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append(sample)
+        if self._window:
+            self._samples.append(sample)
+            self._expire(timestamp)
+        else:
+            # Without a window only the overall extremes, at the front, can matter.
+            while len(self._min) > 1:
+                self._min.pop()
+            while len(self._max) > 1:
+                self._max.pop()
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the statistics of the values still covered at ``now``."""
+        if self._window:
+            self._expire(now)
+        return {
+            "count": self._count,
+            "min": self._min[0][1] if self._count else None,
+            "max": self._max[0][1] if self._count else None,
+            "mean": self._mean if self._count else None,
+            "variance": self._m2 / (self._count - 1) if self._count > 1 else None,
+            "ema": self._ema,
+            "window": self._window,
+        }
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self._window
+        while self._samples and self._samples[0][0] <= cutoff:
+            _, value = self._samples.popleft()
+            self._count -= 1
+            if not self._count:
+                self._mean = self._m2 = 0.0
+                continue
+            delta = value - self._mean
+            self._mean -= delta / self._count
+            self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+        while self._min and self._min[0][0] <= cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] <= cutoff:
+            self._max.popleft()
@@ -0,0 +1,105 @@
+"""Write-behind storage of Variable values and attributes."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_STORE, DOMAIN, STORE_SAVE_DELAY
+
+if TYPE_CHECKING:
+    from .entity import VariableEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.values"
+STORAGE_VERSION = 1
+
+
+class VariableStore:
+    """Last value and attributes of every restorable variable, keyed by unique_id.
+
+    Entities mark themselves dirty on every state write they request, including
+    writes still coalesced or deferred, and on value changes that are not
+    written at all, like accumulated increments. Their records
+    are taken when the store is saved, at most ``STORE_SAVE_DELAY`` seconds after
+    the first change since the previous save and at shutdown, so any number of
+    updates between two saves costs one write.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty store."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY, atomic_writes=True
+        )
+        self._records: dict[str, dict[str, Any]] = {}
+        self._dirty: dict[str, VariableEntity] = {}
+        self._save_scheduled = False
+
+    def __len__(self) -> int:
+        """Return the number of stored variables."""
+        return len(self._records.keys() | self._dirty.keys())
+
+    async def async_load(self) -> None:
+        """Load every stored record in one read."""
+        self._records = await self._store.async_load() or {}
+        _LOGGER.debug("Loaded %s stored variables", len(self._records))
+
+    @callback
+    def async_get(self, unique_id: str) -> dict[str, Any] | None:
+        """Return the latest record of a variable."""
+        if (entity := self._dirty.pop(unique_id, None)) is not None:
+            self._records[unique_id] = entity.async_get_stored_record()
+        return self._records.get(unique_id)
+
+    @callback
+    def async_mark_dirty(self, entity: VariableEntity) -> None:
+        """Schedule the entity's current value to be saved with the next batch."""
+        if entity.unique_id is None:
+            return
+        self._dirty[entity.unique_id] = entity
+        self._async_schedule_save()
+
+    @callback
+    def async_remove(self, unique_id: str) -> None:
+        """Forget a variable that was removed."""
+        self._dirty.pop(unique_id, None)
+        if self._records.pop(unique_id, None) is not None:
+            self._async_schedule_save()
+
+    @callback
+    def async_update_record(self, unique_id: str, changes: dict[str, Any]) -> None:
+        """Apply changes replayed from the journal to a variable's record."""
+        self._records.setdefault(unique_id, {}).update(changes)
+
+    async def async_save_now(self) -> None:
+        """Save every record now instead of after the save delay."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        # Scheduling again before the pending save ran would push it back.
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._data_to_save, STORE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        self._save_scheduled = False
+        for unique_id, entity in self._dirty.items():
+            self._records[unique_id] = entity.async_get_stored_record()
+        _LOGGER.debug("Saving %s changed variables", len(self._dirty))
+        self._dirty.clear()
+        return self._records
+
+
+@callback
+def async_get_variable_store(hass: HomeAssistant) -> VariableStore:
+    """Return the integration's value store, creating it on first use."""
+    store: VariableStore | None = hass.data.get(DATA_STORE)
+    if store is None:
+        store = hass.data[DATA_STORE] = VariableStore(hass)
+    return store
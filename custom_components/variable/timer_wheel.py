@@ -0,0 +1,104 @@
+"""Hashed timer wheel shared by every expiring Variable."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from datetime import datetime
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_TIMER_WHEEL
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds covered by each slot, and slots in one turn of the wheel.
+WHEEL_RESOLUTION = 1.0
+WHEEL_SLOTS = 512
+
+
+class TimerWheel:
+    """Deadlines of any number of timers behind one event loop timer.
+
+    Each timer is hashed into the slot of the tick its deadline falls in, so
+    scheduling, rescheduling and cancelling are O(1). While timers are
+    pending, one ``async_call_later`` handle ticks the wheel every
+    ``WHEEL_RESOLUTION`` seconds and fires the due timers of the slots passed
+    since the previous tick. Timers more than one turn away stay in their slot
+    until a later turn reaches their deadline.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty wheel."""
+        self.hass = hass
+        self._slots: list[dict[Hashable, tuple[float, Callable[[], None]]]] = [
+            {} for _ in range(WHEEL_SLOTS)
+        ]
+        self._slot_of: dict[Hashable, int] = {}
+        # Last tick whose slot was processed.
+        self._tick = 0
+        self._cancel_tick: CALLBACK_TYPE | None = None
+
+    def __len__(self) -> int:
+        """Return the number of pending timers."""
+        return len(self._slot_of)
+
+    @callback
+    def async_schedule(self, key: Hashable, deadline: float, action: Callable[[], None]) -> None:
+        """Run ``action`` at the ``deadline`` timestamp, replacing any timer of ``key``."""
+        self._async_remove(key)
+        if self._cancel_tick is None:
+            self._tick = self._tick_of(dt_util.utcnow().timestamp())
+            self._cancel_tick = async_call_later(self.hass, WHEEL_RESOLUTION, self._async_on_tick)
+        # Deadlines already passed fire on the next tick.
+        slot = max(self._tick_of(deadline), self._tick + 1) % WHEEL_SLOTS
+        self._slots[slot][key] = (deadline, action)
+        self._slot_of[key] = slot
+
+    @callback
+    def async_cancel(self, key: Hashable) -> None:
+        """Cancel the timer of ``key``, if any."""
+        self._async_remove(key)
+        if not self._slot_of and self._cancel_tick is not None:
+            self._cancel_tick()
+            self._cancel_tick = None
+
+    @callback
+    def _async_remove(self, key: Hashable) -> None:
+        if (slot := self._slot_of.pop(key, None)) is not None:
+            del self._slots[slot][key]
+
+    @callback
+    def _async_on_tick(self, now: datetime) -> None:
+        self._cancel_tick = None
+        timestamp = now.timestamp()
+        current = self._tick_of(timestamp)
+        # After a long stall, one pass over every slot covers all of them.
+        for tick in range(max(self._tick + 1, current - WHEEL_SLOTS + 1), current + 1):
+            slot = self._slots[tick % WHEEL_SLOTS]
+            due = [key for key, (deadline, _) in slot.items() if deadline <= timestamp]
+            for key in due:
+                _, action = slot.pop(key)
+                del self._slot_of[key]
+                try:
+                    action()
+                except Exception:
+                    _LOGGER.exception("Error running expiry timer for %s", key)
+        self._tick = max(self._tick, current)
+        if self._slot_of:
+            self._cancel_tick = async_call_later(self.hass, WHEEL_RESOLUTION, self._async_on_tick)
+
+    @staticmethod
+    def _tick_of(timestamp: float) -> int:
+        return int(timestamp // WHEEL_RESOLUTION)
+
+
+@callback
+def async_get_timer_wheel(hass: HomeAssistant) -> TimerWheel:
+    """Return the integration's timer wheel, creating it on first use."""
+    wheel: TimerWheel | None = hass.data.get(DATA_TIMER_WHEEL)
+    if wheel is None:
+        wheel = hass.data[DATA_TIMER_WHEEL] = TimerWheel(hass)
+    return wheel
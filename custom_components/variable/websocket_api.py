@@ -0,0 +1,263 @@
+"""Websocket commands of the Variable integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from homeassistant.components import websocket_api
+from homeassistant.const import CONF_DEVICE_ID, CONF_ENTITY_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback, split_entity_id
+from homeassistant.helpers import config_validation as cv
+import voluptuous as vol
+
+from .const import (
+    ATTR_ATTRIBUTES,
+    ATTR_PLATFORM,
+    ATTR_VARIABLE_ID_PREFIX,
+    CONF_VARIABLE_ID,
+    DATA_SUBSCRIPTIONS,
+    PLATFORMS,
+)
+from .entity import VariableEntity, async_get_entity_index
+from .helpers import diff_attributes, get_nested_attribute
+from .patch import attribute_path
+
+# Sends the operations of each changed variable, keyed by entity_id.
+_Send = Callable[[dict[str, list[dict[str, Any]]]], None]
+
+
+VARIABLE_FILTER_SCHEMA = {
+    vol.Optional(ATTR_PLATFORM): vol.All(cv.ensure_list, [vol.In(PLATFORMS)]),
+    vol.Optional(CONF_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_VARIABLE_ID_PREFIX): cv.string,
+    vol.Optional(CONF_ENTITY_ID): cv.entity_ids,
+    vol.Optional(CONF_VARIABLE_ID): vol.All(cv.ensure_list, [cv.string]),
+}
+
+
+class VariableSubscriptions:
+    """Websocket subscribers to variable changes.
+
+    While anyone is subscribed, the snapshot of each variable last sent to
+    subscribers is kept. Every published state write is diffed against it,
+    and matching subscribers receive only the JSON patch operations of the
+    paths that changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without subscribers."""
+        self._subscribers: dict[int, tuple[Callable[[VariableEntity], bool], _Send]] = {}
+        self._next_id = 0
+        self._published: dict[str, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of subscribers."""
+        return len(self._subscribers)
+
+    @callback
+    def async_subscribe(
+        self,
+        matcher: Callable[[VariableEntity], bool],
+        send: _Send,
+        entities: Iterable[VariableEntity],
+    ) -> CALLBACK_TYPE:
+        """Send the current snapshot of the matching variables, then their changes.
+
+        Returns:
+            A callback that ends the subscription.
+        """
+        subscription_id = self._next_id
+        self._next_id += 1
+        self._subscribers[subscription_id] = (matcher, send)
+        initial: dict[str, list[dict[str, Any]]] = {}
+        for entity in entities:
+            if not matcher(entity):
+                continue
+            # Variables with a pending coalesced write are sent as last published.
+            snapshot = self._published.get(entity.entity_id)
+            if snapshot is None:
+                snapshot = self._published[entity.entity_id] = async_variable_snapshot(entity)
+            initial[entity.entity_id] = [{"op": "add", "path": "", "value": snapshot}]
+        send(initial)
+
+        @callback
+        def unsubscribe() -> None:
+            self._subscribers.pop(subscription_id, None)
+            if not self._subscribers:
+                self._published.clear()
+
+        return unsubscribe
+
+    @callback
+    def async_publish(self, entity: VariableEntity) -> None:
+        """Send the changes of a state write to the matching subscribers."""
+        if not self._subscribers:
+            return
+        snapshot = async_variable_snapshot(entity)
+        previous = self._published.get(entity.entity_id)
+        self._published[entity.entity_id] = snapshot
+        if previous is None:
+            ops = [{"op": "add", "path": "", "value": snapshot}]
+        else:
+            ops = []
+            if previous["state"] != snapshot["state"]:
+                ops.append({"op": "replace", "path": "/state", "value": snapshot["state"]})
+            ops.extend(
+                diff_attributes(
+                    previous[ATTR_ATTRIBUTES], snapshot[ATTR_ATTRIBUTES], f"/{ATTR_ATTRIBUTES}"
+                )
+            )
+            if not ops:
+                return
+        self._async_send(entity, ops)
+
+    @callback
+    def async_remove(self, entity: VariableEntity) -> None:
+        """Tell the matching subscribers that a variable was removed."""
+        if self._published.pop(entity.entity_id, None) is not None:
+            self._async_send(entity, [{"op": "remove", "path": ""}])
+
+    @callback
+    def _async_send(self, entity: VariableEntity, ops: list[dict[str, Any]]) -> None:
+        for matcher, send in list(self._subscribers.values()):
+            if matcher(entity):
+                send({entity.entity_id: ops})
+
+
+@callback
+def async_get_variable_subscriptions(hass: HomeAssistant) -> VariableSubscriptions:
+    """Return the integration's websocket subscriptions, creating them on first use."""
+    subscriptions: VariableSubscriptions | None = hass.data.get(DATA_SUBSCRIPTIONS)
+    if subscriptions is None:
+        subscriptions = hass.data[DATA_SUBSCRIPTIONS] = VariableSubscriptions()
+    return subscriptions
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_snapshot)
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@callback
+def async_variable_matcher(msg: dict[str, Any]) -> Callable[[VariableEntity], bool]:
+    """Return a test of whether a variable matches every filter of a command."""
+    entity_ids = set(msg[CONF_ENTITY_ID]) if CONF_ENTITY_ID in msg else None
+    variable_ids = set(msg[CONF_VARIABLE_ID]) if CONF_VARIABLE_ID in msg else None
+    platforms = msg.get(ATTR_PLATFORM)
+    prefix = msg.get(ATTR_VARIABLE_ID_PREFIX)
+    device_ids = msg.get(CONF_DEVICE_ID)
+
+    @callback
+    def matches(entity: VariableEntity) -> bool:
+        if entity_ids is not None and entity.entity_id not in entity_ids:
+            return False
+        if variable_ids is not None and entity.variable_id not in variable_ids:
+            return False
+        if platforms is not None and split_entity_id(entity.entity_id)[0] not in platforms:
+            return False
+        if prefix is not None and not entity.variable_id.startswith(prefix):
+            return False
+        return device_ids is None or (
+            entity.registry_entry is not None and entity.registry_entry.device_id in device_ids
+        )
+
+    return matches
+
+
+@callback
+def async_filter_variables(hass: HomeAssistant, msg: dict[str, Any]) -> list[VariableEntity]:
+    """Return the loaded Variable entities matching the filters of a command.
+
+    Every filter given must match. Without any filter, every loaded variable
+    matches.
+    """
+    index = async_get_entity_index(hass)
+    candidates: Iterable[VariableEntity]
+    if CONF_ENTITY_ID in msg:
+        candidates = filter(None, map(index.async_get, msg[CONF_ENTITY_ID]))
+    elif CONF_VARIABLE_ID in msg:
+        candidates = (
+            entity
+            for variable_id in msg[CONF_VARIABLE_ID]
+            for entity in index.async_get_by_variable_id(variable_id)
+        )
+    else:
+        candidates = index
+    return list(filter(async_variable_matcher(msg), candidates))
+
+
+@callback
+def async_variable_snapshot(
+    entity: VariableEntity, attribute_paths: list[str] | None = None
+) -> dict[str, Any]:
+    """Return the current value and attributes of a variable from the entity.
+
+    Args:
+        entity: The loaded variable entity.
+        attribute_paths: Attribute keys or bracket paths to include, or None
+            for every attribute. Paths without a value are left out.
+    """
+    attributes: Mapping[str, Any] = entity.extra_state_attributes or {}
+    if attribute_paths is not None:
+        projected: dict[str, Any] = {}
+        for path in attribute_paths:
+            try:
+                projected[path] = get_nested_attribute(attributes, path)
+            except KeyError:
+                continue
+        attributes = projected
+    return {
+        CONF_VARIABLE_ID: entity.variable_id,
+        ATTR_PLATFORM: split_entity_id(entity.entity_id)[0],
+        "state": entity.state,
+        ATTR_ATTRIBUTES: attributes,
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "variable/snapshot",
+        **VARIABLE_FILTER_SCHEMA,
+        vol.Optional(ATTR_ATTRIBUTES): vol.All(cv.ensure_list, [attribute_path]),
+    }
+)
+@callback
+def websocket_snapshot(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the values of many variables at once, read from the loaded entities."""
+    attribute_paths = msg.get(ATTR_ATTRIBUTES)
+    connection.send_result(
+        msg["id"],
+        {
+            "variables": {
+                entity.entity_id: async_variable_snapshot(entity, attribute_paths)
+                for entity in async_filter_variables(hass, msg)
+            }
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "variable/subscribe",
+        **VARIABLE_FILTER_SCHEMA,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Stream the changed paths of the matching variables as JSON patch operations."""
+
+    @callback
+    def send(variables: dict[str, list[dict[str, Any]]]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], {"variables": variables}))
+
+    connection.send_result(msg["id"])
+    connection.subscriptions[msg["id"]] = async_get_variable_subscriptions(hass).async_subscribe(
+        async_variable_matcher(msg), send, async_filter_variables(hass, msg)
+    )
@@ -0,0 +1 @@
+"""Variable integration benchmarks."""
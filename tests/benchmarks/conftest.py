@@ -0,0 +1,61 @@
+"""Shared fixtures for the Variable benchmarks."""
+
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.variable.const import CONF_YAML_VARIABLE
+from tests.types import ConfigEntryFactory, ServiceCaller, VariableSetup
+
+
+@pytest.fixture
+def setup_variable(hass: HomeAssistant, config_entry_factory: ConfigEntryFactory) -> VariableSetup:
+    """Return a function that sets up one Variable from the sync benchmarks.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+
+    Returns:
+        A function that sets up a Variable config entry from its data.
+    """
+
+    def _setup(data: Mapping[str, Any]) -> None:
+        """Set up a Variable config entry and wait for its entity.
+
+        Args:
+            data: Config-entry data of the Variable.
+        """
+        entry = config_entry_factory({CONF_YAML_VARIABLE: False, **data})
+        assert hass.loop.run_until_complete(hass.config_entries.async_setup(entry.entry_id))
+        hass.loop.run_until_complete(hass.async_block_till_done())
+
+    return _setup
+
+
+@pytest.fixture
+def call_service(hass: HomeAssistant) -> ServiceCaller:
+    """Return a function that makes a blocking service call from the sync benchmarks.
+
+    Args:
+        hass: Home Assistant test instance.
+
+    Returns:
+        A function that calls a service and waits for it to finish.
+    """
+
+    def _call(domain: str, service: str, data: Mapping[str, Any]) -> None:
+        """Call a service and wait for it to finish.
+
+        Args:
+            domain: Domain of the service.
+            service: Name of the service.
+            data: Service data.
+        """
+        hass.loop.run_until_complete(
+            hass.services.async_call(domain, service, dict(data), blocking=True)
+        )
+
+    return _call
@@ -0,0 +1,119 @@
+"""Benchmarks for parsing and following attribute paths.
+
+Run with ``python -m pytest tests/benchmarks --benchmark-enable --no-cov``.
+"""
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from custom_components.variable.helpers import (
+    _parse_attribute_path,
+    get_nested_attribute,
+    merge_attribute_dict,
+    to_attribute_tree,
+)
+
+DEEP_PATH = "levels" + "[0].next" * 20 + "[0].value"
+WIDE_KEYS = [100, 1_000]
+
+
+def _build_deep_attributes() -> dict:
+    """Build the nested attribute tree ``DEEP_PATH`` points into.
+
+    Returns:
+        Attribute mapping with twenty levels of nested lists.
+    """
+    leaf: dict = {"value": 1}
+    for _ in range(20):
+        leaf = {"next": [leaf]}
+    return {"levels": [leaf]}
+
+
+def _wide_update(keys: int) -> dict[str, int]:
+    """Build an update with one bracket path per item of a list.
+
+    Args:
+        keys: Number of bracket keys in the update.
+
+    Returns:
+        Update mapping of ``keys`` bracket paths.
+    """
+    return {f"items[{index}].value": index for index in range(keys)}
+
+
+def test_parse_deep_path_uncached(benchmark: BenchmarkFixture) -> None:
+    """Measure parsing a deep path without the cache as a baseline.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+    """
+    tokens = benchmark(_parse_attribute_path.__wrapped__, DEEP_PATH)
+
+    assert len(tokens) == 43
+
+
+def test_parse_deep_path_cached(benchmark: BenchmarkFixture) -> None:
+    """Measure parsing a deep path that was parsed before.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+    """
+    tokens = benchmark(_parse_attribute_path, DEEP_PATH)
+
+    assert len(tokens) == 43
+
+
+def test_get_deep_path(benchmark: BenchmarkFixture) -> None:
+    """Measure reading a value twenty levels deep through its compiled path.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+    """
+    attributes = _build_deep_attributes()
+
+    assert benchmark(get_nested_attribute, attributes, DEEP_PATH) == 1
+
+
+def test_attribute_tree_deep_path_update(benchmark: BenchmarkFixture) -> None:
+    """Measure one update of a value twenty levels deep.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+    """
+    tree = to_attribute_tree(_build_deep_attributes())
+
+    merged = benchmark(tree.merge, {DEEP_PATH: 2})
+
+    assert get_nested_attribute(merged, DEEP_PATH) == 2
+
+
+@pytest.mark.parametrize("keys", WIDE_KEYS)
+def test_attribute_tree_wide_update(benchmark: BenchmarkFixture, keys: int) -> None:
+    """Measure one update with many bracket keys against a copy-on-write tree.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        keys: Number of bracket keys in the update.
+    """
+    tree = to_attribute_tree({"items": [{"value": None} for _ in range(keys)]})
+    update = _wide_update(keys)
+
+    merged = benchmark(tree.merge, update)
+
+    assert merged["items"][-1]["value"] == keys - 1
+
+
+@pytest.mark.parametrize("keys", WIDE_KEYS)
+def test_merge_attribute_dict_wide_update(benchmark: BenchmarkFixture, keys: int) -> None:
+    """Measure one update with many bracket keys through the dict merge.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        keys: Number of bracket keys in the update.
+    """
+    attributes = {"items": [{"value": None} for _ in range(keys)]}
+    update = _wide_update(keys)
+
+    merged = benchmark(merge_attribute_dict, attributes, update)
+
+    assert merged["items"][-1]["value"] == keys - 1
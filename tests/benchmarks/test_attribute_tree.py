@@ -0,0 +1,60 @@
+"""Benchmarks for copy-on-write attribute updates.
+
+Run with ``python -m pytest tests/benchmarks --benchmark-enable --no-cov``.
+"""
+
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from custom_components.variable.helpers import merge_attribute_dict, to_attribute_tree
+
+TREE_SIZES = [10, 1_000, 10_000]
+SINGLE_PATH_UPDATE = {"readings[0].values[1]": 99}
+
+
+def _build_attributes(size: int) -> dict[str, Any]:
+    """Build a nested attribute tree with ``size`` list entries.
+
+    Args:
+        size: Number of nested entries in the tree.
+
+    Returns:
+        Attribute mapping with a large nested list and one small key.
+    """
+    return {
+        "readings": [{"index": index, "values": [index, index + 1]} for index in range(size)],
+        "status": {"name": "idle"},
+    }
+
+
+@pytest.mark.parametrize("size", TREE_SIZES)
+def test_attribute_tree_single_path_update(benchmark: BenchmarkFixture, size: int) -> None:
+    """Measure one nested update against a copy-on-write tree.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        size: Number of nested entries in the tree.
+    """
+    tree = to_attribute_tree(_build_attributes(size))
+
+    merged = benchmark(tree.merge, SINGLE_PATH_UPDATE)
+
+    assert merged["readings"][0]["values"] == [0, 99]
+    assert merged["status"] is tree["status"]
+
+
+@pytest.mark.parametrize("size", TREE_SIZES)
+def test_merge_attribute_dict_single_path_update(benchmark: BenchmarkFixture, size: int) -> None:
+    """Measure the deep-copying dict merge as a baseline.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        size: Number of nested entries in the tree.
+    """
+    attributes = _build_attributes(size)
+
+    merged = benchmark(merge_attribute_dict, attributes, SINGLE_PATH_UPDATE)
+
+    assert merged["readings"][0]["values"] == [0, 99]
@@ -0,0 +1,81 @@
+"""Benchmarks for the legacy set_variable service against update_sensor.
+
+Run with ``python -m pytest tests/benchmarks --benchmark-enable --no-cov``.
+"""
+
+from homeassistant.const import CONF_ENTITY_ID, Platform
+from homeassistant.core import HomeAssistant
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from custom_components.variable import SERVICE_SET_VARIABLE_LEGACY
+from custom_components.variable.const import (
+    ATTR_VARIABLE,
+    CONF_ENTITY_PLATFORM,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    DOMAIN,
+    SERVICE_UPDATE_SENSOR,
+)
+from tests.types import ServiceCaller, VariableSetup
+
+LEGACY_SENSOR = {CONF_ENTITY_PLATFORM: Platform.SENSOR, CONF_VARIABLE_ID: "legacy", CONF_VALUE: 0}
+
+
+def test_update_sensor_service(
+    benchmark: BenchmarkFixture,
+    hass: HomeAssistant,
+    setup_variable: VariableSetup,
+    call_service: ServiceCaller,
+) -> None:
+    """Measure an update_sensor call, the path legacy calls used to take.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        hass: Home Assistant test instance.
+        setup_variable: Sets up a Variable config entry.
+        call_service: Makes a blocking service call.
+    """
+    setup_variable(LEGACY_SENSOR)
+    counter = iter(range(1, 1_000_000))
+
+    benchmark(
+        lambda: call_service(
+            DOMAIN,
+            SERVICE_UPDATE_SENSOR,
+            {CONF_ENTITY_ID: "sensor.legacy", CONF_VALUE: next(counter)},
+        )
+    )
+
+    state = hass.states.get("sensor.legacy")
+    assert state is not None
+    assert state.state != "0"
+
+
+def test_set_variable_legacy_service(
+    benchmark: BenchmarkFixture,
+    hass: HomeAssistant,
+    setup_variable: VariableSetup,
+    call_service: ServiceCaller,
+) -> None:
+    """Measure a set_variable call dispatched straight to the entity.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        hass: Home Assistant test instance.
+        setup_variable: Sets up a Variable config entry.
+        call_service: Makes a blocking service call.
+    """
+    setup_variable(LEGACY_SENSOR)
+    counter = iter(range(1, 1_000_000))
+
+    benchmark(
+        lambda: call_service(
+            DOMAIN,
+            SERVICE_SET_VARIABLE_LEGACY,
+            {ATTR_VARIABLE: "legacy", CONF_VALUE: next(counter)},
+        )
+    )
+
+    state = hass.states.get("sensor.legacy")
+    assert state is not None
+    assert state.state != "0"
@@ -0,0 +1,183 @@
+"""Benchmarks for the throughput of the Variable update services.
+
+Run with ``python -m pytest tests/benchmarks --benchmark-enable --no-cov``, and
+add ``--benchmark-json=benchmarks.json`` to keep the results.
+"""
+
+from homeassistant.const import (
+    ATTR_BATTERY_LEVEL,
+    ATTR_GPS_ACCURACY,
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+    CONF_ENTITY_ID,
+    Platform,
+)
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from custom_components.variable.binary_sensor import SERVICE_TOGGLE_VARIABLE
+from custom_components.variable.const import (
+    ATTR_ATTRIBUTES,
+    CONF_ATTRIBUTES,
+    CONF_ENTITY_PLATFORM,
+    CONF_VALUE,
+    CONF_VALUE_TYPE,
+    CONF_VARIABLE_ID,
+    DOMAIN,
+    SERVICE_INCREMENT_SENSOR,
+    SERVICE_UPDATE_DEVICE_TRACKER,
+    SERVICE_UPDATE_SENSOR,
+)
+from tests.types import ServiceCaller, VariableSetup
+
+ATTRIBUTE_COUNTS = [0, 100, 10_000]
+
+
+@pytest.mark.parametrize("attributes", ATTRIBUTE_COUNTS)
+def test_update_sensor(
+    benchmark: BenchmarkFixture,
+    hass: HomeAssistant,
+    setup_variable: VariableSetup,
+    call_service: ServiceCaller,
+    attributes: int,
+) -> None:
+    """Measure update_sensor changing the value and one attribute.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        hass: Home Assistant test instance.
+        setup_variable: Sets up a Variable config entry.
+        call_service: Makes a blocking service call.
+        attributes: Number of attributes the Sensor Variable holds.
+    """
+    setup_variable(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "throughput",
+            CONF_VALUE: 0,
+            CONF_ATTRIBUTES: {f"attribute_{index}": index for index in range(attributes)},
+        }
+    )
+    counter = iter(range(1, 1_000_000))
+
+    def update() -> None:
+        value = next(counter)
+        call_service(
+            DOMAIN,
+            SERVICE_UPDATE_SENSOR,
+            {
+                CONF_ENTITY_ID: "sensor.throughput",
+                CONF_VALUE: value,
+                ATTR_ATTRIBUTES: {"last": value},
+            },
+        )
+
+    benchmark(update)
+
+    state = hass.states.get("sensor.throughput")
+    assert state is not None
+    assert len(state.attributes) >= attributes + 1
+
+
+def test_increment_sensor(
+    benchmark: BenchmarkFixture,
+    hass: HomeAssistant,
+    setup_variable: VariableSetup,
+    call_service: ServiceCaller,
+) -> None:
+    """Measure the rate of increment_sensor calls.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        hass: Home Assistant test instance.
+        setup_variable: Sets up a Variable config entry.
+        call_service: Makes a blocking service call.
+    """
+    setup_variable(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "counter",
+            CONF_VALUE: 0,
+            CONF_VALUE_TYPE: "number",
+        }
+    )
+
+    benchmark(call_service, DOMAIN, SERVICE_INCREMENT_SENSOR, {CONF_ENTITY_ID: "sensor.counter"})
+
+    state = hass.states.get("sensor.counter")
+    assert state is not None
+    assert float(state.state) > 0
+
+
+def test_toggle_binary_sensor(
+    benchmark: BenchmarkFixture,
+    hass: HomeAssistant,
+    setup_variable: VariableSetup,
+    call_service: ServiceCaller,
+) -> None:
+    """Measure toggle_binary_sensor, which writes a new state on every call.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        hass: Home Assistant test instance.
+        setup_variable: Sets up a Variable config entry.
+        call_service: Makes a blocking service call.
+    """
+    setup_variable(
+        {
+            CONF_ENTITY_PLATFORM: Platform.BINARY_SENSOR,
+            CONF_VARIABLE_ID: "flag",
+            CONF_VALUE: False,
+        }
+    )
+
+    benchmark(call_service, DOMAIN, SERVICE_TOGGLE_VARIABLE, {CONF_ENTITY_ID: "binary_sensor.flag"})
+
+    state = hass.states.get("binary_sensor.flag")
+    assert state is not None
+
+
+def test_update_device_tracker_gps(
+    benchmark: BenchmarkFixture,
+    hass: HomeAssistant,
+    setup_variable: VariableSetup,
+    call_service: ServiceCaller,
+) -> None:
+    """Measure update_device_tracker moving the tracker with a full GPS payload.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        hass: Home Assistant test instance.
+        setup_variable: Sets up a Variable config entry.
+        call_service: Makes a blocking service call.
+    """
+    setup_variable(
+        {
+            CONF_ENTITY_PLATFORM: Platform.DEVICE_TRACKER,
+            CONF_VARIABLE_ID: "phone",
+            ATTR_LATITUDE: 40.0,
+            ATTR_LONGITUDE: -75.0,
+        }
+    )
+    counter = iter(range(1, 1_000_000))
+
+    def update() -> None:
+        step = next(counter) % 1_000
+        call_service(
+            DOMAIN,
+            SERVICE_UPDATE_DEVICE_TRACKER,
+            {
+                CONF_ENTITY_ID: "device_tracker.phone",
+                ATTR_LATITUDE: 40.0 + step / 10_000,
+                ATTR_LONGITUDE: -75.0 - step / 10_000,
+                ATTR_GPS_ACCURACY: 5 + step % 20,
+                ATTR_BATTERY_LEVEL: 100 - step % 100,
+            },
+        )
+
+    benchmark(update)
+
+    state = hass.states.get("device_tracker.phone")
+    assert state is not None
+    assert state.attributes[ATTR_LATITUDE] != 40.0
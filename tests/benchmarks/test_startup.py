@@ -0,0 +1,95 @@
+"""Benchmarks for the startup time of many variables.
+
+Run with ``python -m pytest tests/benchmarks/test_startup.py --benchmark-enable --no-cov``.
+The time of each startup phase is stored in the extra info of the results.
+"""
+
+from itertools import cycle
+import time
+
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from custom_components.variable.const import (
+    CONF_ATTRIBUTES,
+    CONF_ENTITY_PLATFORM,
+    CONF_RESTORE,
+    CONF_UPDATED,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    CONF_YAML_VARIABLE,
+    DOMAIN,
+)
+from custom_components.variable.entity import async_get_entity_index
+from custom_components.variable.startup import STARTUP_PHASES, async_get_startup_timer
+from tests.types import ConfigEntryFactory
+
+VARIABLE_COUNTS = [100, 1_000, 5_000]
+# Largest allowed ratio between the per-variable startup time of a count and
+# that of the smallest count.
+MAX_SCALING = 3.0
+PLATFORM_DATA = {
+    Platform.SENSOR: {CONF_VALUE: 21.5},
+    Platform.BINARY_SENSOR: {CONF_VALUE: "on"},
+    Platform.DEVICE_TRACKER: {ATTR_LATITUDE: 40.0, ATTR_LONGITUDE: -75.0},
+}
+
+# Seconds per variable of each count that ran, to compare against the smallest.
+_per_variable: dict[int, float] = {}
+
+
+@pytest.mark.timeout(600)
+@pytest.mark.parametrize("variables", VARIABLE_COUNTS)
+def test_startup(
+    benchmark: BenchmarkFixture,
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+    variables: int,
+) -> None:
+    """Measure setting up the integration with one config entry per variable.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+        variables: Number of variables, spread over every platform.
+    """
+    if benchmark.disabled and variables != VARIABLE_COUNTS[0]:
+        pytest.skip("Only the smallest count runs while benchmarks are disabled")
+    platforms = cycle(PLATFORM_DATA.items())
+    for number in range(variables):
+        platform, data = next(platforms)
+        config_entry_factory(
+            {
+                CONF_ENTITY_PLATFORM: platform,
+                CONF_VARIABLE_ID: f"startup_{number}",
+                CONF_YAML_VARIABLE: False,
+                CONF_RESTORE: True,
+                CONF_UPDATED: False,
+                CONF_ATTRIBUTES: {"number": number},
+                **data,
+            }
+        )
+
+    def start() -> float:
+        started = time.perf_counter()
+        assert hass.loop.run_until_complete(async_setup_component(hass, DOMAIN, {}))
+        hass.loop.run_until_complete(hass.async_block_till_done())
+        return time.perf_counter() - started
+
+    elapsed = benchmark.pedantic(start, rounds=1, iterations=1)
+
+    assert len(async_get_entity_index(hass)) == variables
+    stats = async_get_startup_timer(hass).stats
+    benchmark.extra_info.update(
+        {f"{phase}_seconds": stats[phase]["seconds"] for phase in STARTUP_PHASES}
+    )
+    for phase in STARTUP_PHASES[1:]:
+        assert stats[phase]["count"] == variables, phase
+    _per_variable[variables] = elapsed / variables
+    baseline = VARIABLE_COUNTS[0]
+    if variables != baseline and baseline in _per_variable:
+        assert _per_variable[variables] <= MAX_SCALING * _per_variable[baseline]
@@ -0,0 +1,70 @@
+"""Benchmarks for value type conversion.
+
+Run with ``python -m pytest tests/benchmarks --benchmark-enable --no-cov``.
+"""
+
+import datetime
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from custom_components.variable.helpers import get_value_converter, value_to_type
+
+DATE = datetime.date(2026, 7, 24)
+DATETIME = datetime.datetime(2026, 7, 24, 12, 30, tzinfo=datetime.UTC)
+# Every supported conversion, with an initial value of the source kind that
+# converts to the destination type.
+CONVERSIONS = [
+    ("string", "string", "2026-07-24T12:30:00"),
+    ("string", "number", "1753360200"),
+    ("string", "date", "2026-07-24"),
+    ("string", "datetime", "2026-07-24T12:30:00"),
+    ("number", "string", 1753360200),
+    ("number", "number", 1753360200),
+    ("date", "string", DATE),
+    ("date", "number", DATE),
+    ("date", "date", DATE),
+    ("date", "datetime", DATE),
+    ("datetime", "string", DATETIME),
+    ("datetime", "number", DATETIME),
+    ("datetime", "date", DATETIME),
+    ("datetime", "datetime", DATETIME),
+]
+CONVERSION_IDS = [f"{source}-{destination}" for source, destination, _ in CONVERSIONS]
+
+
+@pytest.mark.parametrize(("source", "destination", "initial"), CONVERSIONS, ids=CONVERSION_IDS)
+def test_cached_value_converter(
+    benchmark: BenchmarkFixture, source: str, destination: str, initial: Any
+) -> None:
+    """Measure the converter a Sensor Variable keeps for its value_type.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        source: Kind of the initial value, which names the case.
+        destination: Destination value type.
+        initial: Initial value of the source kind.
+    """
+    convert = get_value_converter(destination)
+
+    result = benchmark(convert, initial)
+
+    assert result == value_to_type(initial, destination)
+
+
+@pytest.mark.parametrize(("source", "destination", "initial"), CONVERSIONS, ids=CONVERSION_IDS)
+def test_value_to_type(
+    benchmark: BenchmarkFixture, source: str, destination: str, initial: Any
+) -> None:
+    """Measure ``value_to_type``, which looks the converter up on every call.
+
+    Args:
+        benchmark: pytest-benchmark fixture.
+        source: Kind of the initial value, which names the case.
+        destination: Destination value type.
+        initial: Initial value of the source kind.
+    """
+    result = benchmark(value_to_type, initial, destination)
+
+    assert result is not None
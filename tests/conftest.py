@@ -22,7 +22,7 @@ from custom_components.variable.const import (
     CONF_YAML_VARIABLE,
     DOMAIN,
 )
-from tests.types import ConfigEntryFactory
+from tests.types import ConfigEntryFactory, RestorableSensorData
 
 
 @pytest.fixture(autouse=True)
@@ -76,6 +76,37 @@ def config_entry_factory(hass: HomeAssistant) -> ConfigEntryFactory:
     return _create
 
 
+@pytest.fixture
+def restorable_sensor_data() -> RestorableSensorData:
+    """Return a factory of config entry data for restorable number sensors.
+
+    Returns:
+        A factory taking the variable_id and optional extra data of the sensor.
+    """
+
+    def _create(variable_id: str, extra: Mapping[str, Any] | None = None) -> dict[str, Any]:
+        """Return config entry data for a restorable number sensor.
+
+        Args:
+            variable_id: Variable ID of the sensor.
+            extra: Data added to or replacing the defaults.
+
+        Returns:
+            Config entry data for the sensor.
+        """
+        return {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: variable_id,
+            CONF_VALUE: 0,
+            CONF_VALUE_TYPE: "number",
+            CONF_RESTORE: True,
+            CONF_YAML_VARIABLE: False,
+            **(extra or {}),
+        }
+
+    return _create
+
+
 @pytest.fixture
 def sensor_entry(config_entry_factory: ConfigEntryFactory) -> ConfigEntry:
     """Create a representative sensor config entry.
@@ -0,0 +1,161 @@
+"""Tests for blob attributes kept out of the state machine."""
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, State
+import pytest
+from pytest_homeassistant_custom_component.common import mock_restore_cache_with_extra_data
+
+from custom_components.variable.blobs import BlobAttributes
+from custom_components.variable.const import (
+    ATTR_ATTRIBUTE,
+    ATTR_END,
+    ATTR_START,
+    CONF_ATTRIBUTES,
+    CONF_BLOB_THRESHOLD,
+    CONF_ENTITY_PLATFORM,
+    CONF_RESTORE,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    CONF_YAML_VARIABLE,
+    DOMAIN,
+    SERVICE_GET_BLOB,
+    SERVICE_UPDATE_SENSOR,
+)
+from custom_components.variable.helpers import AttributeTree
+from tests.types import ConfigEntryFactory
+
+
+def test_blob_attributes_version_content_changes() -> None:
+    """Publish large values as descriptors whose version follows their content."""
+    blobs = BlobAttributes(threshold=10)
+    first = AttributeTree({"queue": list(range(10)), "small": 1})
+
+    public = blobs.public(first)
+    assert public["small"] == 1
+    assert public["queue"]["size"] == len(b"[0,1,2,3,4,5,6,7,8,9]")
+    assert public["queue"]["version"] == 1
+    assert blobs.public(first) is public
+
+    # An equal value keeps its descriptor; a changed one gets the next version.
+    same = blobs.public(first.merge({"queue": list(range(10)), "small": 2}))
+    assert same["queue"] is public["queue"]
+    changed = blobs.public(first.merge({"queue[0]": 100}))
+    assert changed["queue"]["version"] == 2
+    assert changed["queue"]["hash"] != public["queue"]["hash"]
+    assert blobs.descriptor("queue") is changed["queue"]
+    assert blobs.descriptor("small") is None
+
+
+async def test_blob_attributes_are_kept_out_of_the_state(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Publish descriptors in the state and return the payload from get_blob.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "schedule",
+            CONF_VALUE: "on",
+            CONF_ATTRIBUTES: {"items": [f"slot {slot}" for slot in range(50)], "day": "mon"},
+            CONF_BLOB_THRESHOLD: 100,
+            CONF_RESTORE: False,
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.schedule")
+    assert state.attributes["day"] == "mon"
+    assert set(state.attributes["items"]) == {"hash", "size", "version"}
+    assert state.attributes["items"]["version"] == 1
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BLOB,
+        {"entity_id": "sensor.schedule", ATTR_ATTRIBUTE: "items", ATTR_START: 1, ATTR_END: 3},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"value": ["slot 1", "slot 2"], **state.attributes["items"]}
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {"entity_id": "sensor.schedule", "attributes": {"items[0]": "changed"}},
+        blocking=True,
+    )
+    state = hass.states.get("sensor.schedule")
+    assert state.attributes["items"]["version"] == 2
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BLOB,
+        {"entity_id": "sensor.schedule", ATTR_ATTRIBUTE: "items[0]"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"value": "changed", **state.attributes["items"]}
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BLOB,
+        {"entity_id": "sensor.schedule", ATTR_ATTRIBUTE: "day"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"value": "mon"}
+    with pytest.raises(ValueError, match="Attribute not found"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_BLOB,
+            {"entity_id": "sensor.schedule", ATTR_ATTRIBUTE: "missing"},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_blob_attributes_missing_from_the_store_are_dropped_with_a_warning(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Warn about blob descriptors restored from the restore cache without their payload.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+        caplog: Captured log records.
+    """
+    descriptor = {"hash": "abc", "size": 500, "version": 3}
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State("sensor.cached_schedule", "on", {"items": descriptor, "day": "tue"}),
+                {"native_value": "on", "native_unit_of_measurement": None},
+            )
+        ],
+    )
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "cached_schedule",
+            CONF_VALUE: "off",
+            CONF_BLOB_THRESHOLD: 100,
+            CONF_RESTORE: True,
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.cached_schedule")
+    assert state is not None
+    assert state.attributes["day"] == "tue"
+    assert "items" not in state.attributes
+    assert "cannot be restored: items" in caplog.text
@@ -0,0 +1,224 @@
+"""Tests for Variable collection entries."""
+
+from types import MappingProxyType
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState, ConfigSubentry
+from homeassistant.const import CONF_NAME, Platform
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    mock_restore_cache_with_extra_data,
+)
+
+from custom_components.variable.collection import VariableCollection
+from custom_components.variable.const import (
+    CONF_COLLECTION,
+    CONF_COLLECTION_PLATFORM,
+    CONF_ENTITY_PLATFORM,
+    CONF_RESTORE,
+    CONF_UPDATED,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    CONF_YAML_VARIABLE,
+    DATA_RESTORE_STATS,
+    DOMAIN,
+    SUBENTRY_TYPE_VARIABLE,
+)
+from custom_components.variable.entity import async_get_entity_index
+
+
+def _variable_data(variable_id: str, value: Any, restore: bool = False) -> dict[str, Any]:
+    """Return subentry data for a sensor variable in a collection.
+
+    Args:
+        variable_id: Variable ID of the sensor.
+        value: Initial sensor value.
+        restore: Whether the variable restores its last state.
+
+    Returns:
+        Subentry data for the variable.
+    """
+    return {
+        CONF_ENTITY_PLATFORM: Platform.SENSOR,
+        CONF_VARIABLE_ID: variable_id,
+        CONF_VALUE: value,
+        CONF_RESTORE: restore,
+        CONF_YAML_VARIABLE: False,
+    }
+
+
+async def _async_setup_collection(
+    hass: HomeAssistant, variable_ids: list[str], restore: bool = False
+) -> MockConfigEntry:
+    """Create and set up a sensor collection with one variable per ID.
+
+    Args:
+        hass: Home Assistant test instance.
+        variable_ids: Variable IDs to add as subentries.
+        restore: Whether the variables restore their last state.
+
+    Returns:
+        The loaded collection config entry.
+    """
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Readings",
+        data={
+            CONF_ENTITY_PLATFORM: CONF_COLLECTION,
+            CONF_COLLECTION_PLATFORM: Platform.SENSOR,
+            CONF_NAME: "Readings",
+            CONF_YAML_VARIABLE: False,
+        },
+        subentries_data=[
+            {
+                "data": _variable_data(variable_id, index, restore),
+                "subentry_type": SUBENTRY_TYPE_VARIABLE,
+                "title": variable_id,
+                "unique_id": None,
+            }
+            for index, variable_id in enumerate(variable_ids)
+        ],
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_collection_sets_up_one_entity_per_subentry(hass: HomeAssistant) -> None:
+    """Create an entity for every variable subentry under a single entry.
+
+    Args:
+        hass: Home Assistant test instance.
+    """
+    entry = await _async_setup_collection(hass, ["reading_a", "reading_b"])
+
+    registry = er.async_get(hass)
+    for subentry_id, subentry in entry.subentries.items():
+        entity_id = f"sensor.{subentry.data[CONF_VARIABLE_ID]}"
+        assert hass.states.get(entity_id) is not None
+        registry_entry = registry.async_get(entity_id)
+        assert registry_entry is not None
+        assert registry_entry.config_entry_id == entry.entry_id
+        assert registry_entry.config_subentry_id == subentry_id
+    # Saving each variable's restored config must not overwrite collection data.
+    assert entry.data[CONF_ENTITY_PLATFORM] == CONF_COLLECTION
+    assert all(subentry.data[CONF_UPDATED] is False for subentry in entry.subentries.values())
+
+
+async def test_collection_adds_and_removes_variables_without_reload(
+    hass: HomeAssistant,
+) -> None:
+    """Apply subentry changes to single entities and leave the rest untouched.
+
+    Args:
+        hass: Home Assistant test instance.
+    """
+    entry = await _async_setup_collection(hass, ["kept", "removed"])
+    index = async_get_entity_index(hass)
+    kept = index.async_get("sensor.kept")
+    assert kept is not None
+    removed_id = next(
+        subentry_id
+        for subentry_id, subentry in entry.subentries.items()
+        if subentry.data[CONF_VARIABLE_ID] == "removed"
+    )
+
+    with patch.object(hass.config_entries, "async_reload") as reload_mock:
+        hass.config_entries.async_add_subentry(
+            entry,
+            ConfigSubentry(
+                data=MappingProxyType(_variable_data("added", 42)),
+                subentry_type=SUBENTRY_TYPE_VARIABLE,
+                title="added",
+                unique_id=None,
+            ),
+        )
+        await hass.async_block_till_done()
+        hass.config_entries.async_remove_subentry(entry, removed_id)
+        await hass.async_block_till_done()
+
+    reload_mock.assert_not_called()
+    assert entry.state is ConfigEntryState.LOADED
+    added = hass.states.get("sensor.added")
+    assert added is not None
+    assert added.state == "42"
+    assert hass.states.get("sensor.removed") is None
+    assert index.async_get("sensor.kept") is kept
+
+
+async def test_collection_skips_sync_for_saved_variable_configs(hass: HomeAssistant) -> None:
+    """Save each variable's config at load without comparing every subentry again.
+
+    Args:
+        hass: Home Assistant test instance.
+    """
+    with patch.object(VariableCollection, "async_sync", autospec=True) as sync_mock:
+        entry = await _async_setup_collection(hass, ["saved_a", "saved_b", "saved_c"])
+
+    sync_mock.assert_not_called()
+    assert all(subentry.data[CONF_UPDATED] is False for subentry in entry.subentries.values())
+
+
+async def test_collection_replaces_only_changed_variable(hass: HomeAssistant) -> None:
+    """Recreate a variable whose subentry data changed.
+
+    Args:
+        hass: Home Assistant test instance.
+    """
+    entry = await _async_setup_collection(hass, ["changed", "unchanged"])
+    index = async_get_entity_index(hass)
+    unchanged = index.async_get("sensor.unchanged")
+    subentry = next(
+        subentry
+        for subentry in entry.subentries.values()
+        if subentry.data[CONF_VARIABLE_ID] == "changed"
+    )
+
+    hass.config_entries.async_update_subentry(
+        entry, subentry, data={**subentry.data, CONF_VALUE: "new"}
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.changed")
+    assert state is not None
+    assert state.state == "new"
+    assert index.async_get("sensor.unchanged") is unchanged
+
+
+async def test_collection_restores_variables_before_first_write(hass: HomeAssistant) -> None:
+    """Restore every variable in one pass so each entity writes state once.
+
+    Args:
+        hass: Home Assistant test instance.
+    """
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(f"sensor.{variable_id}", value, {"source": "cache"}),
+                {"native_value": value, "native_unit_of_measurement": None},
+            )
+            for variable_id, value in (("restored_a", "a"), ("restored_b", "b"))
+        ],
+    )
+
+    await _async_setup_collection(hass, ["restored_a", "restored_b", "not_cached"], restore=True)
+
+    index = async_get_entity_index(hass)
+    for variable_id, value in (("restored_a", "a"), ("restored_b", "b")):
+        state = hass.states.get(f"sensor.{variable_id}")
+        assert state is not None
+        assert state.state == value
+        assert state.attributes["source"] == "cache"
+        entity = index.async_get(f"sensor.{variable_id}")
+        assert entity is not None
+        assert entity.write_stats["requested"] == 1
+    not_cached = hass.states.get("sensor.not_cached")
+    assert not_cached is not None
+    assert not_cached.state == "2"
+    stats = hass.data[DATA_RESTORE_STATS][Platform.SENSOR]
+    assert (stats["variables"], stats["restored"]) == (3, 2)
@@ -33,9 +33,12 @@ import pytest
 
 from custom_components.variable.const import (
     CONF_ATTRIBUTES,
+    CONF_COLLECTION,
+    CONF_COLLECTION_PLATFORM,
     CONF_ENTITY_PLATFORM,
     CONF_EXCLUDE_FROM_RECORDER,
     CONF_FORCE_UPDATE,
+    CONF_MIN_WRITE_INTERVAL,
     CONF_RESTORE,
     CONF_TZOFFSET,
     CONF_VALUE,
@@ -43,6 +46,7 @@ from custom_components.variable.const import (
     CONF_VARIABLE_ID,
     CONF_YAML_VARIABLE,
     DOMAIN,
+    SUBENTRY_TYPE_VARIABLE,
 )
 from tests.types import ConfigEntryFactory
 
@@ -94,6 +98,7 @@ async def test_user_flow_menu(hass: HomeAssistant) -> None:
         "add_binary_sensor",
         "add_device_tracker",
         "add_device",
+        "add_collection",
     ]
 
 
@@ -698,12 +703,14 @@ async def test_binary_sensor_options_update_entry_and_live_entity(
             CONF_RESTORE: False,
             CONF_FORCE_UPDATE: True,
             CONF_EXCLUDE_FROM_RECORDER: False,
+            CONF_MIN_WRITE_INTERVAL: 2.5,
         },
     )
     await hass.async_block_till_done()
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
     assert entry.data[CONF_VALUE] == "false"
+    assert entry.data[CONF_MIN_WRITE_INTERVAL] == 2.5
     assert entry.data["device_class"] == "door"
     assert entry.data[CONF_ATTRIBUTES] == {"source": "binary-options-form"}
     assert entry.data[CONF_RESTORE] is False
@@ -978,3 +985,95 @@ async def test_device_options_invalid_url_preserves_entry_and_registry(
     assert current_device.manufacturer == "Original"
     assert current_device.model == "Original Model"
     assert str(current_device.configuration_url) == "https://example.com/original"
+
+
+async def test_collection_flow_and_variable_subentry_flow(hass: HomeAssistant) -> None:
+    """Create a collection, then add variables to it through subentry flows.
+
+    Args:
+        hass: Home Assistant instance that owns the flows.
+    """
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={"next_step_id": "add_collection"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={CONF_NAME: "Flags", CONF_COLLECTION_PLATFORM: Platform.BINARY_SENSOR},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_ENTITY_PLATFORM] == CONF_COLLECTION
+    await hass.async_block_till_done()
+    entry = result["result"]
+    assert not entry.supports_options
+
+    result = await hass.config_entries.subentries.async_init(
+        (entry.entry_id, SUBENTRY_TYPE_VARIABLE),
+        context={"source": config_entries.SOURCE_USER},
+    )
+    assert result["type"] is FlowResultType.FORM
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"],
+        user_input={CONF_VARIABLE_ID: "collection_flag", CONF_VALUE: "true"},
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.collection_flag")
+    assert state is not None
+    assert state.state == "on"
+
+    result = await hass.config_entries.subentries.async_init(
+        (entry.entry_id, SUBENTRY_TYPE_VARIABLE),
+        context={"source": config_entries.SOURCE_USER},
+    )
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"],
+        user_input={CONF_VARIABLE_ID: "collection_flag", CONF_VALUE: "false"},
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF_VARIABLE_ID: "variable_id_exists"}
+
+
+async def test_sensor_collection_subentry_flow_uses_sensor_page_2(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Add a sensor to a sensor collection through the two-page sensor form.
+
+    Args:
+        hass: Home Assistant instance that owns the flows.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: CONF_COLLECTION,
+            CONF_COLLECTION_PLATFORM: Platform.SENSOR,
+            CONF_NAME: "Readings",
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await hass.config_entries.subentries.async_init(
+        (entry.entry_id, SUBENTRY_TYPE_VARIABLE),
+        context={"source": config_entries.SOURCE_USER},
+    )
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"],
+        user_input={CONF_VARIABLE_ID: "collection_reading"},
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "sensor_page_2"
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"], user_input={CONF_VALUE: "ready"}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.collection_reading")
+    assert state is not None
+    assert state.state == "ready"
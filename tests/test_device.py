@@ -37,9 +37,15 @@ from custom_components.variable.const import (
     CONF_VALUE_TYPE,
     CONF_VARIABLE_ID,
     CONF_YAML_VARIABLE,
+    DATA_DEVICE_INDEX,
     DOMAIN,
 )
-from custom_components.variable.device import create_device, remove_device, update_device
+from custom_components.variable.device import (
+    async_get_device_index,
+    create_device,
+    remove_device,
+    update_device,
+)
 from tests.types import ConfigEntryFactory
 
 
@@ -112,6 +118,88 @@ async def test_create_device_reloads_only_linked_variable_entities(
     schedule_reload.assert_called_once_with(linked_entry.entry_id)
 
 
+async def test_device_index_follows_entity_registry_changes(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Track Variable entity device links as registry entries change.
+
+    Args:
+        hass: Home Assistant instance that hosts the integration.
+        config_entry_factory: Factory that creates registered Variable entries.
+    """
+    variable_entry = config_entry_factory({CONF_VARIABLE_ID: "indexed", CONF_YAML_VARIABLE: False})
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    first = device_registry.async_get_or_create(
+        config_entry_id=variable_entry.entry_id, identifiers={(DOMAIN, "first")}
+    )
+    second = device_registry.async_get_or_create(
+        config_entry_id=variable_entry.entry_id, identifiers={(DOMAIN, "second")}
+    )
+    existing = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, "existing", config_entry=variable_entry, device_id=first.id
+    )
+    index = async_get_device_index(hass)
+    assert index.async_get_config_entry_ids(first.id) == {variable_entry.entry_id}
+
+    entity_registry.async_get_or_create(
+        "sensor", "other_platform", "other", config_entry=variable_entry, device_id=second.id
+    )
+    added = entity_registry.async_get_or_create(
+        "binary_sensor", DOMAIN, "added", config_entry=variable_entry, device_id=second.id
+    )
+    entity_registry.async_update_entity(existing.entity_id, device_id=second.id)
+    await hass.async_block_till_done()
+    assert index.async_get_config_entry_ids(first.id) == set()
+    assert index.async_get_config_entry_ids(second.id) == {variable_entry.entry_id}
+
+    entity_registry.async_remove(existing.entity_id)
+    entity_registry.async_update_entity(added.entity_id, new_entity_id="binary_sensor.renamed")
+    await hass.async_block_till_done()
+    assert index.async_get_config_entry_ids(second.id) == {variable_entry.entry_id}
+
+    entity_registry.async_remove("binary_sensor.renamed")
+    await hass.async_block_till_done()
+    assert index.async_get_config_entry_ids(second.id) == set()
+
+
+async def test_device_index_stops_listening_when_last_entry_unloads(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Stop the device index from tracking the registry once the last entry unloads.
+
+    Args:
+        hass: Home Assistant instance that hosts the integration.
+        config_entry_factory: Factory that creates registered Variable entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "unloaded",
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    index = async_get_device_index(hass)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "after_unload")}
+    )
+    er.async_get(hass).async_get_or_create(
+        "sensor", DOMAIN, "after_unload", config_entry=entry, device_id=device.id
+    )
+    await hass.async_block_till_done()
+
+    assert DATA_DEVICE_INDEX not in hass.data
+    assert index.async_get_config_entry_ids(device.id) == set()
+    assert async_get_device_index(hass).async_get_config_entry_ids(device.id) == {entry.entry_id}
+
+
 async def test_update_device_changes_all_registry_metadata(
     hass: HomeAssistant,
     config_entry_factory: ConfigEntryFactory,
@@ -0,0 +1,67 @@
+"""Tests for Variable config entry diagnostics."""
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+
+from custom_components.variable.const import (
+    CONF_ENTITY_PLATFORM,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    CONF_YAML_VARIABLE,
+)
+from custom_components.variable.diagnostics import async_get_config_entry_diagnostics
+from custom_components.variable.entity import async_get_entity_index
+from tests.types import ConfigEntryFactory
+
+
+async def test_diagnostics_report_entry_variables_and_write_counts(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Report the entry data and state write counters of its variables.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "diagnosed",
+            CONF_VALUE: "one",
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    other_entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "other",
+            CONF_VALUE: "two",
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity = async_get_entity_index(hass).async_get("sensor.diagnosed")
+    assert entity is not None
+    await entity.async_update_variable(value="changed")
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["data"][CONF_VARIABLE_ID] == "diagnosed"
+    assert diagnostics["subentries"] == {}
+    assert list(diagnostics["entities"]) == ["sensor.diagnosed"]
+    assert diagnostics["entities"]["sensor.diagnosed"] == {
+        "variable_id": "diagnosed",
+        "min_write_interval": 0.0,
+        "journal": False,
+        "ttl": 0.0,
+        "expires": None,
+        "state_writes": {"requested": 2, "published": 2, "saved": 0},
+        "deadband_suppressed": 0,
+        "accumulator_pending": 0,
+        "history": None,
+    }
+    assert diagnostics["startup"]["setup_entry"]["count"] > 0
+    other = await async_get_config_entry_diagnostics(hass, other_entry)
+    assert list(other["entities"]) == ["sensor.other"]
@@ -0,0 +1,299 @@
+"""Tests for shared Variable entity behavior."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_STATE_CHANGED, Platform
+from homeassistant.core import HomeAssistant, State
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+    mock_restore_cache_with_extra_data,
+)
+
+from custom_components.variable.const import (
+    CONF_ENTITY_PLATFORM,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_RESTORE,
+    CONF_TTL,
+    CONF_TTL_RESET_TO_INITIAL,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    CONF_YAML_VARIABLE,
+    DOMAIN,
+    SERVICE_UPDATE_SENSOR,
+)
+from custom_components.variable.entity import async_get_entity_index
+from tests.types import ConfigEntryFactory
+
+
+async def test_entity_index_tracks_loaded_entities(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Index entities by entity_id and variable_id until they are unloaded.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    sensor_entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "shared_id",
+            CONF_VALUE: "on sensor",
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    binary_entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.BINARY_SENSOR,
+            CONF_VARIABLE_ID: "shared_id",
+            CONF_VALUE: True,
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    # Setting up the integration loads every Variable entry.
+    assert await hass.config_entries.async_setup(sensor_entry.entry_id)
+    await hass.async_block_till_done()
+    assert binary_entry.state is ConfigEntryState.LOADED
+    index = async_get_entity_index(hass)
+
+    sensor = index.async_get("sensor.shared_id")
+    assert sensor is not None
+    assert sensor.variable_id == "shared_id"
+    assert {entity.entity_id for entity in index.async_get_by_variable_id("shared_id")} == {
+        "sensor.shared_id",
+        "binary_sensor.shared_id",
+    }
+
+    assert await hass.config_entries.async_unload(sensor_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert index.async_get("sensor.shared_id") is None
+    assert [entity.entity_id for entity in index.async_get_by_variable_id("shared_id")] == [
+        "binary_sensor.shared_id"
+    ]
+
+
+async def test_deferred_state_write_collapses_writes(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Write state once when several updates run inside a deferred block.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "deferred",
+            CONF_VALUE: 0,
+            "value_type": "number",
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity = async_get_entity_index(hass).async_get("sensor.deferred")
+    assert entity is not None
+    state_changes = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    with entity.deferred_state_write():
+        for value in range(1, 4):
+            await entity.async_update_variable(value=value)
+        assert state_changes == []
+    await hass.async_block_till_done()
+
+    assert len(state_changes) == 1
+    state = hass.states.get("sensor.deferred")
+    assert state is not None
+    assert state.state == "3"
+
+
+async def test_min_write_interval_coalesces_into_trailing_write(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Publish updates inside the write window as one trailing state write.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "coalesced",
+            CONF_VALUE: 0,
+            "value_type": "number",
+            CONF_MIN_WRITE_INTERVAL: 10,
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity = async_get_entity_index(hass).async_get("sensor.coalesced")
+    assert entity is not None
+    state_changes = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    for value in range(1, 6):
+        await entity.async_update_variable(value=value)
+    await hass.async_block_till_done()
+
+    assert state_changes == []
+    assert entity.native_value == 5
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+
+    assert len(state_changes) == 1
+    state = hass.states.get("sensor.coalesced")
+    assert state is not None
+    assert state.state == "5"
+    assert entity.write_stats == {"requested": 6, "published": 2, "saved": 4}
+
+
+async def test_ttl_expires_variable_without_updates(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Reset a sensor to unknown once no update arrived within its TTL.
+
+    State writes that are not updates, like a registry change, do not restart it.
+
+    Args:
+        hass: Home Assistant test instance.
+        freezer: Fixture that moves the current time.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "expiring",
+            CONF_VALUE: 0,
+            "value_type": "number",
+            CONF_TTL: 30,
+            CONF_RESTORE: False,
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(seconds=20))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {"entity_id": "sensor.expiring", "value": 5},
+        blocking=True,
+    )
+    # The update restarted the countdown.
+    freezer.tick(timedelta(seconds=20))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.expiring")
+    assert state is not None
+    assert state.state == "5"
+    entity = async_get_entity_index(hass).async_get("sensor.expiring")
+    assert entity is not None
+    entity.async_write_ha_state()
+
+    freezer.tick(timedelta(seconds=11))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.expiring")
+    assert state is not None
+    assert state.state == "unknown"
+
+
+async def test_ttl_resets_to_initial_value(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Reset a binary sensor to its initial value when configured to.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.BINARY_SENSOR,
+            CONF_VARIABLE_ID: "expiring_flag",
+            CONF_VALUE: "false",
+            CONF_TTL: 10,
+            CONF_TTL_RESET_TO_INITIAL: True,
+            CONF_RESTORE: False,
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity = async_get_entity_index(hass).async_get("binary_sensor.expiring_flag")
+    assert entity is not None
+
+    await entity.async_update_variable(value="true")
+    assert hass.states.get("binary_sensor.expiring_flag").state == "on"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.expiring_flag").state == "off"
+
+
+async def test_ttl_keeps_counting_from_restored_last_update(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Expire a restored variable relative to its last update before the restart.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    last_updated = dt_util.utcnow() - timedelta(seconds=50)
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(
+                    "sensor.restored_ttl",
+                    "7",
+                    last_updated=last_updated,
+                    last_reported=last_updated,
+                ),
+                {"native_value": 7, "native_unit_of_measurement": None},
+            )
+        ],
+    )
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "restored_ttl",
+            CONF_VALUE: 0,
+            "value_type": "number",
+            CONF_TTL: 60,
+            CONF_RESTORE: True,
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.restored_ttl")
+    assert state is not None
+    assert state.state == "7"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.restored_ttl")
+    assert state is not None
+    assert state.state == "unknown"
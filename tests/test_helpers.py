@@ -9,9 +9,15 @@ import datetime
 import pytest
 
 from custom_components.variable.helpers import (
+    AttributeTree,
+    compile_attribute_path,
+    diff_attributes,
+    get_nested_attribute,
+    get_value_converter,
     looks_like_attribute_path,
     merge_attribute_dict,
     set_nested_attribute,
+    to_attribute_tree,
     to_num,
     value_to_type,
 )
@@ -153,6 +159,108 @@ def test_set_nested_attribute_rejects_invalid_paths(
         set_nested_attribute(target, path, "value")  # type: ignore[arg-type]
 
 
+def test_compile_attribute_path_is_shared_and_cached() -> None:
+    """Compile each path once and reuse the same compiled path afterwards."""
+    compiled = compile_attribute_path("items[0].values[1]")
+
+    assert compile_attribute_path("items[0].values[1]") is compiled
+    assert compiled.tokens == ("items", 0, "values", 1)
+    assert compile_attribute_path("items.values").tokens == ("items.values",)
+    assert compiled.get({"items": [{"values": [1, 2]}]}) == 2
+    with pytest.raises(ValueError, match="Invalid attribute path"):
+        compile_attribute_path("items[0")
+
+
+def test_get_nested_attribute_reads_keys_and_bracket_paths() -> None:
+    """Follow bracket paths, read other paths as literal keys, and miss cleanly."""
+    source = {"items": [{"name": "first"}], "items.name": "literal"}
+
+    assert get_nested_attribute(source, "items[0].name") == "first"
+    assert get_nested_attribute(source, "items.name") == "literal"
+    for missing in ("other", "items[1]", "items[0].other", "items[0].name[0]"):
+        with pytest.raises(KeyError):
+            get_nested_attribute(source, missing)
+    with pytest.raises(ValueError, match="Invalid list index"):
+        get_nested_attribute(source, "items[first]")
+
+
+def test_diff_attributes_returns_only_changed_paths() -> None:
+    """Diff two tree versions into JSON patch operations of the changed paths."""
+    old = AttributeTree({"items": [{"name": "first"}, {"name": "second"}], "count": 1})
+    new = old.merge({"items[1].name": "renamed", "count": True, "flag": None})
+
+    assert diff_attributes(old, new) == [
+        {"op": "replace", "path": "/items/1/name", "value": "renamed"},
+        {"op": "replace", "path": "/count", "value": True},
+        {"op": "add", "path": "/flag", "value": None},
+    ]
+    assert diff_attributes(new, AttributeTree({"items": []}), "/attributes") == [
+        {"op": "remove", "path": "/attributes/items/1"},
+        {"op": "remove", "path": "/attributes/items/0"},
+        {"op": "remove", "path": "/attributes/count"},
+        {"op": "remove", "path": "/attributes/flag"},
+    ]
+    assert diff_attributes(new, new) == []
+
+
+def test_attribute_tree_patch_applies_each_operation() -> None:
+    """Apply every patch operation and copy only the patched containers."""
+    tree = AttributeTree(
+        {"items": [{"name": "a"}, {"name": "b"}], "tags": ["x"], "count": 1, "other": {"k": 1}}
+    )
+    patched = tree.patch(
+        [
+            {"op": "set", "path": "items[1].name", "value": "renamed"},
+            {"op": "delete", "path": "items[0]"},
+            {"op": "append", "path": "tags", "value": "y"},
+            {"op": "extend", "path": "new[0].list", "value": [1, 2]},
+            {"op": "increment", "path": "count", "value": 2},
+            {"op": "remove_value", "path": "tags", "value": "x"},
+            {"op": "move", "from": "count", "path": "total"},
+        ]
+    )
+
+    assert patched == {
+        "items": [{"name": "renamed"}],
+        "tags": ["y"],
+        "new": [{"list": [1, 2]}],
+        "total": 3,
+        "other": {"k": 1},
+    }
+    assert patched["other"] is tree["other"]
+    assert tree["items"] == [{"name": "a"}, {"name": "b"}]
+    assert tree["tags"] == ["x"]
+
+
+@pytest.mark.parametrize(
+    ("operation", "message"),
+    [
+        pytest.param({"op": "delete", "path": "items[5]"}, "5 not found", id="missing-index"),
+        pytest.param(
+            {"op": "increment", "path": "items"}, "expected a number", id="increment-list"
+        ),
+        pytest.param(
+            {"op": "append", "path": "count", "value": 1}, "expected a list", id="append-number"
+        ),
+        pytest.param(
+            {"op": "move", "from": "missing", "path": "count"}, "'missing' not found", id="move"
+        ),
+    ],
+)
+def test_attribute_tree_patch_rejects_failing_operations(operation: dict, message: str) -> None:
+    """Name the failing operation and leave the tree unchanged.
+
+    Args:
+        operation: Operation that cannot be applied.
+        message: Expected error message fragment.
+    """
+    tree = AttributeTree({"items": [1], "count": 1})
+
+    with pytest.raises(ValueError, match=f"Patch operation 1 .*{message}"):
+        tree.patch([{"op": "set", "path": "count", "value": 2}, operation])
+    assert tree == {"items": [1], "count": 1}
+
+
 def test_merge_attribute_dict_applies_literal_and_nested_updates() -> None:
     """Merge direct, dot-literal, and bracket-path keys."""
     existing: MutableMapping[str, object] = {
@@ -206,6 +314,103 @@ def test_merge_attribute_dict_deep_copies_without_mutating_inputs(
     assert existing == existing_snapshot
 
 
+def test_attribute_tree_merge_matches_merge_attribute_dict() -> None:
+    """Apply the same literal and bracket-path semantics as the dict merge."""
+    existing: MutableMapping[str, object] = {
+        "kept": True,
+        "items": [{"name": "before"}],
+    }
+    updates: MutableMapping[str, object] = {
+        "direct": {"value": 1},
+        "literal.name": "unchanged",
+        "items[0].name": "after",
+        "grid[1][0]": "cell",
+    }
+
+    merged = to_attribute_tree(existing).merge(updates)
+
+    assert isinstance(merged, AttributeTree)
+    assert merged == merge_attribute_dict(existing, updates)
+
+
+def test_attribute_tree_merge_shares_untouched_subtrees() -> None:
+    """Copy only the containers along updated paths."""
+    tree = to_attribute_tree(
+        {
+            "untouched": {"deep": [1, 2, 3]},
+            "items": [{"name": "first"}, {"name": "second"}],
+        }
+    )
+
+    merged = tree.merge({"items[1].name": "changed"})
+
+    assert merged["untouched"] is tree["untouched"]
+    assert merged["items"] is not tree["items"]
+    assert merged["items"][0] is tree["items"][0]
+    assert merged["items"][1] is not tree["items"][1]
+    assert tree["items"][1] == {"name": "second"}
+    assert merged["items"][1] == {"name": "changed"}
+
+
+def test_attribute_tree_merge_copies_each_container_once() -> None:
+    """Reuse a container copied earlier in the same merge for later paths."""
+    tree = to_attribute_tree({"items": [{"a": 1}]})
+
+    merged = tree.merge({"items[0].b": 2, "items[0].c": 3, "items[1]": "new"})
+
+    assert merged["items"] == [{"a": 1, "b": 2, "c": 3}, "new"]
+    assert tree["items"] == [{"a": 1}]
+
+
+def test_attribute_tree_returns_itself_when_nothing_changes() -> None:
+    """Return the same tree for merges and patches that only repeat current values."""
+    tree = to_attribute_tree({"count": 1, "items": [{"name": "first"}]})
+
+    assert tree.merge({"count": 1, "items[0].name": "first"}) is tree
+    assert tree.patch([{"op": "set", "path": "items[0].name", "value": "first"}]) is tree
+    assert tree.merge({"count": True}) == {"count": True, "items": [{"name": "first"}]}
+    assert tree.merge({"count": 2}) is not tree
+    assert tree.patch([{"op": "increment", "path": "count", "value": 0}]) is not tree
+
+
+def test_attribute_tree_is_read_only_and_isolated_from_inputs() -> None:
+    """Reject mutation and keep no references to caller-owned values."""
+    source: dict[str, object] = {"nested": ["original"]}
+    update_value = ["update"]
+    tree = to_attribute_tree(source).merge({"added": update_value})
+
+    with pytest.raises(RuntimeError):
+        tree["other"] = True  # type: ignore[index]
+    source_nested = source["nested"]
+    assert isinstance(source_nested, list)
+    source_nested.append("changed")
+    update_value.append("changed")
+
+    assert tree == {"nested": ["original"], "added": ["update"]}
+    assert to_attribute_tree(tree) is tree
+
+
+def test_attribute_tree_invalid_path_leaves_tree_unchanged() -> None:
+    """Raise for invalid bracket paths without altering the existing tree."""
+    tree = to_attribute_tree({"items": [{"name": "before"}]})
+
+    with pytest.raises(ValueError, match="Invalid list index"):
+        tree.merge({"items[0].name": "after", "items[x]": "bad"})
+
+    assert tree == {"items": [{"name": "before"}]}
+
+
+def test_attribute_tree_supports_deepcopy() -> None:
+    """Deep copy a tree into an equal, independent AttributeTree."""
+    tree = to_attribute_tree({"nested": {"value": [1]}})
+
+    copied = copy.deepcopy(tree)
+
+    assert isinstance(copied, AttributeTree)
+    assert copied == tree
+    assert copied["nested"] is not tree["nested"]
+
+
 class StringWrapper:
     """Represent a non-native template wrapper convertible to a string."""
 
@@ -462,3 +667,25 @@ def test_value_to_type_rejects_invalid_temporal_destination(
     """
     with pytest.raises(ValueError, match="Invalid dest_type"):
         value_to_type(initial, "boolean")
+
+
+def test_get_value_converter_is_cached_per_destination() -> None:
+    """Return the same converter for repeated lookups of a destination type."""
+    assert get_value_converter("number") is get_value_converter("number")
+    assert get_value_converter("number") is not get_value_converter("date")
+
+
+def test_get_value_converter_handles_subclasses_of_native_types() -> None:
+    """Classify subclasses of native types like the exact types they extend."""
+
+    class Text(str):
+        """String subclass used to bypass the exact type lookup."""
+
+    class Aware(datetime.datetime):
+        """Datetime subclass, which is not a supported initial type."""
+
+    assert get_value_converter("string")(True) == "True"
+    assert get_value_converter("number")(Text("7")) == 7
+    assert get_value_converter("number")(Text("Unknown")) is None
+    with pytest.raises(ValueError, match="Invalid initial type"):
+        get_value_converter("string")(Aware(2026, 7, 24))
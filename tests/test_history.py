@@ -0,0 +1,153 @@
+"""Tests for the Sensor Variable value history."""
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.variable.const import (
+    ATTR_MAX_POINTS,
+    CONF_ENTITY_PLATFORM,
+    CONF_HISTORY_SIZE,
+    CONF_RESTORE,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    CONF_YAML_VARIABLE,
+    DOMAIN,
+    SERVICE_GET_HISTORY,
+    SERVICE_INCREMENT_SENSOR,
+    SERVICE_UPDATE_SENSOR,
+)
+from custom_components.variable.history import ValueHistory
+from tests.types import ConfigEntryFactory
+
+
+def test_history_keeps_the_newest_values() -> None:
+    """Overwrite the oldest values once the ring buffer is full."""
+    history = ValueHistory(3, numeric=True)
+    for value in range(5):
+        history.append(float(value), value)
+
+    assert len(history) == 3
+    assert list(history) == [(2.0, 2.0), (3.0, 3.0), (4.0, 4.0)]
+    assert history.last_value == 4.0
+
+
+def test_history_keeps_non_numeric_and_missing_values() -> None:
+    """Keep any value in a non-numeric history and None in a numeric one."""
+    strings = ValueHistory(2, numeric=False)
+    strings.append(1.0, "a")
+    strings.append(2.0, "b")
+    numbers = ValueHistory(2, numeric=True)
+    numbers.append(1.0, None)
+
+    assert list(strings) == [(1.0, "a"), (2.0, "b")]
+    assert list(numbers) == [(1.0, None)]
+
+
+def test_history_downsamples_into_buckets() -> None:
+    """Average numeric buckets and report each at its newest timestamp."""
+    history = ValueHistory(10, numeric=True)
+    for value in range(6):
+        history.append(float(value), value)
+
+    assert history.downsample(3) == [(1.0, 0.5), (3.0, 2.5), (5.0, 4.5)]
+    assert history.downsample(10) == list(history)
+
+
+async def test_get_history_service_returns_recent_values(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Return each changed value of a sensor and skip unchanged updates.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "with_history",
+            CONF_VALUE: 0,
+            "value_type": "number",
+            CONF_HISTORY_SIZE: 3,
+            CONF_RESTORE: False,
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    for _ in range(2):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_INCREMENT_SENSOR,
+            {"entity_id": "sensor.with_history"},
+            blocking=True,
+        )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {"entity_id": "sensor.with_history", "attributes": {"unchanged": "value"}},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_INCREMENT_SENSOR,
+        {"entity_id": "sensor.with_history"},
+        blocking=True,
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        {"entity_id": "sensor.with_history"},
+        blocking=True,
+        return_response=True,
+    )
+    result = response["sensor.with_history"]
+    assert result["size"] == 3
+    assert [point["value"] for point in result["history"]] == [1.0, 2.0, 3.0]
+    assert all("timestamp" in point for point in result["history"])
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        {"entity_id": "sensor.with_history", ATTR_MAX_POINTS: 1},
+        blocking=True,
+        return_response=True,
+    )
+    assert [point["value"] for point in response["sensor.with_history"]["history"]] == [2.0]
+
+
+async def test_get_history_service_requires_history(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Reject history requests for sensors that do not keep a history.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "without_history",
+            CONF_VALUE: 0,
+            "value_type": "number",
+            CONF_RESTORE: False,
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    with pytest.raises(ValueError, match="History is not enabled"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_HISTORY,
+            {"entity_id": "sensor.without_history"},
+            blocking=True,
+            return_response=True,
+        )
@@ -2,7 +2,7 @@
 
 import importlib
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -10,23 +10,39 @@ from homeassistant.const import (
     ATTR_GPS_ACCURACY,
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
+    CONF_ENTITY_ID,
+    EVENT_STATE_CHANGED,
     SERVICE_RELOAD,
     STATE_ON,
     STATE_UNAVAILABLE,
     Platform,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Context, HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from homeassistant.setup import async_setup_component
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events
 
+from custom_components.variable import (
+    SERVICE_SET_ENTITY_LEGACY,
+    SERVICE_SET_VARIABLE_LEGACY,
+    _plan_yaml_reconcile,
+    _yaml_fingerprint,
+)
 from custom_components.variable.const import (
+    ATTR_ATTRIBUTES,
+    ATTR_ENTITY,
+    ATTR_ITEMS,
+    ATTR_VARIABLE,
     CONF_ENTITY_PLATFORM,
     CONF_VALUE,
     CONF_VARIABLE_ID,
+    CONF_YAML_FINGERPRINT,
     CONF_YAML_PRESENT,
     CONF_YAML_VARIABLE,
+    DATA_YAML_RECONCILE,
     DOMAIN,
+    SERVICE_UPDATE_MANY,
 )
 from tests.types import ConfigEntryFactory
 
@@ -100,6 +116,121 @@ async def test_yaml_setup_and_reload_manage_config_entries(
     assert er.async_get(hass).async_get("sensor.yaml_removed") is None
 
 
+async def test_yaml_reload_skips_unchanged_variables(hass: HomeAssistant) -> None:
+    """Leave entries loaded when their YAML block did not change.
+
+    Args:
+        hass: Home Assistant instance that hosts the integration.
+    """
+    config = {
+        DOMAIN: {
+            "yaml_unchanged": {CONF_VALUE: 1, "attributes": {"source": "yaml"}},
+            "yaml_changed": {CONF_VALUE: "before"},
+        }
+    }
+    assert await async_setup_component(hass, DOMAIN, config)
+    await hass.async_block_till_done()
+    assert hass.data[DATA_YAML_RECONCILE] == {
+        "created": 2,
+        "updated": 0,
+        "skipped": 0,
+        "removed": 0,
+    }
+    entries = {
+        entry.data[CONF_VARIABLE_ID]: entry for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    assert entries["yaml_unchanged"].data[CONF_YAML_FINGERPRINT]
+
+    reloaded_config = {
+        DOMAIN: {
+            "yaml_unchanged": {CONF_VALUE: 1, "attributes": {"source": "yaml"}},
+            "yaml_changed": {CONF_VALUE: "after"},
+        }
+    }
+    reload = hass.config_entries.async_reload
+    with (
+        patch(
+            "custom_components.variable.async_integration_yaml_config",
+            new=AsyncMock(return_value=reloaded_config),
+        ),
+        patch.object(hass.config_entries, "async_reload", wraps=reload) as reload_mock,
+    ):
+        await hass.services.async_call(DOMAIN, SERVICE_RELOAD, blocking=True)
+        await hass.async_block_till_done()
+
+    reload_mock.assert_called_once_with(entries["yaml_changed"].entry_id)
+    assert hass.data[DATA_YAML_RECONCILE] == {
+        "created": 0,
+        "updated": 1,
+        "skipped": 1,
+        "removed": 0,
+    }
+    changed_state = hass.states.get("sensor.yaml_changed")
+    assert changed_state is not None
+    assert changed_state.state == "after"
+
+
+def test_plan_yaml_reconcile_diffs_entries_by_variable_id() -> None:
+    """Plan creates, updates and removals from one pass over the entries."""
+    existing = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "existing",
+            CONF_VALUE: 1,
+            CONF_YAML_VARIABLE: True,
+        },
+    )
+    removed = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_VARIABLE_ID: "removed", CONF_YAML_VARIABLE: True},
+    )
+    ui_only = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_VARIABLE_ID: "ui_only", CONF_YAML_VARIABLE: False},
+    )
+    variables = {
+        "existing": {CONF_VALUE: 2, "restore": None},
+        "new": {
+            CONF_VALUE: "x",
+            "attributes": {"icon": "mdi:new", "friendly_name": "New", "unit": "kW"},
+        },
+    }
+
+    plan = _plan_yaml_reconcile(variables, [existing, removed, ui_only])
+
+    assert plan.create == {
+        "new": {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "new",
+            "name": "New",
+            CONF_VALUE: "x",
+            "restore": None,
+            "force_update": None,
+            "attributes": {"unit": "kW"},
+            "icon": "mdi:new",
+            CONF_YAML_FINGERPRINT: ANY,
+        }
+    }
+    assert plan.update == [
+        (
+            existing,
+            {
+                CONF_ENTITY_PLATFORM: Platform.SENSOR,
+                CONF_VARIABLE_ID: "existing",
+                CONF_VALUE: 2,
+                CONF_YAML_VARIABLE: True,
+                CONF_YAML_FINGERPRINT: _yaml_fingerprint({CONF_VALUE: 2}),
+                CONF_YAML_PRESENT: True,
+            },
+        )
+    ]
+    assert plan.skip == []
+    assert plan.remove == [removed]
+    # The YAML config itself is left untouched.
+    assert variables["new"]["attributes"]["icon"] == "mdi:new"
+
+
 @pytest.mark.parametrize(
     ("data", "entity_id", "expected_state", "expected_attributes"),
     [
@@ -292,3 +423,181 @@ async def test_remove_entry_cleans_up_entity_registry(
     await hass.async_block_till_done()
 
     assert er.async_get(hass).async_get("sensor.office_temperature") is None
+
+
+async def test_update_many_applies_batch_with_one_write_per_entity(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Apply bulk updates across platforms and write each entity once under the call context.
+
+    Args:
+        hass: Home Assistant instance that hosts the integration.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    for data in (
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "bulk_counter",
+            CONF_VALUE: 0,
+            "value_type": "number",
+        },
+        {
+            CONF_ENTITY_PLATFORM: Platform.BINARY_SENSOR,
+            CONF_VARIABLE_ID: "bulk_flag",
+            CONF_VALUE: False,
+        },
+    ):
+        entry = config_entry_factory({CONF_YAML_VARIABLE: False, **data})
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    state_changes = async_capture_events(hass, EVENT_STATE_CHANGED)
+    context = Context()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_MANY,
+        {
+            ATTR_ITEMS: [
+                {CONF_ENTITY_ID: "sensor.bulk_counter", CONF_VALUE: 1},
+                {CONF_VARIABLE_ID: "bulk_flag", CONF_VALUE: "true"},
+                {
+                    CONF_ENTITY_ID: "sensor.bulk_counter",
+                    CONF_VALUE: 2,
+                    ATTR_ATTRIBUTES: {"source": "batch"},
+                },
+            ]
+        },
+        blocking=True,
+        context=context,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+
+    assert response == {
+        "results": [
+            {CONF_ENTITY_ID: "sensor.bulk_counter", "success": True},
+            {
+                CONF_VARIABLE_ID: "bulk_flag",
+                CONF_ENTITY_ID: "binary_sensor.bulk_flag",
+                "success": True,
+            },
+            {CONF_ENTITY_ID: "sensor.bulk_counter", "success": True},
+        ]
+    }
+    counter = hass.states.get("sensor.bulk_counter")
+    assert counter is not None
+    assert counter.state == "2"
+    assert counter.attributes["source"] == "batch"
+    flag = hass.states.get("binary_sensor.bulk_flag")
+    assert flag is not None
+    assert flag.state == STATE_ON
+    assert sorted(event.data["entity_id"] for event in state_changes) == [
+        "binary_sensor.bulk_flag",
+        "sensor.bulk_counter",
+    ]
+    assert all(event.context is context for event in state_changes)
+
+
+async def test_update_many_reports_failed_items_without_stopping_batch(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Return per-item errors for invalid items and apply the valid ones.
+
+    Args:
+        hass: Home Assistant instance that hosts the integration.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "bulk_number",
+            CONF_VALUE: 5,
+            "value_type": "number",
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_MANY,
+        {
+            ATTR_ITEMS: [
+                {CONF_ENTITY_ID: "sensor.missing", CONF_VALUE: 1},
+                {CONF_VALUE: 1},
+                {CONF_ENTITY_ID: "sensor.bulk_number", CONF_VALUE: "not a number"},
+                {CONF_ENTITY_ID: "sensor.bulk_number", "unexpected": True},
+                {CONF_VARIABLE_ID: "bulk_number", CONF_VALUE: 7},
+            ]
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response is not None
+    results: Any = response["results"]
+    assert [result["success"] for result in results] == [False, False, False, False, True]
+    assert "not found" in results[0]["error"]
+    assert "not compatible" in results[2]["error"]
+    assert "extra keys not allowed" in results[3]["error"]
+    state = hass.states.get("sensor.bulk_number")
+    assert state is not None
+    assert state.state == "7"
+
+
+async def test_legacy_services_update_sensor_directly(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Update the Sensor Variable in the legacy service call itself.
+
+    Args:
+        hass: Home Assistant instance that hosts the integration.
+        config_entry_factory: Factory for test configuration entries.
+        caplog: Captured log records.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "legacy",
+            CONF_VALUE: "start",
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_VARIABLE_LEGACY,
+        {ATTR_VARIABLE: "legacy", CONF_VALUE: "first", ATTR_ATTRIBUTES: {"source": "variable"}},
+        blocking=True,
+    )
+    state = hass.states.get("sensor.legacy")
+    assert state is not None
+    assert state.state == "first"
+    assert state.attributes["source"] == "variable"
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_ENTITY_LEGACY,
+        {ATTR_ENTITY: "sensor.legacy", CONF_VALUE: "second"},
+        blocking=True,
+    )
+    state = hass.states.get("sensor.legacy")
+    assert state is not None
+    assert state.state == "second"
+    assert state.attributes["source"] == "variable"
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_ENTITY_LEGACY,
+        {ATTR_ENTITY: "sensor.missing", CONF_VALUE: "lost"},
+        blocking=True,
+    )
+    assert "Sensor Variable not found: sensor.missing" in caplog.text
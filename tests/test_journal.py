@@ -0,0 +1,198 @@
+"""Tests for the Variable change journal."""
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+import pytest
+
+from custom_components.variable.const import CONF_JOURNAL, CONF_MIN_WRITE_INTERVAL
+from custom_components.variable.entity import async_get_entity_index
+from custom_components.variable.journal import JOURNAL_FILE, async_get_variable_journal
+from custom_components.variable.store import STORAGE_KEY, STORAGE_VERSION
+from tests.types import ConfigEntryFactory, RestorableSensorData
+
+
+@pytest.fixture
+def journal_path(hass: HomeAssistant, tmp_path: Path) -> Path:
+    """Keep the journal of each test in its own config directory.
+
+    Args:
+        hass: Home Assistant test instance.
+        tmp_path: Temporary directory used as the config directory.
+
+    Returns:
+        Path of the journal file.
+    """
+    hass.config.config_dir = str(tmp_path)
+    return tmp_path / STORAGE_DIR / JOURNAL_FILE
+
+
+def _read_journal(journal_path: Path) -> list[dict[str, Any]]:
+    """Return the records in the journal file.
+
+    Args:
+        journal_path: Path of the journal file.
+
+    Returns:
+        The journal records, oldest first.
+    """
+    return [json.loads(line) for line in journal_path.read_text().splitlines()]
+
+
+async def test_journal_appends_every_update_in_batches(
+    hass: HomeAssistant,
+    journal_path: Path,
+    config_entry_factory: ConfigEntryFactory,
+    restorable_sensor_data: RestorableSensorData,
+) -> None:
+    """Append one record per update and write them in fewer batches.
+
+    Args:
+        hass: Home Assistant test instance.
+        journal_path: Path of the journal file.
+        config_entry_factory: Factory for test configuration entries.
+        restorable_sensor_data: Factory for restorable sensor config entry data.
+    """
+    entry = config_entry_factory(restorable_sensor_data("journaled", {CONF_JOURNAL: True}))
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity = async_get_entity_index(hass).async_get("sensor.journaled")
+    assert entity is not None
+    journal = async_get_variable_journal(hass)
+    before = journal.stats
+
+    await entity.async_update_variable(value=1, attributes={"step": 1})
+    for value in range(2, 6):
+        await entity.async_update_variable(value=value)
+    await hass.async_block_till_done()
+
+    records = [record for record in _read_journal(journal_path) if record["id"] == entry.entry_id]
+    assert [record["value"] for record in records[-5:]] == [1, 2, 3, 4, 5]
+    assert records[-5]["attributes"] == {"step": 1}
+    assert all("attributes" not in record for record in records[-4:])
+    stats = journal.stats
+    assert stats["records_written"] - before["records_written"] == 5
+    assert stats["batches"] - before["batches"] < 5
+    assert stats["bytes_written"] == journal_path.stat().st_size
+
+
+async def test_journal_is_replayed_over_the_store_at_startup(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    journal_path: Path,
+    config_entry_factory: ConfigEntryFactory,
+    restorable_sensor_data: RestorableSensorData,
+) -> None:
+    """Restore the last journaled value and fold the journal into the store.
+
+    Args:
+        hass: Home Assistant test instance.
+        hass_storage: Mocked Home Assistant storage.
+        journal_path: Path of the journal file.
+        config_entry_factory: Factory for test configuration entries.
+        restorable_sensor_data: Factory for restorable sensor config entry data.
+    """
+    entry = config_entry_factory(restorable_sensor_data("replayed", {CONF_JOURNAL: True}))
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {entry.entry_id: {"value": 1, "attributes": {"source": "store"}}},
+    }
+    journal_path.parent.mkdir(parents=True)
+    journal_path.write_text(
+        f'{{"id": "{entry.entry_id}", "value": 2, "attributes": {{"source": "journal"}}}}\n'
+        f'{{"id": "{entry.entry_id}", "value": 3}}\n'
+        # Left half written by a crash.
+        f'{{"id": "{entry.entry_id}", "val'
+    )
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.replayed")
+    assert state is not None
+    assert state.state == "3"
+    assert state.attributes["source"] == "journal"
+    assert async_get_variable_journal(hass).stats["records_replayed"] == 2
+    assert hass_storage[STORAGE_KEY]["data"][entry.entry_id]["value"] == 3
+    assert all(record["value"] == 3 for record in _read_journal(journal_path))
+
+
+async def test_journal_is_compacted_into_the_store(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    journal_path: Path,
+    config_entry_factory: ConfigEntryFactory,
+    restorable_sensor_data: RestorableSensorData,
+) -> None:
+    """Save the store and truncate the journal once it holds enough records.
+
+    Args:
+        hass: Home Assistant test instance.
+        hass_storage: Mocked Home Assistant storage.
+        journal_path: Path of the journal file.
+        config_entry_factory: Factory for test configuration entries.
+        restorable_sensor_data: Factory for restorable sensor config entry data.
+    """
+    entry = config_entry_factory(restorable_sensor_data("compacted", {CONF_JOURNAL: True}))
+    with patch("custom_components.variable.journal.JOURNAL_COMPACT_RECORDS", 3):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        entity = async_get_entity_index(hass).async_get("sensor.compacted")
+        assert entity is not None
+        compactions = async_get_variable_journal(hass).stats["compactions"]
+
+        for value in range(1, 4):
+            await entity.async_update_variable(value=value)
+            await hass.async_block_till_done()
+
+    assert async_get_variable_journal(hass).stats["compactions"] > compactions
+    stored = hass_storage[STORAGE_KEY]["data"][entry.entry_id]["value"]
+    records = _read_journal(journal_path)
+    assert len(records) < 3
+    # The store and what is left of the journal still replay to the last value.
+    assert [stored, *(record["value"] for record in records)][-1] == 3
+    assert stored > 0
+
+
+async def test_journal_compaction_keeps_coalesced_values(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    journal_path: Path,
+    config_entry_factory: ConfigEntryFactory,
+    restorable_sensor_data: RestorableSensorData,
+) -> None:
+    """Save values whose state write is still held back before truncating the journal.
+
+    Args:
+        hass: Home Assistant test instance.
+        hass_storage: Mocked Home Assistant storage.
+        journal_path: Path of the journal file.
+        config_entry_factory: Factory for test configuration entries.
+        restorable_sensor_data: Factory for restorable sensor config entry data.
+    """
+    entry = config_entry_factory(
+        restorable_sensor_data("coalesced", {CONF_JOURNAL: True, CONF_MIN_WRITE_INTERVAL: 60})
+    )
+    with patch("custom_components.variable.journal.JOURNAL_COMPACT_RECORDS", 2):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        entity = async_get_entity_index(hass).async_get("sensor.coalesced")
+        assert entity is not None
+
+        for value in range(1, 4):
+            await entity.async_update_variable(value=value)
+            await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.coalesced")
+    assert state is not None
+    assert state.state == "0"
+    assert async_get_variable_journal(hass).stats["compactions"] > 0
+    stored = hass_storage[STORAGE_KEY]["data"][entry.entry_id]["value"]
+    assert [stored, *(record["value"] for record in _read_journal(journal_path))][-1] == 3
+    assert stored >= 2
@@ -0,0 +1,237 @@
+"""Tests for the opt-in performance sensors of variables."""
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_ENTITY_ID, CONF_NAME, EntityCategory, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_component import async_update_entity
+from homeassistant.helpers.json import json_bytes
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.variable.binary_sensor import SERVICE_TOGGLE_VARIABLE
+from custom_components.variable.const import (
+    ATTR_ATTRIBUTES,
+    CONF_COLLECTION,
+    CONF_COLLECTION_PLATFORM,
+    CONF_ENTITY_PLATFORM,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_UPDATED,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    CONF_YAML_VARIABLE,
+    DOMAIN,
+    SERVICE_UPDATE_SENSOR,
+    SUBENTRY_TYPE_VARIABLE,
+)
+from custom_components.variable.performance import PERFORMANCE_SENSORS, _RateWindow
+from tests.types import ConfigEntryFactory
+
+
+async def _async_read(hass: HomeAssistant, entity_id: str) -> str:
+    """Poll a performance sensor and return its state.
+
+    Args:
+        hass: Home Assistant test instance.
+        entity_id: Entity ID of the performance sensor.
+
+    Returns:
+        The state of the sensor after the poll.
+    """
+    await async_update_entity(hass, entity_id)
+    state = hass.states.get(entity_id)
+    assert state is not None
+    return state.state
+
+
+async def test_sensor_variable_performance_sensors_report_updates(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Report the updates, writes, latency and payload size of a Sensor Variable.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "measured",
+            CONF_VALUE: "start",
+            CONF_YAML_VARIABLE: False,
+            CONF_UPDATED: False,
+            CONF_PERFORMANCE_SENSORS: True,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {
+            CONF_ENTITY_ID: "sensor.measured",
+            CONF_VALUE: "next",
+            ATTR_ATTRIBUTES: {"items": [1, 2, 3]},
+        },
+        blocking=True,
+    )
+
+    registry = er.async_get(hass)
+    for description in PERFORMANCE_SENSORS:
+        entity_id = registry.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, f"{entry.entry_id}_{description.key}"
+        )
+        assert entity_id is not None
+        registry_entry = registry.async_get(entity_id)
+        assert registry_entry is not None
+        assert registry_entry.entity_category is EntityCategory.DIAGNOSTIC
+    assert await _async_read(hass, "sensor.measured_updates_per_minute") == "1"
+    # The first state write at setup is counted as well.
+    assert await _async_read(hass, "sensor.measured_state_writes_per_minute") == "2"
+    assert await _async_read(hass, "sensor.measured_suppressed_writes") == "0"
+    assert float(await _async_read(hass, "sensor.measured_last_update_latency")) > 0
+    assert float(await _async_read(hass, "sensor.measured_attribute_copy_time")) > 0
+    assert int(await _async_read(hass, "sensor.measured_attribute_payload_size")) == len(
+        json_bytes({"items": [1, 2, 3]})
+    )
+
+
+async def test_coalesced_writes_count_as_suppressed(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Count updates whose state write is coalesced as suppressed writes.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "coalesced",
+            CONF_VALUE: 0,
+            CONF_YAML_VARIABLE: False,
+            CONF_UPDATED: False,
+            CONF_MIN_WRITE_INTERVAL: 60,
+            CONF_PERFORMANCE_SENSORS: True,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    for value in (1, 2, 3):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPDATE_SENSOR,
+            {CONF_ENTITY_ID: "sensor.coalesced", CONF_VALUE: value},
+            blocking=True,
+        )
+
+    assert await _async_read(hass, "sensor.coalesced_updates_per_minute") == "3"
+    assert await _async_read(hass, "sensor.coalesced_suppressed_writes") == "3"
+
+
+async def test_binary_sensor_variable_forwards_performance_sensors(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Add the performance sensors of a Binary Sensor Variable and unload them with it.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.BINARY_SENSOR,
+            CONF_VARIABLE_ID: "flag",
+            CONF_VALUE: False,
+            CONF_YAML_VARIABLE: False,
+            CONF_UPDATED: False,
+            CONF_PERFORMANCE_SENSORS: True,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_TOGGLE_VARIABLE, {CONF_ENTITY_ID: "binary_sensor.flag"}, blocking=True
+    )
+
+    assert await _async_read(hass, "sensor.flag_updates_per_minute") == "1"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_collection_variable_performance_sensors_follow_the_variable(
+    hass: HomeAssistant,
+) -> None:
+    """Add performance sensors for collection variables that enable them.
+
+    The sensors of a variable are removed with its subentry.
+
+    Args:
+        hass: Home Assistant test instance.
+    """
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Flags",
+        data={
+            CONF_ENTITY_PLATFORM: CONF_COLLECTION,
+            CONF_COLLECTION_PLATFORM: Platform.BINARY_SENSOR,
+            CONF_NAME: "Flags",
+            CONF_YAML_VARIABLE: False,
+        },
+        subentries_data=[
+            {
+                "data": {
+                    CONF_ENTITY_PLATFORM: Platform.BINARY_SENSOR,
+                    CONF_VARIABLE_ID: variable_id,
+                    CONF_VALUE: False,
+                    CONF_YAML_VARIABLE: False,
+                    CONF_PERFORMANCE_SENSORS: performance_sensors,
+                },
+                "subentry_type": SUBENTRY_TYPE_VARIABLE,
+                "title": variable_id,
+                "unique_id": None,
+            }
+            for variable_id, performance_sensors in (("measured", True), ("plain", False))
+        ],
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_TOGGLE_VARIABLE, {CONF_ENTITY_ID: "binary_sensor.measured"}, blocking=True
+    )
+
+    assert await _async_read(hass, "sensor.measured_updates_per_minute") == "1"
+    assert hass.states.get("sensor.plain_updates_per_minute") is None
+    registry = er.async_get(hass)
+    registry_entry = registry.async_get("sensor.measured_updates_per_minute")
+    assert registry_entry is not None
+    measured_id = registry_entry.config_subentry_id
+    assert entry.subentries[measured_id].data[CONF_VARIABLE_ID] == "measured"
+
+    assert hass.config_entries.async_remove_subentry(entry, measured_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.measured_updates_per_minute") is None
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.state is ConfigEntryState.NOT_LOADED
+
+
+def test_rate_window_counts_the_last_minute() -> None:
+    """Count events of the last minute and drop the older ones."""
+    window = _RateWindow()
+    window.add(1000.2)
+    window.add(1000.7)
+    window.add(1030.0)
+
+    assert window.count(1030.5) == 3
+    assert window.count(1060.0) == 1
+    assert window.count(1200.0) == 0
@@ -1,19 +1,41 @@
 """Integration tests for Variable sensor restore and service behavior."""
 
+from datetime import timedelta
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_FRIENDLY_NAME, CONF_DEVICE, CONF_DEVICE_ID, CONF_NAME, Platform
+from homeassistant.const import (
+    ATTR_FRIENDLY_NAME,
+    CONF_DEVICE,
+    CONF_DEVICE_ID,
+    CONF_NAME,
+    EVENT_STATE_CHANGED,
+    Platform,
+)
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
 import pytest
-from pytest_homeassistant_custom_component.common import mock_restore_cache_with_extra_data
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+    mock_restore_cache_with_extra_data,
+)
+import voluptuous as vol
 
 from custom_components.variable.const import (
     ATTR_ATTRIBUTES,
+    ATTR_PATCH,
     ATTR_REPLACE_ATTRIBUTES,
     ATTR_VALUE_DELTA,
+    CONF_ACCUMULATOR,
+    CONF_ACCUMULATOR_FLUSH_COUNT,
+    CONF_ACCUMULATOR_FLUSH_INTERVAL,
     CONF_ATTRIBUTES,
+    CONF_DEADBAND,
+    CONF_DEADBAND_PERCENT,
     CONF_ENTITY_PLATFORM,
     CONF_FORCE_UPDATE,
+    CONF_HISTORY_SIZE,
     CONF_RESTORE,
     CONF_VALUE,
     CONF_VARIABLE_ID,
@@ -23,6 +45,7 @@ from custom_components.variable.const import (
     SERVICE_INCREMENT_SENSOR,
     SERVICE_UPDATE_SENSOR,
 )
+from custom_components.variable.entity import async_get_entity_index
 from tests.types import ConfigEntryFactory
 
 
@@ -266,3 +289,369 @@ async def test_sensor_entity_service_updates_state_and_attributes(
     assert state.state == "19"
     assert state.attributes["service_marker"] is True
     assert "source" not in state.attributes
+
+
+async def test_sensor_patch_applies_operations_in_order(
+    hass: HomeAssistant,
+    sensor_entry: ConfigEntry,
+) -> None:
+    """Apply patch operations to the attributes and reject a failing patch whole.
+
+    Args:
+        hass: Home Assistant instance that hosts the integration.
+        sensor_entry: Loaded sensor config entry to update.
+    """
+    assert await hass.config_entries.async_setup(sensor_entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {
+            "entity_id": "sensor.office_temperature",
+            ATTR_PATCH: [
+                {"op": "extend", "path": "queue", "value": ["a", "b", "a"]},
+                {"op": "append", "path": "queue", "value": "c"},
+                {"op": "remove_value", "path": "queue", "value": "a"},
+                {"op": "increment", "path": "counts[0].hits"},
+                {"op": "increment", "path": "counts[0].hits", "value": 2.5},
+                {"op": "move", "from": "source", "path": "origin"},
+            ],
+        },
+        blocking=True,
+    )
+    attributes = hass.states.get("sensor.office_temperature").attributes
+    assert attributes["queue"] == ["b", "c"]
+    assert attributes["counts"] == [{"hits": 3.5}]
+    assert attributes["origin"] == "test"
+    assert "source" not in attributes
+
+    with pytest.raises(ValueError, match=r"Patch operation 1 \(delete missing\) failed"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPDATE_SENSOR,
+            {
+                "entity_id": "sensor.office_temperature",
+                CONF_VALUE: 30,
+                ATTR_PATCH: [
+                    {"op": "delete", "path": "queue[0]"},
+                    {"op": "delete", "path": "missing"},
+                ],
+            },
+            blocking=True,
+        )
+    state = hass.states.get("sensor.office_temperature")
+    assert state.state == "21.5"
+    assert state.attributes["queue"] == ["b", "c"]
+
+    with pytest.raises(vol.Invalid, match="unknown patch operation"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPDATE_SENSOR,
+            {"entity_id": "sensor.office_temperature", ATTR_PATCH: [{"op": "copy", "path": "a"}]},
+            blocking=True,
+        )
+    with pytest.raises(vol.Invalid, match=r"unknown patch operation \['set'\]"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPDATE_SENSOR,
+            {"entity_id": "sensor.office_temperature", ATTR_PATCH: [{"op": ["set"], "path": "a"}]},
+            blocking=True,
+        )
+
+
+@pytest.mark.parametrize(
+    ("deadband", "force_update", "values", "expected_states"),
+    [
+        pytest.param(
+            {CONF_DEADBAND: 0.5},
+            False,
+            [10.2, 10.4, 10.6, 10.7],
+            ["10", "10", "10.6", "10.6"],
+            id="absolute",
+        ),
+        pytest.param(
+            {CONF_DEADBAND_PERCENT: 10},
+            False,
+            [10.5, 11, 11.5, 12.5],
+            ["10", "11", "11", "12.5"],
+            id="percent",
+        ),
+        pytest.param(
+            {CONF_DEADBAND: 5},
+            True,
+            [10.1, 10.2],
+            ["10.1", "10.2"],
+            id="force-update",
+        ),
+    ],
+)
+async def test_sensor_deadband_skips_small_changes(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+    deadband: dict[str, float],
+    force_update: bool,
+    values: list[float],
+    expected_states: list[str],
+) -> None:
+    """Publish numeric values only when they leave the deadband of the last write.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+        deadband: Absolute or percentage deadband options.
+        force_update: Whether the sensor forces every update.
+        values: Values sent through update_sensor.
+        expected_states: Published state after each update.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "telemetry",
+            CONF_VALUE: 10,
+            "value_type": "number",
+            CONF_YAML_VARIABLE: False,
+            CONF_RESTORE: False,
+            CONF_FORCE_UPDATE: force_update,
+            **deadband,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    for value, expected_state in zip(values, expected_states, strict=True):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPDATE_SENSOR,
+            {"entity_id": "sensor.telemetry", "value": value},
+            blocking=True,
+        )
+        state = hass.states.get("sensor.telemetry")
+        assert state is not None
+        assert state.state == expected_state
+
+
+async def test_sensor_deadband_publishes_attribute_changes(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Write state when attributes change even if the value is within the deadband.
+
+    Sending the attributes it already has does not count as a change.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "telemetry",
+            CONF_VALUE: 10,
+            "value_type": "number",
+            CONF_YAML_VARIABLE: False,
+            CONF_RESTORE: False,
+            CONF_DEADBAND: 1,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {"entity_id": "sensor.telemetry", "value": 10.5, ATTR_ATTRIBUTES: {"quality": "good"}},
+        blocking=True,
+    )
+
+    state = hass.states.get("sensor.telemetry")
+    assert state is not None
+    assert state.state == "10.5"
+    assert state.attributes["quality"] == "good"
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {"entity_id": "sensor.telemetry", "value": 10.8, ATTR_ATTRIBUTES: {"quality": "good"}},
+        blocking=True,
+    )
+
+    state = hass.states.get("sensor.telemetry")
+    assert state is not None
+    assert state.state == "10.5"
+
+
+async def test_sensor_accumulator_sums_exactly_and_flushes_by_count(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Sum fractional increments without float drift and publish every N changes.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "pulses",
+            CONF_VALUE: 0,
+            "value_type": "number",
+            CONF_YAML_VARIABLE: False,
+            CONF_RESTORE: False,
+            CONF_ACCUMULATOR: True,
+            CONF_ACCUMULATOR_FLUSH_INTERVAL: 0,
+            CONF_ACCUMULATOR_FLUSH_COUNT: 5,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    state_changes = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    for _ in range(12):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_INCREMENT_SENSOR,
+            {"entity_id": "sensor.pulses", ATTR_VALUE_DELTA: 0.1},
+            blocking=True,
+        )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_DECREMENT_SENSOR,
+        {"entity_id": "sensor.pulses", ATTR_VALUE_DELTA: 0.2},
+        blocking=True,
+    )
+
+    assert [event.data["new_state"].state for event in state_changes] == ["0.5", "1"]
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {"entity_id": "sensor.pulses", "value": 10},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_INCREMENT_SENSOR,
+        {"entity_id": "sensor.pulses", ATTR_VALUE_DELTA: 0.3},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_INCREMENT_SENSOR,
+        {"entity_id": "sensor.pulses", ATTR_VALUE_DELTA: 0.3},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_INCREMENT_SENSOR,
+        {"entity_id": "sensor.pulses", ATTR_VALUE_DELTA: 0.4},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_INCREMENT_SENSOR,
+        {"entity_id": "sensor.pulses"},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_INCREMENT_SENSOR,
+        {"entity_id": "sensor.pulses"},
+        blocking=True,
+    )
+
+    state = hass.states.get("sensor.pulses")
+    assert state is not None
+    assert state.state == "13"
+
+
+async def test_sensor_accumulator_flushes_on_interval(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Publish accumulated increments once per flush interval.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "flow_meter",
+            CONF_VALUE: 100,
+            "value_type": "number",
+            CONF_YAML_VARIABLE: False,
+            CONF_RESTORE: False,
+            CONF_ACCUMULATOR: True,
+            CONF_ACCUMULATOR_FLUSH_INTERVAL: 5,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    state_changes = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    for _ in range(50):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_INCREMENT_SENSOR,
+            {"entity_id": "sensor.flow_meter"},
+            blocking=True,
+        )
+    assert state_changes == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+
+    assert len(state_changes) == 1
+    state = hass.states.get("sensor.flow_meter")
+    assert state is not None
+    assert state.state == "150"
+
+
+async def test_sensor_accumulator_flushes_pending_increments_on_reload(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Flush increments still waiting for the flush interval when the entity is removed.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "reloaded_meter",
+            CONF_VALUE: 100,
+            "value_type": "number",
+            CONF_YAML_VARIABLE: False,
+            CONF_RESTORE: True,
+            CONF_HISTORY_SIZE: 10,
+            CONF_ACCUMULATOR: True,
+            CONF_ACCUMULATOR_FLUSH_INTERVAL: 3600,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity = async_get_entity_index(hass).async_get("sensor.reloaded_meter")
+    assert entity is not None
+
+    for _ in range(3):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_INCREMENT_SENSOR,
+            {"entity_id": "sensor.reloaded_meter"},
+            blocking=True,
+        )
+    assert hass.states.get("sensor.reloaded_meter").state == "100"
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    history = await entity.async_get_history()
+    assert history["history"][-1]["value"] == 103
+    assert entity.async_get_diagnostics()["accumulator_pending"] == 0
+    state = hass.states.get("sensor.reloaded_meter")
+    assert state is not None
+    assert state.state == "103"
@@ -0,0 +1,97 @@
+"""Tests for the startup phase timers of the Variable integration."""
+
+import logging
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+
+from custom_components.variable.const import (
+    CONF_ENTITY_PLATFORM,
+    CONF_RESTORE,
+    CONF_UPDATED,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    CONF_YAML_VARIABLE,
+    DOMAIN,
+)
+from custom_components.variable.startup import (
+    PHASE_ENTITY_INIT,
+    PHASE_FIRST_WRITE,
+    PHASE_FORWARD,
+    PHASE_RESTORE,
+    PHASE_SETUP,
+    PHASE_SETUP_ENTRY,
+    async_get_startup_timer,
+    async_log_startup_stats,
+)
+from tests.types import ConfigEntryFactory
+
+
+async def test_config_entry_setup_times_every_phase(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Time each phase of setting up a variable once per entry or entity.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    for platform, variable_id in (
+        (Platform.SENSOR, "timed_sensor"),
+        (Platform.BINARY_SENSOR, "timed_binary"),
+    ):
+        config_entry_factory(
+            {
+                CONF_ENTITY_PLATFORM: platform,
+                CONF_VARIABLE_ID: variable_id,
+                CONF_VALUE: None,
+                CONF_YAML_VARIABLE: False,
+                CONF_RESTORE: True,
+                CONF_UPDATED: False,
+            }
+        )
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    stats = async_get_startup_timer(hass).stats
+
+    assert stats[PHASE_SETUP]["count"] == 1
+    for phase in (
+        PHASE_SETUP_ENTRY,
+        PHASE_FORWARD,
+        PHASE_ENTITY_INIT,
+        PHASE_RESTORE,
+        PHASE_FIRST_WRITE,
+    ):
+        assert stats[phase]["count"] == 2, phase
+        assert stats[phase]["seconds"] > 0
+    assert stats[PHASE_SETUP_ENTRY]["seconds"] >= stats[PHASE_FORWARD]["seconds"]
+
+
+async def test_log_startup_stats_logs_phases_and_stops_timing(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Log the phases that ran at INFO and ignore later runs.
+
+    Args:
+        hass: Home Assistant test instance.
+        caplog: Captured log records.
+    """
+    timer = async_get_startup_timer(hass)
+    timer.record(PHASE_SETUP_ENTRY, 0.5)
+    timer.record(PHASE_SETUP_ENTRY, 1.5)
+
+    with caplog.at_level(logging.INFO):
+        async_log_startup_stats(hass)
+    timer.record(PHASE_SETUP_ENTRY, 3.0)
+    with timer.time(PHASE_FIRST_WRITE):
+        pass
+
+    assert "[Startup] setup_entry: 2 runs in 2.000s (1000.00ms each)" in caplog.text
+    assert "first_write" not in caplog.text
+    assert timer.stats[PHASE_SETUP_ENTRY] == {"count": 2, "seconds": 2.0}
+    assert timer.stats[PHASE_FIRST_WRITE] == {"count": 0, "seconds": 0.0}
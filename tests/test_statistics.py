@@ -0,0 +1,107 @@
+"""Tests for Sensor Variable rolling statistics."""
+
+import statistics
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.variable.const import (
+    ATTR_VALUE_DELTA,
+    CONF_ENTITY_PLATFORM,
+    CONF_RESTORE,
+    CONF_STATISTICS,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    CONF_YAML_VARIABLE,
+    DOMAIN,
+    SERVICE_GET_STATISTICS,
+    SERVICE_INCREMENT_SENSOR,
+    SERVICE_RESET_STATISTICS,
+    SERVICE_UPDATE_SENSOR,
+)
+from custom_components.variable.statistics import RollingStatistics
+from tests.types import ConfigEntryFactory
+
+
+def test_statistics_since_reset_match_batch_statistics() -> None:
+    """Match the standard library's mean and sample variance."""
+    values = [4.0, 7.0, 13.0, 16.0, 2.5]
+    rolling = RollingStatistics(window=0, ema_alpha=0.5)
+    for timestamp, value in enumerate(values):
+        rolling.add(float(timestamp), value)
+
+    result = rolling.as_dict(now=100.0)
+    assert result["count"] == 5
+    assert (result["min"], result["max"]) == (2.5, 16.0)
+    assert result["mean"] == pytest.approx(statistics.mean(values))
+    assert result["variance"] == pytest.approx(statistics.variance(values))
+    assert result["ema"] == pytest.approx(7.5625)
+
+    rolling.reset()
+    assert rolling.as_dict(now=100.0)["count"] == 0
+
+
+def test_statistics_window_expires_old_values() -> None:
+    """Fold values out of the statistics once they leave the window."""
+    rolling = RollingStatistics(window=10, ema_alpha=0.1)
+    for timestamp, value in ((0.0, 100.0), (5.0, 1.0), (8.0, 3.0), (12.0, 2.0)):
+        rolling.add(timestamp, value)
+
+    result = rolling.as_dict(now=12.0)
+    assert result["count"] == 3
+    assert (result["min"], result["max"]) == (1.0, 3.0)
+    assert result["mean"] == pytest.approx(2.0)
+    assert result["variance"] == pytest.approx(1.0)
+
+    result = rolling.as_dict(now=16.0)
+    assert result["count"] == 2
+    assert (result["min"], result["max"]) == (2.0, 3.0)
+    assert result["mean"] == pytest.approx(2.5)
+
+
+async def test_statistics_services_follow_updates_and_increments(
+    hass: HomeAssistant,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Fold every update and increment into the statistics until reset.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    entry = config_entry_factory(
+        {
+            CONF_ENTITY_PLATFORM: Platform.SENSOR,
+            CONF_VARIABLE_ID: "with_statistics",
+            CONF_VALUE: 0,
+            "value_type": "number",
+            CONF_STATISTICS: True,
+            CONF_RESTORE: False,
+            CONF_YAML_VARIABLE: False,
+        }
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    target = {"entity_id": "sensor.with_statistics"}
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_UPDATE_SENSOR, {**target, "value": 10}, blocking=True
+    )
+    await hass.services.async_call(
+        DOMAIN, SERVICE_INCREMENT_SENSOR, {**target, ATTR_VALUE_DELTA: 10}, blocking=True
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_STATISTICS, target, blocking=True, return_response=True
+    )
+    result = response["sensor.with_statistics"]
+    assert result["count"] == 2
+    assert (result["min"], result["max"], result["mean"]) == (10, 20, 15)
+    assert result["variance"] == pytest.approx(50)
+
+    await hass.services.async_call(DOMAIN, SERVICE_RESET_STATISTICS, target, blocking=True)
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_STATISTICS, target, blocking=True, return_response=True
+    )
+    assert response["sensor.with_statistics"]["count"] == 0
@@ -0,0 +1,169 @@
+"""Tests for the Variable value store."""
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, Platform
+from homeassistant.core import HomeAssistant, State
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    mock_restore_cache_with_extra_data,
+)
+
+from custom_components.variable.const import (
+    CONF_ACCUMULATOR,
+    CONF_ACCUMULATOR_FLUSH_INTERVAL,
+    DATA_RESTORE_STATS,
+    DOMAIN,
+    SERVICE_INCREMENT_SENSOR,
+    STORE_SAVE_DELAY,
+)
+from custom_components.variable.entity import async_get_entity_index
+from custom_components.variable.store import STORAGE_KEY, STORAGE_VERSION
+from tests.types import ConfigEntryFactory, RestorableSensorData
+
+
+async def test_store_saves_changed_values_in_one_delayed_batch(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry_factory: ConfigEntryFactory,
+    restorable_sensor_data: RestorableSensorData,
+) -> None:
+    """Save the latest value once after the save delay, not on every update.
+
+    Args:
+        hass: Home Assistant test instance.
+        hass_storage: Mocked Home Assistant storage.
+        config_entry_factory: Factory for test configuration entries.
+        restorable_sensor_data: Factory for restorable sensor config entry data.
+    """
+    entry = config_entry_factory(restorable_sensor_data("stored"))
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity = async_get_entity_index(hass).async_get("sensor.stored")
+    assert entity is not None
+
+    for value in range(1, 4):
+        await entity.async_update_variable(value=value, attributes={"step": value})
+    await hass.async_block_till_done()
+    assert STORAGE_KEY not in hass_storage
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORE_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+
+    assert hass_storage[STORAGE_KEY]["data"] == {
+        entry.entry_id: {"value": 3, "attributes": {"step": 3}}
+    }
+
+
+async def test_store_is_preferred_over_restore_cache(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry_factory: ConfigEntryFactory,
+    restorable_sensor_data: RestorableSensorData,
+) -> None:
+    """Restore a variable from the value store when it has a record.
+
+    Args:
+        hass: Home Assistant test instance.
+        hass_storage: Mocked Home Assistant storage.
+        config_entry_factory: Factory for test configuration entries.
+        restorable_sensor_data: Factory for restorable sensor config entry data.
+    """
+    entry = config_entry_factory(restorable_sensor_data("from_store"))
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {entry.entry_id: {"value": "7", "attributes": {"source": "store"}}},
+    }
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State("sensor.from_store", "5", {"source": "cache"}),
+                {"native_value": "5", "native_unit_of_measurement": None},
+            )
+        ],
+    )
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.from_store")
+    assert state is not None
+    assert state.state == "7"
+    assert state.attributes["source"] == "store"
+    stats = hass.data[DATA_RESTORE_STATS][Platform.SENSOR]
+    assert stats["from_store"] == stats["restored"] > 0
+
+
+async def test_store_forgets_removed_variables(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry_factory: ConfigEntryFactory,
+    restorable_sensor_data: RestorableSensorData,
+) -> None:
+    """Drop a variable's record when its config entry is removed.
+
+    Args:
+        hass: Home Assistant test instance.
+        hass_storage: Mocked Home Assistant storage.
+        config_entry_factory: Factory for test configuration entries.
+        restorable_sensor_data: Factory for restorable sensor config entry data.
+    """
+    kept = config_entry_factory(restorable_sensor_data("kept"))
+    removed = config_entry_factory(restorable_sensor_data("removed"))
+    assert await hass.config_entries.async_setup(kept.entry_id)
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORE_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    assert set(hass_storage[STORAGE_KEY]["data"]) == {kept.entry_id, removed.entry_id}
+
+    assert await hass.config_entries.async_remove(removed.entry_id)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2 * STORE_SAVE_DELAY + 2))
+    await hass.async_block_till_done()
+
+    assert set(hass_storage[STORAGE_KEY]["data"]) == {kept.entry_id}
+
+
+async def test_store_saves_accumulated_increments_before_they_are_published(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry_factory: ConfigEntryFactory,
+    restorable_sensor_data: RestorableSensorData,
+) -> None:
+    """Save accumulated increments at shutdown while their flush is still pending.
+
+    Args:
+        hass: Home Assistant test instance.
+        hass_storage: Mocked Home Assistant storage.
+        config_entry_factory: Factory for test configuration entries.
+        restorable_sensor_data: Factory for restorable sensor config entry data.
+    """
+    entry = config_entry_factory(
+        restorable_sensor_data(
+            "pending_pulses",
+            {CONF_ACCUMULATOR: True, CONF_ACCUMULATOR_FLUSH_INTERVAL: 3600},
+        )
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STORE_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    assert hass_storage[STORAGE_KEY]["data"][entry.entry_id]["value"] == 0
+
+    for _ in range(3):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_INCREMENT_SENSOR,
+            {"entity_id": "sensor.pending_pulses"},
+            blocking=True,
+        )
+    assert hass.states.get("sensor.pending_pulses").state == "0"
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+
+    assert hass_storage[STORAGE_KEY]["data"][entry.entry_id]["value"] == 3
@@ -0,0 +1,53 @@
+"""Tests for the timer wheel shared by expiring Variables."""
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.variable.timer_wheel import WHEEL_SLOTS, async_get_timer_wheel
+
+
+async def test_timer_wheel_fires_due_timers(hass: HomeAssistant) -> None:
+    """Fire each timer once its deadline passed and keep the later ones.
+
+    Args:
+        hass: Home Assistant test instance.
+    """
+    wheel = async_get_timer_wheel(hass)
+    fired: list[str] = []
+    now = dt_util.utcnow().timestamp()
+    for key, delay in (("soon", 5), ("later", 20), ("next_turn", WHEEL_SLOTS + 5)):
+        wheel.async_schedule(key, now + delay, lambda key=key: fired.append(key))
+    # Rescheduling replaces the earlier timer of the same key.
+    wheel.async_schedule("soon", now + 10, lambda: fired.append("rescheduled"))
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert fired == ["rescheduled"]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=21))
+    await hass.async_block_till_done()
+    assert fired == ["rescheduled", "later"]
+    assert len(wheel) == 1
+
+    wheel.async_cancel("next_turn")
+    assert len(wheel) == 0
+
+
+async def test_timer_wheel_fires_passed_deadlines_on_next_tick(hass: HomeAssistant) -> None:
+    """Fire timers scheduled with a deadline that already passed.
+
+    Args:
+        hass: Home Assistant test instance.
+    """
+    wheel = async_get_timer_wheel(hass)
+    fired: list[str] = []
+    wheel.async_schedule("overdue", dt_util.utcnow().timestamp() - 30, lambda: fired.append("x"))
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+    assert fired == ["x"]
+    assert len(wheel) == 0
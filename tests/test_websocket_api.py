@@ -0,0 +1,216 @@
+"""Tests for the Variable websocket commands."""
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from custom_components.variable.const import (
+    CONF_ATTRIBUTES,
+    CONF_ENTITY_PLATFORM,
+    CONF_RESTORE,
+    CONF_VALUE,
+    CONF_VARIABLE_ID,
+    CONF_YAML_VARIABLE,
+    DOMAIN,
+    SERVICE_UPDATE_SENSOR,
+)
+from tests.types import ConfigEntryFactory
+
+
+async def _async_setup_variables(
+    hass: HomeAssistant, config_entry_factory: ConfigEntryFactory
+) -> None:
+    """Set up two sensors and a binary sensor to read back.
+
+    Args:
+        hass: Home Assistant test instance.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    for platform, variable_id, value, attributes in (
+        (Platform.SENSOR, "kitchen_temperature", 21, {"rooms": [{"floor": 1}], "tags": ["a"]}),
+        (Platform.SENSOR, "kitchen_humidity", 40, {"room": {"floor": 1}}),
+        (Platform.BINARY_SENSOR, "kitchen_occupied", True, {}),
+    ):
+        entry = config_entry_factory(
+            {
+                CONF_ENTITY_PLATFORM: platform,
+                CONF_VARIABLE_ID: variable_id,
+                CONF_VALUE: value,
+                CONF_ATTRIBUTES: attributes,
+                CONF_RESTORE: False,
+                CONF_YAML_VARIABLE: False,
+            }
+        )
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def test_snapshot_returns_every_variable(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Return the value and attributes of every loaded variable.
+
+    Args:
+        hass: Home Assistant test instance.
+        hass_ws_client: Factory for websocket test clients.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    await _async_setup_variables(hass, config_entry_factory)
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id({"type": "variable/snapshot"})
+    response = await client.receive_json()
+
+    assert response["success"]
+    variables = response["result"]["variables"]
+    assert set(variables) == {
+        "sensor.kitchen_temperature",
+        "sensor.kitchen_humidity",
+        "binary_sensor.kitchen_occupied",
+    }
+    assert variables["sensor.kitchen_temperature"] == {
+        "variable_id": "kitchen_temperature",
+        "platform": "sensor",
+        "state": "21",
+        "attributes": {"rooms": [{"floor": 1}], "tags": ["a"]},
+    }
+    assert variables["binary_sensor.kitchen_occupied"]["state"] == "on"
+
+
+async def test_snapshot_filters_and_projects_attributes(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Combine filters and return only the requested attribute paths.
+
+    Args:
+        hass: Home Assistant test instance.
+        hass_ws_client: Factory for websocket test clients.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    await _async_setup_variables(hass, config_entry_factory)
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {
+            "type": "variable/snapshot",
+            "platform": "sensor",
+            "variable_id_prefix": "kitchen_",
+            "attributes": ["room[floor]", "room.floor", "tags[0]", "missing"],
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+
+    await client.send_json_auto_id(
+        {
+            "type": "variable/snapshot",
+            "platform": "sensor",
+            "variable_id_prefix": "kitchen_",
+            "attributes": ["tags[0]", "missing"],
+        }
+    )
+    response = await client.receive_json()
+    variables = response["result"]["variables"]
+    assert {entity_id: variable["attributes"] for entity_id, variable in variables.items()} == {
+        "sensor.kitchen_temperature": {"tags[0]": "a"},
+        "sensor.kitchen_humidity": {},
+    }
+
+    await client.send_json_auto_id(
+        {
+            "type": "variable/snapshot",
+            "variable_id": ["kitchen_humidity", "kitchen_occupied", "unknown"],
+            "attributes": [],
+        }
+    )
+    response = await client.receive_json()
+    assert set(response["result"]["variables"]) == {
+        "sensor.kitchen_humidity",
+        "binary_sensor.kitchen_occupied",
+    }
+
+
+async def test_subscribe_streams_changed_paths(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    config_entry_factory: ConfigEntryFactory,
+) -> None:
+    """Send a snapshot, then only the paths each update changed.
+
+    Args:
+        hass: Home Assistant test instance.
+        hass_ws_client: Factory for websocket test clients.
+        config_entry_factory: Factory for test configuration entries.
+    """
+    await _async_setup_variables(hass, config_entry_factory)
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": "variable/subscribe", "entity_id": "sensor.kitchen_temperature"}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    event = (await client.receive_json())["event"]
+    assert event["variables"]["sensor.kitchen_temperature"] == [
+        {
+            "op": "add",
+            "path": "",
+            "value": {
+                "variable_id": "kitchen_temperature",
+                "platform": "sensor",
+                "state": "21",
+                "attributes": {"rooms": [{"floor": 1}], "tags": ["a"]},
+            },
+        }
+    ]
+
+    # Updates of variables outside the subscription are not sent.
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {"entity_id": "sensor.kitchen_humidity", "value": 45},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {
+            "entity_id": "sensor.kitchen_temperature",
+            "value": 22,
+            "attributes": {"rooms[0].floor": 2, "tags[1]": "b", "new/key": True},
+        },
+        blocking=True,
+    )
+    event = (await client.receive_json())["event"]
+    assert event["variables"] == {
+        "sensor.kitchen_temperature": [
+            {"op": "replace", "path": "/state", "value": "22"},
+            {"op": "replace", "path": "/attributes/rooms/0/floor", "value": 2},
+            {"op": "add", "path": "/attributes/tags/1", "value": "b"},
+            {"op": "add", "path": "/attributes/new~1key", "value": True},
+        ]
+    }
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_UPDATE_SENSOR,
+        {
+            "entity_id": "sensor.kitchen_temperature",
+            "attributes": {"tags": []},
+            "replace_attributes": True,
+        },
+        blocking=True,
+    )
+    event = (await client.receive_json())["event"]
+    assert event["variables"] == {
+        "sensor.kitchen_temperature": [
+            {"op": "remove", "path": "/attributes/tags/1"},
+            {"op": "remove", "path": "/attributes/tags/0"},
+            {"op": "remove", "path": "/attributes/rooms"},
+            {"op": "remove", "path": "/attributes/new~1key"},
+        ]
+    }
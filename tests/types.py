@@ -6,3 +6,6 @@ from typing import Any
 from homeassistant.config_entries import ConfigEntry
 
 ConfigEntryFactory = Callable[[Mapping[str, Any]], ConfigEntry]
+RestorableSensorData = Callable[..., dict[str, Any]]
+ServiceCaller = Callable[[str, str, Mapping[str, Any]], None]
+VariableSetup = Callable[[Mapping[str, Any]], None]